@@ -0,0 +1,6 @@
+ALTER TABLE liabilities
+ADD COLUMN interest_rate_percent FLOAT NULL;
+ALTER TABLE liabilities
+ADD COLUMN term_months INTEGER NULL;
+ALTER TABLE liabilities
+ADD COLUMN monthly_payment FLOAT NULL;
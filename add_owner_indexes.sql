@@ -0,0 +1,7 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assets_owner_id_id ON assets (owner_id, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_liabilities_owner_id_id ON liabilities (owner_id, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cashflow_items_owner_id_is_income_id ON cashflow_items (owner_id, is_income, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projections_owner_id_id ON projections (owner_id, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_custom_charts_user_id_id ON custom_charts (user_id, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_password_reset_tokens_user_id ON password_reset_tokens (user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_confirmation_tokens_user_id ON email_confirmation_tokens (user_id);
@@ -0,0 +1,32 @@
+"""Add amortization fields to liabilities
+
+Revision ID: c41f8a2d9e07
+Revises: e6d96651bbdd
+Create Date: 2026-10-16 10:12:31.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8a2d9e07'
+down_revision: Union[str, Sequence[str], None] = 'e6d96651bbdd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('liabilities', sa.Column('interest_rate_percent', sa.Float(), nullable=True))
+    op.add_column('liabilities', sa.Column('term_months', sa.Integer(), nullable=True))
+    op.add_column('liabilities', sa.Column('monthly_payment', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('liabilities', 'monthly_payment')
+    op.drop_column('liabilities', 'term_months')
+    op.drop_column('liabilities', 'interest_rate_percent')
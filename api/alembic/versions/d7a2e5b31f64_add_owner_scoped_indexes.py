@@ -0,0 +1,45 @@
+"""Add owner-scoped indexes
+
+Revision ID: d7a2e5b31f64
+Revises: c41f8a2d9e07
+Create Date: 2026-10-16 11:40:05.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2e5b31f64'
+down_revision: Union[str, Sequence[str], None] = 'c41f8a2d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns): the list endpoints filter by owner and sort by id DESC, and the
+# snapshot loader filters by owner, so every index leads with owner_id/user_id.
+INDEXES = [
+    ('ix_assets_owner_id_id', 'assets', ['owner_id', sa.text('id DESC')]),
+    ('ix_liabilities_owner_id_id', 'liabilities', ['owner_id', sa.text('id DESC')]),
+    ('ix_cashflow_items_owner_id_is_income_id', 'cashflow_items', ['owner_id', 'is_income', sa.text('id DESC')]),
+    ('ix_projections_owner_id_id', 'projections', ['owner_id', sa.text('id DESC')]),
+    ('ix_custom_charts_user_id_id', 'custom_charts', ['user_id', sa.text('id DESC')]),
+    ('ix_password_reset_tokens_user_id', 'password_reset_tokens', ['user_id']),
+    ('ix_email_confirmation_tokens_user_id', 'email_confirmation_tokens', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY so large tables stay writable while the indexes build; it cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,111 @@
+# api/amortization.py
+
+import numpy as np
+
+MAX_MONTHS = 150 * 12 # Longest schedule computed, matching the longest projection allowed
+AMORTIZATION_COLUMNS = ("Loan_Interest", "Loan_Principal")
+
+
+def is_amortizing(liability) -> bool:
+    """A liability is paid down on a schedule once it has a rate and a term or a monthly payment."""
+    return liability.interest_rate_percent is not None and bool(liability.term_months or liability.monthly_payment)
+
+
+def level_payment(balance, monthly_rate, term_months):
+    """Monthly payment that repays `balance` in `term_months` (all arguments may be arrays)."""
+    balance = np.asarray(balance, dtype=np.float64)
+    monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+    term_months = np.maximum(np.asarray(term_months, dtype=np.float64), 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = -np.expm1(-term_months * np.log1p(monthly_rate)) / monthly_rate
+    return np.where(monthly_rate == 0, balance / term_months, balance / annuity)
+
+
+def schedules(balance, annual_rate_percent, term_months, payment) -> dict:
+    """
+    Amortization schedules for many loans at once, summed per year.
+
+    One entry per loan: the outstanding balance today, the nominal annual rate, the remaining
+    term in months (NaN if open-ended) and the monthly payment (NaN for the level payment over
+    the term). The balance after m payments has the closed form B*(1+r)^m - P*((1+r)^m - 1)/r,
+    so every loan and month is evaluated as one (loans, months) array instead of a loop. Whatever
+    is left at the end of the term is paid with the last payment.
+
+    Returns arrays shaped (loans, years): "balance" at the end of each year and the "interest",
+    "principal" and "payment" paid during it; plus "monthly_balance" and "monthly_payment" shaped
+    (loans, months), for the monthly engine.
+    """
+    balance = np.asarray(balance, dtype=np.float64)
+    loans = balance.shape[0]
+    rate = np.asarray(annual_rate_percent, dtype=np.float64) / 1200.0
+    term = np.asarray(term_months, dtype=np.float64)
+    term = np.where(term > 0, np.minimum(term, MAX_MONTHS), np.nan)
+    payment = np.asarray(payment, dtype=np.float64)
+    payment = np.where(payment > 0, payment, level_payment(balance, rate, np.nan_to_num(term, nan=MAX_MONTHS)))
+
+    months = int(np.nanmax(np.append(term, 1.0))) if np.isnan(term).sum() == 0 else MAX_MONTHS
+    years = -(-months // 12)
+    m = np.arange(years * 12 + 1, dtype=np.float64) # Number of payments made, 0 = today
+
+    log_growth = np.outer(np.log1p(rate), m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(rate[:, None] == 0, m, np.expm1(log_growth) / rate[:, None])
+    remaining = balance[:, None] * np.exp(log_growth) - payment[:, None] * annuity
+    paid_off = (remaining <= 0) | (m >= np.nan_to_num(term, nan=np.inf)[:, None])
+    remaining = np.where(paid_off, 0.0, remaining)
+
+    start, end = remaining[:, :-1], remaining[:, 1:]
+    interest = start * rate[:, None]
+
+    def per_year(monthly):
+        return monthly.reshape(loans, years, 12).sum(axis=2)
+
+    payments = start + interest - end
+    return {
+        "balance": remaining[:, 12::12],
+        "interest": per_year(interest),
+        "principal": per_year(start - end),
+        "payment": per_year(payments),
+        "monthly_balance": end,
+        "monthly_payment": payments,
+    }
+
+
+def pad(values, years: int, fill: float = 0.0) -> np.ndarray:
+    """Trims or extends a yearly schedule to `years` entries."""
+    values = np.asarray(values, dtype=np.float64)[:years]
+    if values.shape[0] < years:
+        values = np.concatenate([values, np.full(years - values.shape[0], fill)])
+    return values
+
+
+def loan_schedules(liabilities) -> dict:
+    """
+    Schedules for every amortizing liability (snapshot LiabilityRecords), computed in one
+    schedules() call. Returns {liability id: {"balance", "interest", "principal", "payment",
+    "monthly_balance", "monthly_payment"}} with each schedule as a plain list.
+    """
+    loans = [liability for liability in liabilities if is_amortizing(liability)]
+    if not loans:
+        return {}
+    result = schedules(
+        balance=[loan.value for loan in loans],
+        annual_rate_percent=[loan.interest_rate_percent for loan in loans],
+        term_months=[loan.term_months or np.nan for loan in loans],
+        payment=[loan.monthly_payment or np.nan for loan in loans],
+    )
+    return {
+        loan.id: {key: values[row].tolist() for key, values in result.items()}
+        for row, loan in enumerate(loans)
+    }
+
+
+def yearly_totals(combined_accounts: list, years: int) -> dict:
+    """Loan_Interest and Loan_Principal per projection year, summed over the amortizing liabilities."""
+    totals = {column: np.zeros(years) for column in AMORTIZATION_COLUMNS}
+    for acc in combined_accounts:
+        split = acc.get("amortization")
+        if split is not None:
+            totals["Loan_Interest"] += pad(split["interest"], years)
+            totals["Loan_Principal"] += pad(split["principal"], years)
+    return totals
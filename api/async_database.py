@@ -0,0 +1,72 @@
+# api/async_database.py
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import AsyncGenerator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from config import settings
+from database import get_async_database_url
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine():
+    """
+    asyncpg engine for the native async path (settings.ASYNC_DATABASE). Created on first use, so
+    deployments on the sync path never open it. Its pool is awaited on the event loop instead of
+    being shared by threadpool threads.
+    """
+    url = get_async_database_url()
+    logger.info("Creating async database engine")
+    return create_async_engine(
+        url,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker:
+    # expire_on_commit=False: endpoints return ORM objects after committing, and an expired
+    # attribute cannot be lazily reloaded outside an await.
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a new AsyncSession for each request."""
+    async with get_sessionmaker()() as session:
+        yield session
+
+
+async def commit_and_refresh(db: AsyncSession, instance):
+    """Adds, commits and refreshes one instance (async counterpart of database.commit_and_refresh)."""
+    db.add(instance)
+    await db.commit()
+    await db.refresh(instance)
+    return instance
+
+
+async def warm_up(connections: int) -> None:
+    """Opens `connections` pooled connections concurrently so the first async requests find them idle."""
+    engine = get_async_engine()
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(max(connections, 1))))
+    logger.info("Async database pool warmed up with %d connections.", max(connections, 1))
+
+
+async def dispose() -> None:
+    """Closes the async pool if it was ever opened."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
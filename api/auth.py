@@ -6,18 +6,23 @@ from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+import logging
 import secrets # New import for token generation
 import string # New import for token generation
 
 import models
 import schemas
 import database
+import owner_queries
+import projection_cache
 from config import settings # 🌟 NEW: Import settings from the central config file
 
 from passlib.context import CryptContext
 # Define the context
 pwd_context = CryptContext(schemes=["scrypt"], deprecated="auto")
 
+logger = logging.getLogger(__name__)
+
 
 def get_password_hash(password: str) -> str:
     """Generates a secure scrypt hash of the password."""
@@ -62,12 +67,15 @@ def authenticate_user(db: Session, username: str, password: str):
         return False
     return user
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def user_id_from_token(token: str) -> str:
+    """Returns the user id (the "sub" claim) of a valid access token; raises 401 otherwise."""
     try:
         payload = jwt.decode(
             token, 
@@ -76,15 +84,42 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         )
         user_id: int = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
-        
+        raise credentials_exception()
+    return user_id
+
+# Validated UserOut fields by user id (as a string, like the token subject), so authenticated
+# requests skip the user lookup. Every write to a user's UserOut fields (or deletion) calls invalidate_user.
+user_cache = projection_cache.LRUCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    max_bytes=settings.USER_CACHE_MAX_BYTES,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+def cached_user(user_id) -> Optional[schemas.UserOut]:
+    fields = user_cache.get(str(user_id))
+    return schemas.UserOut.model_construct(**fields) if fields is not None else None
+
+def cache_user(user) -> schemas.UserOut:
+    """Validates a models.User into UserOut and caches it for get_current_user."""
+    user_out = schemas.UserOut.model_validate(user)
+    user_cache.put(str(user_out.id), user_out.model_dump())
+    return user_out
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.discard(str(user_id))
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    user_id = user_id_from_token(token)
+    current_user = cached_user(user_id)
+    if current_user is not None:
+        return current_user # The session was never used, so no connection was checked out
     user = get_user(db, user_id=user_id)
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     # Convert models.User object to the Pydantic schema for consistency
-    return schemas.UserOut.model_validate(user)
+    return cache_user(user)
 
 def authenticate_or_create_google_user(db: Session, google_id: str, email: str):
     user = db.query(models.User).filter(models.User.google_id == google_id).first()
@@ -100,6 +135,7 @@ def authenticate_or_create_google_user(db: Session, google_id: str, email: str):
             user.google_id = google_id
             user.is_confirmed = True # Confirm email if logging in via Google
             db.commit()
+            invalidate_user(user.id)
             db.refresh(user)
         return user
     
@@ -118,7 +154,7 @@ def authenticate_or_create_google_user(db: Session, google_id: str, email: str):
     )
     db.add(new_user)
     db.commit()
-    print(f"DEBUG (auth.py): User committed successfully: {new_user.email}") # NEW DEBUG PRINT
+    logger.debug("User committed successfully: %s", new_user.email)
     db.refresh(new_user)
     return new_user
 
@@ -144,6 +180,7 @@ def change_user_password(db: Session, user_id: int, current_password: str, new_p
     hashed_new_password = get_password_hash(new_password)
     user.hashed_password = hashed_new_password
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     return user
 
@@ -153,7 +190,7 @@ def generate_random_token(length: int = 32) -> str:
 
 def create_password_reset_token(db: Session, user_id: int) -> str:
     # Invalidate any existing tokens for this user
-    db.query(models.PasswordResetToken).filter(models.PasswordResetToken.user_id == user_id).delete()
+    db.execute(owner_queries.delete_password_reset_tokens(user_id))
     db.commit()
 
     token_value = generate_random_token()
@@ -189,12 +226,13 @@ def reset_user_password(db: Session, token: str, new_password: str):
     user.is_confirmed = True # NEW: Confirm email upon successful password reset
     db.delete(db_token) # Invalidate the token after use
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     return user
 
 def create_email_confirmation_token(db: Session, user_id: int) -> str:
     # Invalidate any existing confirmation tokens for this user
-    db.query(models.EmailConfirmationToken).filter(models.EmailConfirmationToken.user_id == user_id).delete()
+    db.execute(owner_queries.delete_email_confirmation_tokens(user_id))
     db.commit()
 
     token_value = generate_random_token()
@@ -228,5 +266,6 @@ def verify_email_confirmation_token(db: Session, token: str):
     user.is_confirmed = True
     db.delete(db_token) # Invalidate the token after use
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     return user
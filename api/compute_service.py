@@ -0,0 +1,196 @@
+# api/compute_service.py
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import settings
+import incremental
+import logging_config
+import projection_cache
+import projection_core
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeError(Exception):
+    """Base class for compute service failures; status_code is the HTTP status to report."""
+    status_code = 500
+
+
+class ComputeQueueFull(ComputeError):
+    status_code = 503
+
+
+class ComputeTimeout(ComputeError):
+    status_code = 504
+
+
+class ComputeService:
+    """
+    Runs CPU-heavy projection work in a pool of worker processes, so a large projection does not
+    hold the GIL of the API process.
+
+    At most `max_queue` jobs may be queued or running; further submissions are rejected with
+    ComputeQueueFull. Callers stop waiting after `timeout_seconds` (ComputeTimeout). A job that
+    is already running cannot be interrupted, so it keeps its queue slot until it finishes.
+    Workers are replaced after `max_tasks_per_child` jobs, and a broken pool (a crashed worker)
+    is rebuilt on the next submission. With `workers=0` jobs run in a thread pool instead.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout_seconds: float, max_tasks_per_child: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(max_queue, 1))
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # Spawned workers start clean instead of inheriting the parent's DB connections.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        max_tasks_per_child=self.max_tasks_per_child or None,
+                        initializer=logging_config.configure,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=max(self.max_queue, 1))
+            return self._executor
+
+    def _restart(self, executor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.pool_restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn, *args):
+        """Queues fn(*args) and returns a concurrent.futures.Future. fn and args must be picklable."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ComputeQueueFull(f"Projection queue is full ({self.max_queue} jobs); try again shortly")
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(executor)
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.pending += 1
+            self.submitted += 1
+        future.add_done_callback(lambda done: self._finished(done, executor))
+        return future
+
+    def _finished(self, future, executor) -> None:
+        self._slots.release()
+        failed = future.cancelled() or future.exception() is not None
+        with self._lock:
+            self.pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._restart(executor)
+
+    async def run(self, fn, *args):
+        """Awaits fn(*args) in the pool without blocking the event loop."""
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise ComputeTimeout(f"Projection did not finish within {self.timeout_seconds:g} seconds")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout_seconds,
+                "max_tasks_per_child": self.max_tasks_per_child,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "rejected": self.rejected,
+                "pool_restarts": self.pool_restarts,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared instance used by the projection endpoints.
+service = ComputeService(
+    workers=settings.COMPUTE_WORKERS,
+    max_queue=settings.COMPUTE_MAX_QUEUE,
+    timeout_seconds=settings.COMPUTE_TIMEOUT_SECONDS,
+    max_tasks_per_child=settings.COMPUTE_MAX_TASKS_PER_CHILD,
+)
+
+
+async def project(owner_snapshot, years: int, accounts: list, filing_status=None) -> dict:
+    """
+    Async counterpart of projection_core.project_snapshot: the result cache is checked in this
+    process and only cache misses are sent to the compute pool. The incremental state of the
+    previous run is sent along with the job and the updated one kept here, so it survives worker
+    recycling and does not depend on which worker runs the job.
+    """
+    accounts = projection_cache.request_accounts(accounts)
+    cache_key = projection_cache.make_key(years, accounts, owner_snapshot, filing_status)
+    cached = projection_cache.cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Projection cache hit for owner %s", owner_snapshot.owner_id)
+        return cached
+
+    key = projection_core.incremental_key(owner_snapshot.owner_id, years, accounts)
+    result, run = await service.run(projection_core.compute_from_state, owner_snapshot, years, accounts,
+                                    filing_status, incremental.projector.get(key))
+    incremental.projector.record(key, run)
+    projection_cache.cache.put(cache_key, owner_snapshot.owner_id, result)
+    return result
+
+
+async def project_columns(owner_snapshot, years: int, accounts: list, filing_status=None) -> dict:
+    """
+    The projection as the columnar dict (projection_format.columnar_data), for streaming it as
+    records without encoding and re-parsing data_json. Uses the incremental state like project();
+    the result cache holds encoded results and is not consulted.
+    """
+    accounts = projection_cache.request_accounts(accounts)
+    key = projection_core.incremental_key(owner_snapshot.owner_id, years, accounts)
+    data, run = await service.run(projection_core.columns_from_state, owner_snapshot, years, accounts,
+                                  filing_status, incremental.projector.get(key))
+    incremental.projector.record(key, run)
+    return data
@@ -47,6 +47,50 @@ class Settings(BaseSettings):
     MAIL_PORT: int = int(os.getenv("MAIL_PORT", 587))
     MAIL_SERVER: str | None = os.getenv("MAIL_SERVER", "")
     CORS_ORIGINS_REGEX: str = os.getenv("CORS_ORIGINS_REGEX", "INJECT_CORS_ORIGINS_REGEX_HERE")
+
+    # Projection result cache (per process)
+    PROJECTION_CACHE_MAX_ENTRIES: int = int(os.getenv("PROJECTION_CACHE_MAX_ENTRIES", 256))
+    PROJECTION_CACHE_MAX_BYTES: int = int(os.getenv("PROJECTION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    PROJECTION_CACHE_TTL_SECONDS: int = int(os.getenv("PROJECTION_CACHE_TTL_SECONDS", 600))
+    REAL_BASIS_CACHE_MAX_ENTRIES: int = int(os.getenv("REAL_BASIS_CACHE_MAX_ENTRIES", 256)) # Real-dollar views (see real_basis.py)
+    # Authenticated users (UserOut) looked up by get_current_user. Writes invalidate them in this process
+    # only, so the TTL bounds how long another worker can serve a stale user.
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", 4096))
+    USER_CACHE_MAX_BYTES: int = int(os.getenv("USER_CACHE_MAX_BYTES", 4 * 1024 * 1024))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+    # Per-account columns kept for incremental recomputation (see incremental.py)
+    INCREMENTAL_PROJECTION_MAX_STATES: int = int(os.getenv("INCREMENTAL_PROJECTION_MAX_STATES", 64))
+
+    # Connection pool warm-up at startup (see main.lifespan). The engines are created lazily, so the
+    # app starts without the database; /ready reports 503 until the warm-up has connected.
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", 2)) # 0 skips the warm-up
+    DB_WARMUP_RETRIES: int = int(os.getenv("DB_WARMUP_RETRIES", 5))
+    DB_WARMUP_RETRY_DELAY_SECONDS: float = float(os.getenv("DB_WARMUP_RETRY_DELAY_SECONDS", 2))
+
+    # Native async database path (see async_database.py and routers/async_api.py). When enabled, the
+    # CRUD and projection endpoints use asyncpg sessions instead of pg8000 sessions in the threadpool.
+    ASYNC_DATABASE: bool = os.getenv("ASYNC_DATABASE", "false").lower() in ("1", "true", "yes")
+    ASYNC_DB_POOL_SIZE: int = int(os.getenv("ASYNC_DB_POOL_SIZE", 20))
+    ASYNC_DB_MAX_OVERFLOW: int = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", 20))
+
+    # Projection compute pool (see compute_service.py). COMPUTE_WORKERS=0 runs jobs in threads instead.
+    COMPUTE_WORKERS: int = int(os.getenv("COMPUTE_WORKERS", 2))
+    COMPUTE_MAX_QUEUE: int = int(os.getenv("COMPUTE_MAX_QUEUE", 32)) # Jobs queued or running before new ones are rejected
+    COMPUTE_TIMEOUT_SECONDS: float = float(os.getenv("COMPUTE_TIMEOUT_SECONDS", 60))
+    COMPUTE_MAX_TASKS_PER_CHILD: int = int(os.getenv("COMPUTE_MAX_TASKS_PER_CHILD", 200)) # Worker recycling; 0 keeps workers forever
+
+    # Asynchronous projection jobs (see jobs.py)
+    PROJECTION_JOBS_MAX: int = int(os.getenv("PROJECTION_JOBS_MAX", 1000))
+    PROJECTION_JOB_RETENTION_SECONDS: int = int(os.getenv("PROJECTION_JOB_RETENTION_SECONDS", 3600))
+    PROJECTION_JOBS_CONCURRENCY: int = int(os.getenv("PROJECTION_JOBS_CONCURRENCY", 2)) # Jobs running at once; the rest stay queued
+    PROJECTION_JOB_MONTE_CARLO_CHUNK: int = int(os.getenv("PROJECTION_JOB_MONTE_CARLO_CHUNK", 2000)) # Paths per compute task, in whole monte_carlo.BLOCK_PATHS blocks
+    PROJECTION_JOB_SCENARIO_CHUNK: int = int(os.getenv("PROJECTION_JOB_SCENARIO_CHUNK", 10)) # Scenarios per compute task
+
+    # Logging (see logging_config.py)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "") # Per-module overrides, e.g. "projection_core=DEBUG,auth=WARNING"
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json") # "json" (one object per line) or "text"
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", 1.0)) # Fraction of DEBUG/INFO records kept
     
 
     # Method to generate DATABASE_URL after validation
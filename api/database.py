@@ -1,3 +1,4 @@
+import logging
 import os
 import time
 from functools import lru_cache
@@ -7,6 +8,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from typing import Any, Generator
 from sqlalchemy.exc import OperationalError
 
+logger = logging.getLogger(__name__)
+
 _unix_socket_path: str | None = None # Global to store unix socket path if used
 
 @lru_cache(maxsize=1)
@@ -19,19 +22,19 @@ def get_database_url() -> str:
         db_password = os.getenv("DB_PASSWORD") or os.getenv("_DB_PASSWORD")
         db_name = os.getenv("DB_NAME")
         cloud_sql_connection_name = os.getenv("CLOUD_SQL_CONNECTION_NAME")
-        print(f"DEBUG (database.py): CLOUD_SQL_CONNECTION_NAME (from os.getenv): '{cloud_sql_connection_name}'") # NEW DEBUG
+        logger.debug("CLOUD_SQL_CONNECTION_NAME (from os.getenv): '%s'", cloud_sql_connection_name)
 
         if not all([db_user, db_password, db_name]):
             raise ValueError("Missing one or more database environment variables (DB_USER, DB_PASSWORD, DB_NAME)")
 
         if cloud_sql_connection_name:
-            print("DEBUG (database.py): Entering Cloud SQL Proxy SYNC connection path.") # NEW DEBUG
+            logger.debug("Entering Cloud SQL Proxy SYNC connection path.")
             _unix_socket_path = f"/cloudsql/{cloud_sql_connection_name}/.s.PGSQL.5432"
             database_url = (
                 f"postgresql+pg8000://{db_user}:{db_password}@/{db_name}?unix_sock={_unix_socket_path}"
             )
         else:
-            print("DEBUG (database.py): Entering local TCP SYNC connection path.") # NEW DEBUG
+            logger.debug("Entering local TCP SYNC connection path.")
             local_db_host = os.getenv("DB_HOST", "localhost")
             local_db_port = os.getenv("DB_PORT", "5432")
             database_url = (
@@ -41,47 +44,92 @@ def get_database_url() -> str:
     if database_url is None:
         raise ValueError("DATABASE_URL could not be determined from environment variables.")
 
-    print(f"DEBUG (database.py): Constructed SYNC SQLALCHEMY_DATABASE_URL: {database_url}")
+    logger.debug("Constructed SYNC SQLALCHEMY_DATABASE_URL: %s", database_url)
     return database_url
 
 @lru_cache(maxsize=1)
 def get_engine_instance():
+    """
+    The sync engine, created on first use. create_engine opens no connection, so importing this
+    module (and main.py) never waits for the database; warm_up() connects ahead of the first request.
+    """
     global _unix_socket_path # Access global variable
     DATABASE_URL = get_database_url()
-    print(f"DEBUG (database.py): Using DATABASE_URL for engine: {DATABASE_URL}")
+    logger.debug("Using DATABASE_URL for engine: %s", DATABASE_URL)
 
     connect_args = {}
     if _unix_socket_path:
         connect_args["unix_sock"] = _unix_socket_path
 
-    retries = 5
-    delay = 2 # seconds
-    for i in range(retries):
+    return create_engine(
+        DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True, # A connection opened by the warm-up may be stale by the first request
+        connect_args=connect_args # Pass connect_args here
+    )
+
+
+def __getattr__(name: str):
+    # `database.engine` stays available, but is only created when first accessed.
+    if name == "engine":
+        return get_engine_instance()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warm_up(connections: int, retries: int = 5, delay: float = 2.0) -> None:
+    """
+    Opens `connections` pooled connections at once and runs SELECT 1 on each, so they are idle
+    in the pool when the first requests arrive. Retries with a fixed delay; raises the last
+    OperationalError if the database stays unreachable. Blocking: call it from a thread.
+    """
+    engine = get_engine_instance()
+    for attempt in range(retries):
+        opened = []
         try:
-            engine = create_engine(
-                DATABASE_URL,
-                pool_size=10,
-                max_overflow=20,
-                pool_timeout=30,
-                pool_recycle=1800,
-                connect_args=connect_args # Pass connect_args here
-            )
-            with engine.connect() as connection:
+            for _ in range(max(connections, 1)):
+                connection = engine.connect()
+                opened.append(connection)
                 connection.execute(text("SELECT 1"))
-            print("DEBUG (database.py): Database engine created and connection tested successfully.")
-            return engine
+            logger.info("Database pool warmed up with %d connections.", len(opened))
+            return
         except OperationalError as e:
-            print(f"ERROR (database.py): Database connection failed (attempt {i+1}/{retries}): {e}")
-            if i < retries - 1:
-                time.sleep(delay)
-            else:
+            logger.error("Database connection failed (attempt %d/%d): %s", attempt + 1, retries, e)
+            if attempt == retries - 1:
                 raise
+            time.sleep(delay)
+        finally:
+            for connection in opened:
+                connection.close() # Returns it to the pool
+
+
+def pool_status() -> dict:
+    """Sizes of the sync connection pool; all zero before the engine has been created."""
+    if not get_engine_instance.cache_info().currsize:
+        return {"created": False, "size": 0, "checked_in": 0, "checked_out": 0, "overflow": 0}
+    pool = get_engine_instance().pool
+    return {
+        "created": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
 
-# Instantiate the engine once at startup
-engine = get_engine_instance()
+def dispose() -> None:
+    """Closes the sync pool if the engine was ever created."""
+    if get_engine_instance.cache_info().currsize:
+        get_engine_instance().dispose()
 
-# Create a SessionLocal class that will be used to create new session instances
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+def SessionLocal() -> Session:
+    """New Session bound to the engine (which is created on first use)."""
+    return _session_factory(bind=get_engine_instance())
 
 Base = declarative_base()
 
@@ -93,11 +141,21 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def commit_and_refresh(db: Session, instance):
+    """Adds, commits and refreshes one instance; lets async endpoints run the write in the threadpool."""
+    db.add(instance)
+    db.commit()
+    db.refresh(instance)
+    return instance
+
 # Ensure it also uses caching if it were to be actively used in a hot path.
 @lru_cache(maxsize=1) # Cache the result of this function if it were to be used frequently
 def get_async_database_url() -> str:
     global _unix_socket_path # Access global variable
     database_url = os.getenv("DATABASE_URL") # Check if a single DATABASE_URL is provided
+    if database_url is not None and database_url.startswith("postgresql+pg8000://"):
+        # One DATABASE_URL serves both paths; the async engine needs the asyncpg driver.
+        database_url = "postgresql+asyncpg://" + database_url[len("postgresql+pg8000://"):]
 
     if database_url is None:
         db_user = os.getenv("DB_USER")
@@ -105,8 +163,8 @@ def get_async_database_url() -> str:
         db_name = os.getenv("DB_NAME")
         cloud_sql_connection_name = os.getenv("CLOUD_SQL_CONNECTION_NAME")
 
-        if not all([db_user, db_password, db_name, cloud_sql_connection_name]):
-            raise ValueError("Missing one or more database environment variables for async URL (DB_USER, DB_PASSWORD, DB_NAME, CLOUD_SQL_CONNECTION_NAME)")
+        if not all([db_user, db_password, db_name]):
+            raise ValueError("Missing one or more database environment variables for async URL (DB_USER, DB_PASSWORD, DB_NAME)")
 
         if cloud_sql_connection_name:
             _unix_socket_path = f"/cloudsql/{cloud_sql_connection_name}/.s.PGSQL.5432" # Keep full path for pg8000
@@ -122,5 +180,5 @@ def get_async_database_url() -> str:
             )
     if database_url is None:
         raise ValueError("ASYNC DATABASE_URL could not be determined from environment variables.")
-    print(f"DEBUG (database.py): Constructed ASYNC SQLALCHEMY_DATABASE_URL: {database_url}")
+    logger.debug("Constructed ASYNC SQLALCHEMY_DATABASE_URL: %s", database_url)
     return database_url
\ No newline at end of file
@@ -0,0 +1,125 @@
+# api/dependency_graph.py
+
+from typing import Iterable, List, Optional
+
+CASHFLOW_LINK_TYPES = ('income', 'expense')
+
+
+class DependencyCycleError(ValueError):
+    """Raised when linked cash flow items depend on each other in a loop."""
+
+    def __init__(self, cycle: list):
+        self.cycle = cycle # List of (id, description) tuples, first item repeated at the end
+        path = " -> ".join(f"{description} (ID: {item_id})" for item_id, description in cycle)
+        super().__init__(f"Circular dependency between linked cash flow items: {path}")
+
+    def __reduce__(self):
+        # Rebuilt from the cycle, so the error survives the trip back from a compute worker process
+        return (DependencyCycleError, (self.cycle,))
+
+
+def _get(item, key):
+    # Accepts both the dicts built in calculations.py and ORM/snapshot objects.
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
+def is_dynamic(item) -> bool:
+    """True if the item's yearly value is derived from another item via linked_item_id/percentage."""
+    return bool(_get(item, "linked_item_id") and _get(item, "linked_item_type") and _get(item, "percentage") is not None)
+
+
+def is_static(item) -> bool:
+    """True if the item has no link fields at all, so its stored yearly_value is used as is."""
+    return not _get(item, "linked_item_id") and not _get(item, "linked_item_type") and _get(item, "percentage") is None
+
+
+class CashFlowGraph:
+    """
+    Dependency graph of cash flow items linked to other income/expense items.
+
+    Each item links to at most one other item, so the graph is built once in O(n) and
+    evaluated in topological order instead of re-scanning every item on each pass.
+    """
+
+    def __init__(self, items: Iterable):
+        self.items = list(items)
+        self.by_id = {_get(item, "id"): item for item in self.items}
+        # depends_on[id] -> id of the cash flow item it reads its value from
+        self.depends_on = {}
+        for item in self.items:
+            if is_dynamic(item) and _get(item, "linked_item_type") in CASHFLOW_LINK_TYPES:
+                linked_id = _get(item, "linked_item_id")
+                if linked_id in self.by_id:
+                    self.depends_on[_get(item, "id")] = linked_id
+
+    def find_cycle(self) -> Optional[list]:
+        """Returns the first cycle found as a list of (id, description), or None if the graph is acyclic."""
+        state = {} # id -> 1 while on the current path, 2 once known to be acyclic
+        for start in self.depends_on:
+            path = []
+            node = start
+            while node is not None and state.get(node) is None:
+                state[node] = 1
+                path.append(node)
+                node = self.depends_on.get(node)
+            if node is not None and state[node] == 1:
+                cycle_ids = path[path.index(node):] + [node]
+                return [(item_id, _get(self.by_id[item_id], "description")) for item_id in cycle_ids]
+            for visited in path:
+                state[visited] = 2
+        return None
+
+    def check_acyclic(self) -> None:
+        cycle = self.find_cycle()
+        if cycle:
+            raise DependencyCycleError(cycle)
+
+    def topological_order(self) -> List:
+        """Returns the items ordered so that every item comes after the item it links to."""
+        self.check_acyclic()
+        ordered = []
+        placed = set()
+        for item in self.items:
+            chain = []
+            item_id = _get(item, "id")
+            while item_id is not None and item_id not in placed:
+                chain.append(item_id)
+                item_id = self.depends_on.get(item_id)
+            for chain_id in reversed(chain):
+                placed.add(chain_id)
+                ordered.append(self.by_id[chain_id])
+        return ordered
+
+
+def resolve_yearly_values(items: Iterable, asset_values: dict, liability_values: dict) -> dict:
+    """
+    Resolves the yearly value of every cash flow item, keyed by item id.
+
+    Static items keep their stored yearly_value. Dynamic items take `percentage` of the item,
+    asset or liability they link to (assets and liabilities at their initial value). Items with
+    incomplete or dangling links resolve to 0.0. Raises DependencyCycleError on circular links.
+    """
+    graph = CashFlowGraph(items)
+    values = {}
+    for item in graph.topological_order():
+        item_id = _get(item, "id")
+        if is_static(item):
+            values[item_id] = _get(item, "yearly_value")
+            continue
+
+        linked_value = 0.0
+        if is_dynamic(item):
+            linked_item_type = _get(item, "linked_item_type")
+            linked_item_id = _get(item, "linked_item_id")
+            if linked_item_type in CASHFLOW_LINK_TYPES:
+                linked_value = values.get(linked_item_id, 0.0)
+            elif linked_item_type == 'asset':
+                linked_value = asset_values.get(linked_item_id, 0.0)
+            elif linked_item_type == 'liability':
+                linked_value = liability_values.get(linked_item_id, 0.0)
+            values[item_id] = linked_value * (_get(item, "percentage") / 100.0)
+        else:
+            values[item_id] = 0.0
+    return values
@@ -0,0 +1,142 @@
+# api/goal_seek.py
+
+from typing import Optional
+
+import numpy as np
+
+import projection_engine
+import scenarios
+
+VARIABLES = ("monthly_contribution", "growth_rate", "years")
+
+# Candidates evaluated together in one batched engine pass; each pass narrows the bracket
+# around the target by a factor of CANDIDATES - 1.
+CANDIDATES = 33
+MAX_ITERATIONS = 30
+MAX_EXPANSIONS = 12 # Bracket widenings tried when the default search range misses the target
+MAX_YEARS = 150
+
+DEFAULT_TOLERANCE = {"monthly_contribution": 0.01, "growth_rate": 1e-4}
+
+
+def _overrides(variable: str, account_name: Optional[str], candidates) -> list:
+    """Scenario dicts (see scenarios.build_scenario_arrays) setting the variable to each candidate."""
+    if variable == "monthly_contribution":
+        return [{"account_overrides": [{"name": account_name, "monthly_contribution": float(x)}]} for x in candidates]
+    if account_name:
+        return [{"account_overrides": [{"name": account_name, "annual_increase_percent": float(x)}]} for x in candidates]
+    return [{"growth_rate_delta_percent": float(x)} for x in candidates]
+
+
+def _default_range(variable: str, account_name: Optional[str], target_value: float, years: int):
+    if variable == "monthly_contribution":
+        # Enough to reach the target from nothing without any growth; widened below if needed.
+        return 0.0, max(abs(target_value) / (12 * years), 100.0)
+    if account_name:
+        return -20.0, 50.0
+    return -20.0, 30.0 # growth_rate_delta_percent on top of the current rates
+
+
+def _solve_years(model, target_value: float, max_years: int) -> dict:
+    result = projection_engine.simulate(model, max_years, keep_values=False)
+    reached = np.flatnonzero(result.total_value >= target_value)
+    if len(reached):
+        year = int(reached[0])
+        return {"value": float(year + 1), "years": year + 1, "final_value": float(result.total_value[year]),
+                "converged": True, "iterations": 1, "evaluations": 1}
+    return {"value": None, "years": max_years, "final_value": float(result.total_value[-1]) if max_years else 0.0,
+            "converged": False, "iterations": 1, "evaluations": 1}
+
+
+def solve(combined_accounts: list, years: int, target_value: float, variable: str,
+          account_name: Optional[str] = None, lower: Optional[float] = None, upper: Optional[float] = None,
+          tolerance: Optional[float] = None) -> dict:
+    """
+    Finds the value of `variable` for which Total_Value after `years` reaches `target_value`.
+
+    variable is one of:
+      monthly_contribution - of the account (or cash flow item) named account_name
+      growth_rate          - annual_increase_percent of account_name, or, without an account,
+                             a delta in percent added to the rate of every asset-like account
+      years                - the first year in which Total_Value reaches the target (up to
+                             `upper` or 150 years; `years` is ignored)
+
+    Contribution and growth are found by a batched bisection: CANDIDATES evenly spaced values
+    are projected in one vectorized pass, the pair bracketing the target becomes the next
+    range, and this repeats until the range is narrower than `tolerance`. Without explicit
+    bounds the default range is widened until it brackets the target. The returned value is
+    the bracket end that reaches the target. Raises ValueError for unknown variables or accounts.
+    """
+    if variable not in VARIABLES:
+        raise ValueError(f"Unknown goal-seek variable '{variable}'")
+    model = projection_engine.ProjectionModel(combined_accounts)
+    if account_name is not None and account_name not in model.names:
+        raise ValueError(f"Unknown account '{account_name}'")
+    if variable == "monthly_contribution" and account_name is None:
+        raise ValueError("Solving for monthly_contribution needs an account_name")
+
+    summary = {"variable": variable, "account_name": account_name, "target_value": target_value}
+    if variable == "years":
+        max_years = int(upper) if upper is not None else MAX_YEARS
+        return {**summary, **_solve_years(model, target_value, max_years)}
+
+    default_lower, default_upper = _default_range(variable, account_name, target_value, years)
+    expand = lower is None and upper is None
+    lower = default_lower if lower is None else lower
+    upper = default_upper if upper is None else upper
+    if upper <= lower:
+        raise ValueError("upper must be greater than lower")
+    tolerance = DEFAULT_TOLERANCE[variable] if tolerance is None else tolerance
+
+    evaluations = 0
+
+    def final_values(candidates):
+        nonlocal evaluations
+        evaluations += 1
+        rate, contribution, initial = scenarios.build_scenario_arrays(
+            model, combined_accounts, _overrides(variable, account_name, candidates)
+        )
+        result = projection_engine.simulate(
+            model, years, rate=rate, contribution=contribution, initial=initial, keep_values=False
+        )
+        return result.total_value[:, -1]
+
+    candidates = np.linspace(lower, upper, CANDIDATES)
+    finals = final_values(candidates)
+    for _ in range(MAX_EXPANSIONS if expand else 0):
+        if finals.min() <= target_value <= finals.max():
+            break
+        # Widen towards the side whose values move towards the target.
+        width = upper - lower
+        rising = finals[-1] >= finals[0]
+        if (finals.max() < target_value) == rising:
+            upper += 4 * width
+        else:
+            lower -= 4 * width
+        candidates = np.linspace(lower, upper, CANDIDATES)
+        finals = final_values(candidates)
+
+    reached = finals >= target_value
+    crossing = np.flatnonzero(reached[:-1] != reached[1:])
+    if not len(crossing):
+        best = int(np.argmin(np.abs(finals - target_value)))
+        return {**summary, "value": float(candidates[best]), "years": years, "final_value": float(finals[best]),
+                "converged": False, "iterations": 0, "evaluations": evaluations}
+
+    iterations = 0
+    while True:
+        i = int(crossing[0])
+        lower, upper = candidates[i], candidates[i + 1]
+        low_final, high_final = finals[i], finals[i + 1]
+        if upper - lower <= tolerance or iterations >= MAX_ITERATIONS:
+            break
+        iterations += 1
+        candidates = np.linspace(lower, upper, CANDIDATES)
+        finals = final_values(candidates)
+        finals[0], finals[-1] = low_final, high_final # Bracket ends are already known
+        reached = finals >= target_value
+        crossing = np.flatnonzero(reached[:-1] != reached[1:])
+
+    value, final_value = (upper, high_final) if high_final >= target_value else (lower, low_final)
+    return {**summary, "value": float(value), "years": years, "final_value": float(final_value),
+            "converged": bool(upper - lower <= tolerance), "iterations": iterations, "evaluations": evaluations}
@@ -0,0 +1,182 @@
+# api/incremental.py
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import projection_engine
+from config import settings
+
+
+def affected_accounts(combined_accounts: list, changed: set) -> list:
+    """
+    Returns the positions whose yearly columns can change when the accounts at `changed` do:
+    the changed accounts, accounts sharing a balance (name) with them, cash flow items linked
+    to any of those (transitively), and the balances those linked items read from.
+    """
+    names = {combined_accounts[i]["name"] for i in changed}
+    grown = True
+    while grown:
+        grown = False
+        for acc in combined_accounts:
+            if "linked_account" not in acc:
+                continue
+            linked_name = acc["linked_account"]
+            if acc["name"] in names and linked_name is not None and linked_name not in names:
+                names.add(linked_name)
+                grown = True
+            elif linked_name in names and acc["name"] not in names:
+                names.add(acc["name"])
+                grown = True
+    return [i for i, acc in enumerate(combined_accounts) if acc["name"] in names]
+
+
+class _State:
+    __slots__ = ("accounts", "model", "account_values", "account_contributions", "account_growth")
+
+    def __init__(self, accounts, model, account_values, account_contributions, account_growth):
+        self.accounts = accounts
+        self.model = model
+        self.account_values = account_values
+        self.account_contributions = account_contributions
+        self.account_growth = account_growth
+
+
+FULL = "full"
+INCREMENTAL = "incremental"
+REUSED = "reused"
+
+
+class Run:
+    """
+    Outcome of project_from_state: the result, the state to keep for the next call, how it was
+    computed (FULL, INCREMENTAL or REUSED) and how many accounts were re-projected. Picklable,
+    so a worker process can compute it while the parent process keeps the states.
+    """
+    __slots__ = ("result", "state", "kind", "accounts_recomputed")
+
+    def __init__(self, result, state, kind, accounts_recomputed):
+        self.result = result
+        self.state = state
+        self.kind = kind
+        self.accounts_recomputed = accounts_recomputed
+
+
+def project_from_state(state, years: int, combined_accounts: list) -> Run:
+    """
+    Projects the combined accounts, re-projecting only the accounts that changed since `state`
+    (the state kept from the previous call for the same key, or None). Touches no shared data.
+    """
+    if state is not None and _same_structure(state, combined_accounts):
+        run = _update(state, combined_accounts)
+        if run is not None:
+            return run
+    model = projection_engine.ProjectionModel(combined_accounts)
+    result = projection_engine.run_projection(model, years, keep_accounts=True)
+    return Run(result, _State(combined_accounts, model, *result.accounts), FULL, len(model))
+
+
+def _same_structure(state: _State, combined_accounts: list) -> bool:
+    return (state.model.names == [acc["name"] for acc in combined_accounts]
+            and state.model.types == [acc["type"] for acc in combined_accounts])
+
+
+def _update(state: _State, combined_accounts: list):
+    changed = {i for i, (old, new) in enumerate(zip(state.accounts, combined_accounts)) if old != new}
+    positions = affected_accounts(combined_accounts, changed) if changed else []
+    if len(positions) == len(combined_accounts) and changed:
+        return None
+
+    account_values = state.account_values
+    account_contributions = state.account_contributions
+    account_growth = state.account_growth
+    if positions:
+        years = account_values.shape[0]
+        subset = projection_engine.ProjectionModel([combined_accounts[i] for i in positions])
+        partial = projection_engine.run_projection(subset, years, keep_accounts=True)
+        account_values = account_values.copy()
+        account_contributions = account_contributions.copy()
+        account_growth = account_growth.copy()
+        partial_values, partial_contributions, partial_growth = partial.accounts
+        account_values[:, positions] = partial_values
+        account_contributions[:, positions] = partial_contributions
+        account_growth[:, positions] = partial_growth
+
+    initial = np.array([float(acc["initial_balance"]) for acc in combined_accounts], dtype=np.float64)
+    result = projection_engine.result_from_accounts(
+        state.model, initial, account_values, account_contributions, account_growth
+    )
+    new_state = _State(combined_accounts, state.model, account_values, account_contributions, account_growth)
+    return Run(result, new_state, INCREMENTAL if positions else REUSED, len(positions))
+
+
+class IncrementalProjector:
+    """
+    Keeps the per-account yearly columns of the last projection for each (owner, years, request)
+    and, when the combined accounts change, re-projects only the accounts affected by the change.
+
+    Editing one asset therefore costs a projection of that asset and the cash flow items linked
+    to it, plus a re-sum of the stored columns, instead of a projection of the whole household.
+    Adding, removing, renaming or retyping accounts falls back to a full run.
+
+    The states live in the process that owns the projector (the API process). When the projection
+    runs in a compute worker, the caller passes get(key) along with the job and record()s the
+    returned Run, so consecutive edits hit the incremental path whichever worker computes them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._states = OrderedDict() # (owner_id, years, request_key) -> _State
+        self._lock = threading.Lock()
+        self.full_runs = 0
+        self.incremental_runs = 0
+        self.reused_runs = 0
+        self.accounts_recomputed = 0
+
+    def project(self, owner_id: int, years: int, request_key: str, combined_accounts: list):
+        key = (owner_id, years, request_key)
+        run = project_from_state(self.get(key), years, combined_accounts)
+        self.record(key, run)
+        return run.result
+
+    def get(self, key):
+        """The state kept for (owner_id, years, request_key), or None."""
+        with self._lock:
+            return self._states.get(key)
+
+    def record(self, key, run: Run) -> None:
+        """Counts a Run and keeps its state for the next projection with the same key."""
+        with self._lock:
+            if run.kind == FULL:
+                self.full_runs += 1
+            elif run.kind == INCREMENTAL:
+                self.incremental_runs += 1
+            else:
+                self.reused_runs += 1
+            self.accounts_recomputed += run.accounts_recomputed
+            if self.max_entries > 0:
+                self._states[key] = run.state
+                self._states.move_to_end(key)
+                while len(self._states) > self.max_entries:
+                    self._states.popitem(last=False)
+
+    def discard_owner(self, owner_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._states if key[0] == owner_id]:
+                del self._states[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "states": len(self._states),
+                "max_entries": self.max_entries,
+                "full_runs": self.full_runs,
+                "incremental_runs": self.incremental_runs,
+                "reused_runs": self.reused_runs,
+                "accounts_recomputed": self.accounts_recomputed,
+            }
+
+
+# Shared instance used by calculations.calculate_projection.
+projector = IncrementalProjector(max_entries=settings.INCREMENTAL_PROJECTION_MAX_STATES)
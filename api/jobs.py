@@ -0,0 +1,202 @@
+# api/jobs.py
+
+import asyncio
+import logging
+import secrets
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+import compute_service
+import monte_carlo
+import projection_format
+import scenarios
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Job:
+    """State of one asynchronous projection job, as reported by GET /projections/jobs/{id}."""
+    __slots__ = ("id", "owner_id", "kind", "status", "progress", "result", "error", "projection_id",
+                 "created_at", "started_at", "finished_at", "task")
+
+    def __init__(self, owner_id: int, kind: str):
+        self.id = uuid.uuid4().hex
+        self.owner_id = owner_id
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.projection_id = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "projection_id": self.projection_id,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    """
+    Per-process registry of projection jobs. Finished jobs are kept for `retention_seconds` and
+    at most `max_jobs` jobs are tracked (oldest finished jobs are dropped first). Jobs live in the
+    memory of the instance that accepted them, so polling must reach the same instance.
+    """
+
+    def __init__(self, max_jobs: int, retention_seconds: float):
+        self.max_jobs = max_jobs
+        self.retention_seconds = retention_seconds
+        self._jobs = OrderedDict() # id -> Job
+        self._lock = threading.Lock()
+
+    def create(self, owner_id: int, kind: str) -> Job:
+        job = Job(owner_id, kind)
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                raise compute_service.ComputeQueueFull(f"Too many projection jobs ({self.max_jobs}); try again shortly")
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str, owner_id: int) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.owner_id != owner_id:
+            return None
+        return job
+
+    def _prune(self) -> None:
+        # Caller must hold the lock.
+        cutoff = time.time() - self.retention_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.done and job.finished_at.timestamp() < cutoff:
+                del self._jobs[job_id]
+        if len(self._jobs) >= self.max_jobs:
+            for job_id, job in list(self._jobs.items()):
+                if job.done:
+                    del self._jobs[job_id]
+                    break
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+
+
+store = JobStore(max_jobs=settings.PROJECTION_JOBS_MAX, retention_seconds=settings.PROJECTION_JOB_RETENTION_SECONDS)
+
+# Event loop -> semaphore bounding the jobs running on it (asyncio primitives belong to one loop).
+_running_slots = weakref.WeakKeyDictionary()
+
+
+def start(job: Job, work) -> Job:
+    """
+    Schedules the coroutine `work` for the job on the running event loop. The job stays queued
+    until one of the PROJECTION_JOBS_CONCURRENCY running slots is free.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _running_slots.get(loop)
+    if slots is None:
+        slots = _running_slots[loop] = asyncio.Semaphore(max(settings.PROJECTION_JOBS_CONCURRENCY, 1))
+    job.task = loop.create_task(_run(job, work, slots))
+    return job
+
+
+async def _run(job: Job, work, slots: asyncio.Semaphore) -> None:
+    async with slots:
+        job.status = RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            job.result = await work
+            job.progress = 1.0
+            job.status = SUCCEEDED
+        except Exception as e:
+            logger.error("Projection job %s (%s) failed: %s", job.id, job.kind, e)
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+async def _run_chunks(job: Job, fn, chunk_args: list) -> list:
+    """Runs fn(*args) for every chunk in the compute pool, updating job.progress as chunks finish."""
+    limit = asyncio.Semaphore(max(compute_service.service.workers, 1))
+    finished = 0
+
+    async def run_chunk(args):
+        nonlocal finished
+        async with limit:
+            result = await compute_service.service.run(fn, *args)
+        finished += 1
+        job.progress = finished / len(chunk_args)
+        return result
+
+    return await asyncio.gather(*(run_chunk(args) for args in chunk_args))
+
+
+async def projection_work(job: Job, owner_snapshot, years: int, accounts: list,
+                          persist: Optional[Callable[[dict], int]] = None, filing_status: Optional[str] = None) -> dict:
+    """A standard projection; `persist(result)` (run in the threadpool) may store it and return its id."""
+    result = await compute_service.project(owner_snapshot, years, accounts, filing_status)
+    if persist is not None:
+        job.progress = 0.9
+        job.projection_id = await run_in_threadpool(persist, result)
+    # Stored columnar; the job result matches the synchronous endpoint's per-year records.
+    return {**result, "data_json": projection_format.convert(result["data_json"], projection_format.LEGACY)}
+
+
+async def monte_carlo_work(job: Job, combined_accounts: list, years: int, paths: int, assumptions: dict,
+                           seed: Optional[int] = None) -> dict:
+    """
+    Monte Carlo split into chunks of whole path blocks (monte_carlo.path_blocks), so the result
+    equals POST /projections/montecarlo with the same seed.
+    """
+    if seed is None:
+        seed = secrets.randbits(32)
+    blocks = monte_carlo.path_blocks(paths, seed)
+    per_chunk = max(settings.PROJECTION_JOB_MONTE_CARLO_CHUNK // monte_carlo.BLOCK_PATHS, 1)
+    chunks = await _run_chunks(job, monte_carlo.simulate_paths, [
+        (combined_accounts, years, assumptions, blocks[start:start + per_chunk])
+        for start in range(0, len(blocks), per_chunk)
+    ])
+    return monte_carlo.summarize_paths(np.concatenate(chunks, axis=0), seed)
+
+
+async def batch_work(job: Job, combined_accounts: list, years: int, scenario_list: list) -> dict:
+    """Batch scenarios split into chunks of scenarios."""
+    chunk_size = max(settings.PROJECTION_JOB_SCENARIO_CHUNK, 1)
+    chunks = await _run_chunks(job, scenarios.run_scenarios, [
+        (combined_accounts, years, scenario_list[start:start + chunk_size])
+        for start in range(0, len(scenario_list), chunk_size)
+    ])
+    return {"scenarios": [summary for chunk in chunks for summary in chunk]}
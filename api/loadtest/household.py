@@ -0,0 +1,102 @@
+# api/loadtest/household.py
+
+import json
+import os
+import random
+import uuid
+
+PASSWORD = "loadtest123"
+
+_engines = {} # LOADTEST_DATABASE_URL -> SQLAlchemy engine, shared by all simulated users
+
+
+def confirm_email(email: str) -> None:
+    """
+    Marks a load-test user as confirmed, since /token refuses unconfirmed accounts and the
+    confirmation link is only sent by email. Needs LOADTEST_DATABASE_URL (the API's database).
+    """
+    database_url = os.getenv("LOADTEST_DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("Set LOADTEST_DATABASE_URL (or LOADTEST_EMAIL/LOADTEST_PASSWORD) to log load-test users in")
+    from sqlalchemy import create_engine, text
+
+    engine = _engines.get(database_url)
+    if engine is None:
+        engine = _engines[database_url] = create_engine(database_url, pool_size=2)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE users SET is_confirmed = true WHERE email = :email"), {"email": email})
+
+
+def login(client, email: str, password: str) -> dict:
+    """Returns the Authorization header for the user."""
+    response = client.post("/token", data={"username": email, "password": password}, name="/token")
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_user(client) -> dict:
+    """
+    Signs up and logs in a fresh user; returns its Authorization header. With LOADTEST_EMAIL and
+    LOADTEST_PASSWORD set, that (already confirmed) account is used instead.
+    """
+    if os.getenv("LOADTEST_EMAIL"):
+        return login(client, os.environ["LOADTEST_EMAIL"], os.environ["LOADTEST_PASSWORD"])
+    email = f"loadtest-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/signup", json={"email": email, "password": PASSWORD}, name="/signup")
+    response.raise_for_status()
+    confirm_email(email)
+    return login(client, email, PASSWORD)
+
+
+def seed_household(client, headers: dict, rng: random.Random, assets: int, liabilities: int,
+                   cashflows: int, linked: int) -> dict:
+    """
+    Creates a household through the CRUD endpoints and returns the ids of what was created:
+    {"assets": [...], "liabilities": [...], "cashflows": [...]}. Linked cash flow items track a
+    percentage of one of the new assets or liabilities.
+    """
+    household = {"assets": [], "liabilities": [], "cashflows": []}
+    for i in range(assets):
+        response = client.post("/assets", headers=headers, name="/assets [seed]", json={
+            "name": f"Asset {i}", "category": "Investments", "value": round(rng.uniform(1000, 400000), 2),
+            "annual_increase_percent": round(rng.uniform(0, 8), 2), "annual_change_type": "increase",
+        })
+        response.raise_for_status()
+        household["assets"].append(response.json()["id"])
+    for i in range(liabilities):
+        response = client.post("/liabilities", headers=headers, name="/liabilities [seed]", json={
+            "name": f"Liability {i}", "category": "Mortgage", "value": round(rng.uniform(1000, 300000), 2),
+            "annual_increase_percent": round(rng.uniform(0, 6), 2), "annual_change_type": "decrease",
+        })
+        response.raise_for_status()
+        household["liabilities"].append(response.json()["id"])
+    for i in range(cashflows + linked):
+        item = {
+            "is_income": rng.random() < 0.4, "category": "Other", "description": f"Flow {i}",
+            "frequency": rng.choice(["monthly", "yearly"]), "value": round(rng.uniform(50, 5000), 2),
+            "annual_increase_percent": round(rng.uniform(0, 3), 2), "inflation_percent": 2.0,
+        }
+        targets = [("asset", asset_id) for asset_id in household["assets"]]
+        targets += [("liability", liability_id) for liability_id in household["liabilities"]]
+        if i >= cashflows and targets:
+            item["linked_item_type"], item["linked_item_id"] = rng.choice(targets)
+            item["percentage"] = round(rng.uniform(0.5, 5), 2)
+        response = client.post("/cashflow", headers=headers, name="/cashflow [seed]", json=item)
+        response.raise_for_status()
+        household["cashflows"].append(response.json()["id"])
+    return household
+
+
+def projection_accounts(rng: random.Random, count: int = 3) -> list:
+    """Frontend-style accounts sent with POST/PUT /projections."""
+    return [{
+        "name": f"Savings {i}", "type": "asset", "initial_balance": round(rng.uniform(0, 50000), 2),
+        "monthly_contribution": round(rng.uniform(0, 1500), 2), "annual_increase_percent": round(rng.uniform(1, 7), 2),
+        "annual_change_type": "increase",
+    } for i in range(count)]
+
+
+def chart_payload(household: dict, name: str) -> dict:
+    series = [{"data_type": "asset", "item_id": asset_id} for asset_id in household["assets"]]
+    series += [{"data_type": "liability", "item_id": liability_id} for liability_id in household["liabilities"]]
+    return {"name": name, "chart_type": "line", "series_configurations": json.dumps(series)}
@@ -0,0 +1,35 @@
+# api/loadtest/slo.py
+
+
+def check(total, p95_ms: float, p99_ms: float, max_error_rate: float) -> list:
+    """
+    Compares aggregated Locust stats (environment.stats.total) with the thresholds and returns
+    one message per violated objective; an empty list means the run passed. A threshold of 0
+    disables that check.
+    """
+    violations = []
+    if total.num_requests == 0:
+        return ["No requests were made"]
+    p95 = total.get_response_time_percentile(0.95)
+    p99 = total.get_response_time_percentile(0.99)
+    if p95_ms and p95 > p95_ms:
+        violations.append(f"p95 latency {p95:.0f} ms exceeds {p95_ms:.0f} ms")
+    if p99_ms and p99 > p99_ms:
+        violations.append(f"p99 latency {p99:.0f} ms exceeds {p99_ms:.0f} ms")
+    if max_error_rate and total.fail_ratio > max_error_rate:
+        violations.append(f"Error rate {total.fail_ratio:.2%} exceeds {max_error_rate:.2%}")
+    return violations
+
+
+def summary(stats) -> str:
+    """One line per endpoint with request count, p95/p99 and failures, plus the aggregate throughput."""
+    lines = []
+    for entry in sorted(stats.entries.values(), key=lambda e: e.num_requests, reverse=True):
+        lines.append(
+            f"{entry.method:6} {entry.name:40} {entry.num_requests:7d} req "
+            f"p95 {entry.get_response_time_percentile(0.95):6.0f} ms  p99 {entry.get_response_time_percentile(0.99):6.0f} ms  "
+            f"failures {entry.num_failures}"
+        )
+    total = stats.total
+    lines.append(f"Total: {total.num_requests} requests, {total.total_rps:.1f} req/s, error rate {total.fail_ratio:.2%}")
+    return "\n".join(lines)
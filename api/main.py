@@ -1,40 +1,103 @@
-from fastapi import FastAPI, Depends, HTTPException, Response, status, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from datetime import timedelta, datetime
-from typing import List
+from typing import List, Literal
 from starlette.responses import RedirectResponse
 from utils import google_oauth
 from jose import jwt, JWTError
 import json
+import logging
 import os # Keep os for getenv in config.py (if not using pydantic-settings, but remove load_dotenv)
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.requests import Request
-import traceback
+from contextlib import asynccontextmanager
+import asyncio
+
+# Logging is configured before the internal modules are imported, so their import-time messages are formatted.
+from config import settings # 🌟 NEW: Import the settings object
+import logging_config
+logging_config.configure()
 
 # Internal Modules
 import models
 import schemas
 import database
 import auth
-import calculations
-from routers import custom_charts
+import dependency_graph
+import incremental
+import owner_queries
+import projection_cache
+import projection_format
+import real_basis
+import compute_service
+import jobs
+import snapshot_loader
+from routers import custom_charts, projections
 from utils.email import send_email
-from config import settings # 🌟 NEW: Import the settings object
+
+logger = logging.getLogger(__name__)
 
 # --- INITIALIZATION ---
 # REMOVED: database.Base.metadata.create_all(bind=database.engine) # Alembic handles migrations
 
-app = FastAPI(title="Financial Projector API", version="1.0", _proxy_headers=True, servers=[{"url": settings.PUBLIC_BACKEND_URL}])
+# Importing this module never touches the database: the engines are created on first use, and the
+# lifespan warms their pools in the background while the app already accepts requests. /ready
+# reports whether that warm-up has connected.
+readiness = {"state": "pending", "error": None}
+
+async def warm_up_database():
+    readiness["state"] = "warming"
+    try:
+        await run_in_threadpool(database.warm_up, settings.DB_WARMUP_CONNECTIONS,
+                                settings.DB_WARMUP_RETRIES, settings.DB_WARMUP_RETRY_DELAY_SECONDS)
+        if settings.ASYNC_DATABASE:
+            import async_database
+            await async_database.warm_up(settings.DB_WARMUP_CONNECTIONS)
+    except Exception as e:
+        logger.error("Database warm-up failed: %s", e)
+        readiness.update(state="failed", error=str(e))
+    else:
+        readiness["state"] = "ready"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up = None
+    if settings.DB_WARMUP_CONNECTIONS > 0:
+        warm_up = asyncio.create_task(warm_up_database())
+    else:
+        readiness["state"] = "ready" # Connections are opened by the first requests
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    compute_service.service.shutdown()
+    if settings.ASYNC_DATABASE:
+        import async_database
+        await async_database.dispose()
+    database.dispose()
+
+app = FastAPI(title="Financial Projector API", version="1.0", _proxy_headers=True, servers=[{"url": settings.PUBLIC_BACKEND_URL}],
+              lifespan=lifespan)
 
 app.include_router(custom_charts.router)
+app.include_router(projections.router)
 
 @app.get("/")
 async def root():
     return {"message": "Financial Projector API is running!"}
 
+@app.get("/ready", summary="Readiness: whether the database pool has been warmed up")
+async def ready():
+    body = {"status": readiness["state"], "pool": database.pool_status()}
+    if readiness["error"]:
+        body["error"] = readiness["error"]
+    if readiness["state"] != "ready":
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
+
 @app.get("/debug-env", tags=["debug"])
 async def debug_environment():
     return dict(os.environ)
@@ -90,14 +153,14 @@ async def google_callback(code: str, db: Session = Depends(database.get_db)):
         # Redirect to frontend with our token
         # Frontend will store this token and log in
         redirect_url = f"{settings.FRONTEND_URL}/auth/google/callback?token={our_access_token}"
-        print(f"DEBUG (main.py): Redirecting to: {redirect_url}") # NEW DEBUG PRINT
+        logger.debug("Redirecting to: %s", redirect_url)
         return RedirectResponse(url=redirect_url)
 
     except HTTPException as e:
         # Pass through explicit HTTPExceptions
         raise e
     except Exception as e:
-        print(f"ERROR (main.py) in google_callback: {e}") # Modified ERROR print
+        logger.error("google_callback failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Google OAuth failed: {e}"
@@ -110,7 +173,7 @@ def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(database.get_db)
 ):
-    print(f"DEBUG (main.py): Attempting login for user: {form_data.username}") # NEW DEBUG
+    logger.debug("Attempting login for user: %s", form_data.username)
     # This function should be defined in your 'auth' module
     user = auth.authenticate_user(db, form_data.username, form_data.password)
     if not user:
@@ -144,17 +207,41 @@ def read_users_me(
 
 @app.get("/debug/users", response_model=list[schemas.UserOut], summary="Debug: Get all users from DB")
 def debug_get_all_users(db: Session = Depends(database.get_db)):
-    print("DEBUG (main.py): Fetching all users from database via /debug/users endpoint.")
+    logger.debug("Fetching all users from database via /debug/users endpoint.")
     users = db.query(models.User).all()
-    print(f"DEBUG (main.py): Found {len(users)} users.")
+    logger.debug("Found %d users.", len(users))
     return users
 
 @app.get("/debug/db-info", summary="Debug: Get current database info")
 def debug_db_info(db: Session = Depends(database.get_db)):
     result = db.execute(text("SELECT current_database();")).scalar_one()
-    print(f"DEBUG (main.py): Current database from /debug/db-info: {result}")
+    logger.debug("Current database from /debug/db-info: %s", result)
     return {"current_database": result}
 
+@app.get("/debug/projection-cache", tags=["debug"], summary="Debug: Projection result cache statistics")
+def debug_projection_cache():
+    return projection_cache.cache.stats()
+
+@app.get("/debug/real-basis-cache", tags=["debug"], summary="Debug: Real-dollar view cache statistics")
+def debug_real_basis_cache():
+    return real_basis.cache.stats()
+
+@app.get("/debug/user-cache", tags=["debug"], summary="Debug: Authenticated user cache statistics")
+def debug_user_cache():
+    return auth.user_cache.stats()
+
+@app.get("/debug/incremental-projections", tags=["debug"], summary="Debug: Incremental projection statistics")
+def debug_incremental_projections():
+    return incremental.projector.stats()
+
+@app.get("/debug/compute", tags=["debug"], summary="Debug: Projection compute pool statistics")
+def debug_compute():
+    return compute_service.service.stats()
+
+@app.get("/debug/projection-jobs", tags=["debug"], summary="Debug: Projection job counts by status")
+def debug_projection_jobs():
+    return jobs.store.stats()
+
 @app.post("/signup", response_model=schemas.UserOut, status_code=status.HTTP_201_CREATED)
 def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db), background_tasks: BackgroundTasks = BackgroundTasks()): # NEW: Add BackgroundTasks
     """
@@ -196,7 +283,7 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)
     # Send confirmation email in the background
     confirmation_token = auth.create_email_confirmation_token(db, db_user.id)
     confirmation_link = f"{settings.FRONTEND_URL}/confirm-email?token={confirmation_token}"
-    print(f"Email confirmation link: {confirmation_link}")
+    logger.debug("Email confirmation link: %s", confirmation_link)
     background_tasks.add_task(send_email, 
         to_email=db_user.email,
         subject="Financial Projector - Confirm Your Email",
@@ -234,6 +321,9 @@ def delete_user_by_admin(
 
     db.delete(user_to_delete)
     db.commit()
+    auth.invalidate_user(user_id)
+    projection_cache.invalidate_owner(user_id)
+    incremental.projector.discard_owner(user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @app.get("/admin/users", response_model=list[schemas.UserOut], tags=["admin"])
@@ -269,6 +359,7 @@ def set_user_admin_status(
 
     user_to_update.is_admin = status_update.is_admin
     db.commit()
+    auth.invalidate_user(user_id)
     db.refresh(user_to_update)
     return user_to_update
 
@@ -347,7 +438,7 @@ def forgot_password(
     if user:
         token = auth.create_password_reset_token(db, user.id)
         reset_link = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-    print(f"Password reset link: {reset_link}")
+    logger.debug("Password reset link: %s", reset_link)
     send_email(
         to_email=user.email,
         subject="Financial Projector - Password Reset Request",
@@ -404,21 +495,25 @@ def verify_email(
     return confirmed_user
 
 @app.post("/projections", response_model=schemas.ProjectionResponse, status_code=status.HTTP_201_CREATED)
-def create_projection(
+async def create_projection(
     projection_data: schemas.ProjectionRequest,
     user: schemas.UserOut = Depends(auth.get_current_user), 
     db: Session = Depends(database.get_db)
 ):
     """
-    Creates a new projection, runs the calculation, and saves the results to the database."""
-    print(f"DEBUG (main.py): Entering create_projection endpoint for user {user.id}. Calling calculate_projection.")
+    Creates a new projection, runs the calculation, and saves the results to the database.
+    Database work runs in the threadpool and the projection itself in the compute pool."""
+    logger.debug("Entering create_projection endpoint for user %s. Submitting to compute service.", user.id)
     try:
-        projection_results = calculations.calculate_projection(
+        owner_snapshot = await run_in_threadpool(snapshot_loader.load_snapshot, db, user.id)
+        projection_results = await compute_service.project(
+            owner_snapshot,
             years=projection_data.years,
             accounts=projection_data.accounts,
-            db=db,
-            owner_id=user.id
+            filing_status=projection_data.tax_filing_status,
         )
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -437,20 +532,24 @@ def create_projection(
         data_json=data_json,
         accounts_json=json.dumps([acc.model_dump() for acc in projection_data.accounts]),
     )
-    db.add(db_projection)
-    db.commit()
-    db.refresh(db_projection)
+    await run_in_threadpool(database.commit_and_refresh, db, db_projection)
 
     return db_projection
 
 @app.get("/projections/{projection_id}", response_model=schemas.ProjectionDetailOut, tags=["projections"])
 def get_projection_details(
     projection_id: int, 
+    data_format: Literal["legacy", "columnar"] = Query("legacy", alias="format"),
+    basis: Literal["nominal", "real"] = Query("nominal"),
+    inflation: float | None = Query(None, gt=-100, le=100),
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
     """
-    Retrieves a single projection if the user is the owner."""
+    Retrieves a single projection if the user is the owner.
+    data_json is returned as per-year records unless ?format=columnar is given.
+    ?basis=real deflates the stored nominal result to today's dollars at ?inflation= percent
+    (default: the user's default inflation setting) without re-running the projection."""
     
     projection = db.query(models.Projection).filter(models.Projection.id == projection_id).first()
     
@@ -459,8 +558,46 @@ def get_projection_details(
 
     if projection.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this projection.")
-    
-    return projection
+
+    if basis == "real":
+        if inflation is None:
+            user_settings = db.scalars(owner_queries.user_settings(current_user.id)).first()
+            inflation = user_settings.default_inflation_percent if user_settings else real_basis.DEFAULT_INFLATION_PERCENT
+        try:
+            fields = real_basis.detail_fields(projection, inflation)
+        except ValueError as e:
+            logger.error("Projection %s has unreadable data_json: %s", projection_id, e)
+            raise HTTPException(status_code=500, detail="Stored projection data could not be read.")
+        return schemas.ProjectionDetailOut.model_validate(fields, context={"data_format": data_format})
+
+    return schemas.ProjectionDetailOut.model_validate(projection, context={"data_format": data_format})
+
+@app.get("/projections/{projection_id}/stream", tags=["projections"])
+def stream_projection_details(
+    projection_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: schemas.UserOut = Depends(auth.get_current_user)
+):
+    """
+    Streams a saved projection's yearly records as NDJSON (one JSON object per line) instead of one
+    data_json string, so clients can start rendering before the whole horizon has arrived."""
+
+    projection = db.query(models.Projection).filter(models.Projection.id == projection_id).first()
+
+    if not projection:
+        raise HTTPException(status_code=404, detail="Projection not found.")
+
+    if projection.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this projection.")
+
+    try:
+        data = json.loads(projection.data_json or "[]")
+        projection_format.detect(data)
+    except ValueError as e:
+        logger.error("Projection %s has unreadable data_json: %s", projection_id, e)
+        raise HTTPException(status_code=500, detail="Stored projection data could not be read.")
+
+    return StreamingResponse(projection_format.iter_ndjson(data), media_type="application/x-ndjson")
 
 @app.get("/projections", response_model=List[schemas.ProjectionResponse], tags=["projections"])
 def list_projections(
@@ -470,12 +607,12 @@ def list_projections(
     """
     Lists all projections owned by the current user."""
     
-    projections = db.query(models.Projection).filter(models.Projection.owner_id == current_user.id).all()
+    projections = db.scalars(owner_queries.projections(current_user.id)).all()
     
     return projections
 
 @app.put("/projections/{projection_id}", response_model=schemas.ProjectionOut, tags=["projections"])
-def update_projection(
+async def update_projection(
     projection_id: int,
     req: schemas.ProjectionRequest,
     db: Session = Depends(database.get_db),
@@ -483,7 +620,7 @@ def update_projection(
 ):
     """
     Updates an existing projection if user is the owner."""
-    projection = db.query(models.Projection).filter(models.Projection.id == projection_id).first()
+    projection = await run_in_threadpool(db.query(models.Projection).filter(models.Projection.id == projection_id).first)
     
     if not projection:
         raise HTTPException(status_code=404, detail="Projection not found.")
@@ -491,13 +628,20 @@ def update_projection(
     if projection.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this projection.")
     
-    print(f"DEBUG (main.py): Entering update_projection endpoint for user {current_user.id}. Calling calculate_projection.")
-    result = calculations.calculate_projection(
-        years=req.years,
-        accounts=req.accounts,
-        db=db,
-        owner_id=current_user.id
-    )
+    logger.debug("Entering update_projection endpoint for user %s. Submitting to compute service.", current_user.id)
+    owner_snapshot = await run_in_threadpool(snapshot_loader.load_snapshot, db, current_user.id)
+    try:
+        result = await compute_service.project(
+            owner_snapshot,
+            years=req.years,
+            accounts=req.accounts,
+            filing_status=req.tax_filing_status,
+        )
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except dependency_graph.DependencyCycleError as e:
+        # Cycles are rejected when items are linked, but rows stored before that check may still have one
+        raise HTTPException(status_code=400, detail=str(e))
     
     projection.name = req.plan_name
     projection.years = req.years
@@ -505,11 +649,10 @@ def update_projection(
     projection.total_contributed = result["total_contributed"]
     projection.total_growth = result["total_growth"]
     projection.data_json = result["data_json"]
-    projection.accounts_json = json.dumps([acc.model_dump() for acc in req.accounts]),
+    projection.accounts_json = json.dumps([acc.model_dump() for acc in req.accounts])
     projection.timestamp = datetime.utcnow()
     
-    db.commit()
-    db.refresh(projection)
+    await run_in_threadpool(database.commit_and_refresh, db, projection)
     return projection
 
 @app.delete("/projections/{projection_id}", status_code=204, tags=["projections"])
@@ -535,13 +678,7 @@ def list_cashflow(
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
-    return (
-        db.query(models.CashFlowItem)
-        .filter(models.CashFlowItem.owner_id == current_user.id)
-        .filter(models.CashFlowItem.is_income == is_income)
-        .order_by(models.CashFlowItem.id.desc())
-        .all()
-    )
+    return db.scalars(owner_queries.cashflow_items(current_user.id, is_income)).all()
 
 @app.post("/cashflow", response_model=schemas.CashFlowOut, status_code=201, tags=["cashflow"])
 def create_cashflow(
@@ -573,6 +710,7 @@ def create_cashflow(
     )
     db.add(item)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(item)
     return item
 
@@ -607,7 +745,17 @@ def update_cashflow(
     item.linked_item_id = payload.linked_item_id
     item.linked_item_type = payload.linked_item_type
     item.percentage = payload.percentage
+
+    # Re-linking an item is the only way to introduce a cycle, so validate the owner's graph here
+    # rather than on every projection.
+    owner_items = db.query(models.CashFlowItem).filter(models.CashFlowItem.owner_id == current_user.id).all()
+    try:
+        dependency_graph.CashFlowGraph(owner_items).check_acyclic()
+    except dependency_graph.DependencyCycleError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(item)
     return item
 
@@ -624,6 +772,7 @@ def delete_cashflow(
         raise HTTPException(status_code=403, detail="Not authorized")
     db.delete(item)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     return Response(status_code=204)
 
 @app.get("/settings", response_model=schemas.UserSettingsOut, tags=["settings"])
@@ -631,7 +780,7 @@ def get_settings(
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
-    settings = db.query(models.UserSettings).filter(models.UserSettings.user_id == current_user.id).first()
+    settings = db.scalars(owner_queries.user_settings(current_user.id)).first()
     if not settings:
         settings = models.UserSettings(
             user_id=current_user.id,
@@ -658,7 +807,7 @@ def get_settings(
     except Exception as e:
         db.rollback()
         # Another request may have created it, try to fetch again
-        settings = db.query(models.UserSettings).filter(models.UserSettings.user_id == current_user.id).first()
+        settings = db.scalars(owner_queries.user_settings(current_user.id)).first()
         if not settings:
             # If still not found, re-raise the original exception
             raise e
@@ -670,7 +819,7 @@ def update_settings(
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
-    settings = db.query(models.UserSettings).filter(models.UserSettings.user_id == current_user.id).first()
+    settings = db.scalars(owner_queries.user_settings(current_user.id)).first()
     if not settings:
         settings = models.UserSettings(user_id=current_user.id)
         db.add(settings)
@@ -719,7 +868,7 @@ def update_settings(
         return settings
     except Exception as e:
         db.rollback()
-        print(f"Error updating settings: {e}")
+        logger.error("Error updating settings: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update settings: {e}")
 
 
@@ -730,12 +879,7 @@ def list_assets(
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
-    return (
-        db.query(models.Asset)
-        .filter(models.Asset.owner_id == current_user.id)
-        .order_by(models.Asset.id.desc())
-        .all()
-    )
+    return db.scalars(owner_queries.assets(current_user.id)).all()
 
 
 @app.post("/assets", response_model=schemas.AssetOut, status_code=201, tags=["assets"])
@@ -756,6 +900,7 @@ def create_asset(
     )
     db.add(asset)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(asset)
     return asset
 
@@ -780,6 +925,7 @@ def update_asset(
     asset.start_date = payload.start_date  # New field
     asset.end_date = payload.end_date      # New field
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(asset)
     return asset
 
@@ -797,6 +943,7 @@ def delete_asset(
         raise HTTPException(status_code=403, detail="Not authorized")
     db.delete(asset)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     return Response(status_code=204)
 
 
@@ -807,12 +954,7 @@ def list_liabilities(
     db: Session = Depends(database.get_db),
     current_user: schemas.UserOut = Depends(auth.get_current_user)
 ):
-    return (
-        db.query(models.Liability)
-        .filter(models.Liability.owner_id == current_user.id)
-        .order_by(models.Liability.id.desc())
-        .all()
-    )
+    return db.scalars(owner_queries.liabilities(current_user.id)).all()
 
 
 @app.post("/liabilities", response_model=schemas.LiabilityOut, status_code=201, tags=["liabilities"])
@@ -829,10 +971,14 @@ def create_liability(
         annual_increase_percent=payload.annual_increase_percent,
         annual_change_type=payload.annual_change_type, # New field
         start_date=payload.start_date,  # New field
-        end_date=payload.end_date      # New field
+        end_date=payload.end_date,     # New field
+        interest_rate_percent=payload.interest_rate_percent,
+        term_months=payload.term_months,
+        monthly_payment=payload.monthly_payment,
     )
     db.add(liability)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(liability)
     return liability
 
@@ -856,7 +1002,11 @@ def update_liability(
     liability.annual_change_type = payload.annual_change_type # New field
     liability.start_date = payload.start_date  # New field
     liability.end_date = payload.end_date      # New field
+    liability.interest_rate_percent = payload.interest_rate_percent
+    liability.term_months = payload.term_months
+    liability.monthly_payment = payload.monthly_payment
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     db.refresh(liability)
     return liability
 
@@ -874,6 +1024,7 @@ def delete_liability(
         raise HTTPException(status_code=403, detail="Not authorized")
     db.delete(item)
     db.commit()
+    projection_cache.invalidate_owner(current_user.id)
     return Response(status_code=204)
 
 # --- Custom Chart Endpoints ---
@@ -903,7 +1054,7 @@ def list_custom_charts(
     user: schemas.UserOut = Depends(auth.get_current_user),
     db: Session = Depends(database.get_db)
 ):
-    charts = db.query(models.CustomChart).filter(models.CustomChart.user_id == user.id).all()
+    charts = db.scalars(owner_queries.custom_charts(user.id)).all()
     return charts
 
 @app.get("/custom_charts/{chart_id}", response_model=schemas.CustomChartOut, tags=["custom_charts"])
@@ -963,9 +1114,15 @@ async def debug_proxy_check():
     except Exception as e:
         return {"status": "error", "message": f"An unexpected error occurred: {e}"}
 
+# Native async database path: swaps the CRUD and projection endpoints above for their AsyncSession
+# versions. Imported only when enabled, so the sync path does not load the asyncio extension.
+if settings.ASYNC_DATABASE:
+    from routers import async_api
+    async_api.install(app)
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    print(f"DEBUG (main.py): HTTPException caught: {exc.detail}")
+    logger.debug("HTTPException caught: %s", exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -973,8 +1130,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    error_traceback = traceback.format_exc()
-    print(f"ERROR (main.py): Unhandled exception: {error_traceback}")
+    logger.error("Unhandled exception on %s %s", request.method, request.url.path, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal Server Error. Please check logs for details."},
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -38,6 +38,9 @@ class PasswordResetToken(Base):
     user_owner = relationship("User", back_populates="password_reset_tokens")
 
 
+Index("ix_password_reset_tokens_user_id", PasswordResetToken.user_id)
+
+
 class EmailConfirmationToken(Base):
     """
     SQLAlchemy Model for Email Confirmation Tokens.
@@ -52,6 +55,9 @@ class EmailConfirmationToken(Base):
     user_owner = relationship("User", back_populates="email_confirmation_tokens")
 
 
+Index("ix_email_confirmation_tokens_user_id", EmailConfirmationToken.user_id)
+
+
 class Projection(Base):
     """
     SQLAlchemy Model for the Projection table.
@@ -72,6 +78,10 @@ class Projection(Base):
     owner = relationship("User", back_populates="projections")
 
 
+# Owner-scoped indexes match the list endpoints and the snapshot loader (see check_query_plans.py)
+Index("ix_projections_owner_id_id", Projection.owner_id, Projection.id.desc())
+
+
 class CashFlowItem(Base):
     __tablename__ = "cashflow_items"
     id = Column(Integer, primary_key=True, index=True)
@@ -96,6 +106,9 @@ class CashFlowItem(Base):
     percentage = Column(Float, nullable=True)
 
 
+Index("ix_cashflow_items_owner_id_is_income_id", CashFlowItem.owner_id, CashFlowItem.is_income, CashFlowItem.id.desc())
+
+
 class UserSettings(Base):
     __tablename__ = "user_settings"
     id = Column(Integer, primary_key=True, index=True)
@@ -138,6 +151,9 @@ class Asset(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+Index("ix_assets_owner_id_id", Asset.owner_id, Asset.id.desc())
+
+
 class Liability(Base):
     __tablename__ = "liabilities"
     id = Column(Integer, primary_key=True, index=True)
@@ -149,9 +165,16 @@ class Liability(Base):
     annual_change_type = Column(String, default="increase") # New field
     start_date = Column(String, nullable=True)  # Start date as string (YYYY-MM-DD)
     end_date = Column(String, nullable=True)    # End date as string (YYYY-MM-DD)
+    # Amortization mode: with a rate and a term or payment, value is the outstanding balance paid down monthly
+    interest_rate_percent = Column(Float, nullable=True)
+    term_months = Column(Integer, nullable=True) # Remaining payments
+    monthly_payment = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+Index("ix_liabilities_owner_id_id", Liability.owner_id, Liability.id.desc())
+
+
 class CustomChart(Base):
     """
     SQLAlchemy Model for Custom Charts.
@@ -181,3 +204,6 @@ class CustomChart(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     owner = relationship("User")
+
+
+Index("ix_custom_charts_user_id_id", CustomChart.user_id, CustomChart.id.desc())
@@ -0,0 +1,117 @@
+# api/monte_carlo.py
+
+import secrets
+from typing import Optional
+
+import numpy as np
+
+import projection_engine
+
+PERCENTILES = (5, 25, 50, 75, 95)
+BLOCK_PATHS = 250 # Paths per random stream (see path_blocks)
+
+
+def _varying_accounts(combined_accounts: list, stochastic_ids: set) -> set:
+    """
+    Returns the positions of accounts whose values can differ between paths: stochastic assets,
+    accounts sharing a balance (name) with them, and cash flow items linked to any of those.
+    """
+    varying_names = {
+        acc["name"] for acc in combined_accounts
+        if acc["type"] == "asset" and acc.get("id") in stochastic_ids
+    }
+    changed = True
+    while changed:
+        changed = False
+        for acc in combined_accounts:
+            if acc["name"] not in varying_names and acc.get("linked_account") in varying_names:
+                varying_names.add(acc["name"])
+                changed = True
+    return {i for i, acc in enumerate(combined_accounts) if acc["name"] in varying_names}
+
+
+def path_blocks(paths: int, seed: int) -> list:
+    """
+    Splits `paths` into blocks of BLOCK_PATHS paths, each drawing from its own child of
+    SeedSequence(seed), as (size, child seed) pairs. A path's draws depend only on its block, so
+    run_monte_carlo and a job simulating the blocks in separate chunks (jobs.monte_carlo_work)
+    produce the same paths for the same seed.
+    """
+    sizes = [min(BLOCK_PATHS, paths - start) for start in range(0, paths, BLOCK_PATHS)]
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def simulate_paths(combined_accounts: list, years: int, assumptions: dict, blocks: list) -> np.ndarray:
+    """
+    Simulates the paths of `blocks` (see path_blocks) and returns Total_Value per path and year,
+    shaped (paths, years), in block order.
+    """
+    streams = [(size, np.random.default_rng(block_seed)) for size, block_seed in blocks]
+    paths = sum(size for size, _ in streams)
+
+    stochastic_ids = set(assumptions)
+    varying = _varying_accounts(combined_accounts, stochastic_ids)
+    fixed_accounts = [acc for i, acc in enumerate(combined_accounts) if i not in varying]
+    varying_accounts = [acc for i, acc in enumerate(combined_accounts) if i in varying]
+
+    # Accounts that do not depend on a stochastic asset are identical on every path, so they
+    # are projected once and only the varying accounts are stepped with a path axis.
+    fixed = projection_engine.run_projection(projection_engine.ProjectionModel(fixed_accounts), years)
+
+    model = projection_engine.ProjectionModel(varying_accounts)
+    stochastic_index, means, volatilities = [], [], []
+    for i, acc in enumerate(varying_accounts):
+        if acc["type"] == "asset" and acc.get("id") in stochastic_ids:
+            mean_percent, volatility_percent = assumptions[acc["id"]]
+            stochastic_index.append(i)
+            means.append(mean_percent / 100.0)
+            volatilities.append(volatility_percent / 100.0)
+    stochastic_index = np.array(stochastic_index, dtype=np.int64)
+    means = np.array(means, dtype=np.float64)
+    volatilities = np.array(volatilities, dtype=np.float64)
+
+    rate = np.array(np.broadcast_to(model.rate, (paths, len(model))), dtype=np.float64)
+
+    def rate_for_year(year, base_rate):
+        if len(stochastic_index) and streams:
+            draws = np.concatenate([rng.standard_normal((size, len(stochastic_index))) for size, rng in streams])
+            base_rate[:, stochastic_index] = means + volatilities * draws
+        return base_rate
+
+    result = projection_engine.simulate(model, years, rate=rate, rate_for_year=rate_for_year, keep_values=False)
+    return result.total_value + fixed.total_value
+
+
+def summarize_paths(total_value: np.ndarray, seed: int) -> dict:
+    """Percentile bands of Total_Value per year from simulated paths shaped (paths, years)."""
+    paths, years = total_value.shape
+    bands = []
+    if years:
+        percentile_values = np.percentile(total_value, PERCENTILES, axis=0).tolist()
+        for year in range(years):
+            band = {"Year": year + 1}
+            for percentile, row in zip(PERCENTILES, percentile_values):
+                band[f"p{percentile}"] = row[year]
+            bands.append(band)
+
+    return {
+        "paths": paths,
+        "years": years,
+        "seed": seed,
+        "bands": bands,
+    }
+
+
+def run_monte_carlo(combined_accounts: list, years: int, paths: int, assumptions: dict, seed: Optional[int] = None) -> dict:
+    """
+    Simulates `paths` stochastic projections of the combined accounts and returns percentile
+    bands of Total_Value per year.
+
+    `assumptions` maps asset id -> (mean_percent, volatility_percent). Each year the growth rate
+    of those assets is drawn from a normal distribution for every path; all other accounts keep
+    their deterministic rate. All paths are stepped together as one batch, so the cost grows with
+    paths x accounts x years array work rather than with repeated projection runs.
+    """
+    if seed is None:
+        seed = secrets.randbits(32)
+    return summarize_paths(simulate_paths(combined_accounts, years, assumptions, path_blocks(paths, seed)), seed)
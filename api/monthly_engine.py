@@ -0,0 +1,289 @@
+# api/monthly_engine.py
+
+import json
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+import projection_engine
+
+FLOW_TYPES = ("income", "expense")
+
+
+def month_index(value: Optional[str], origin: date) -> Optional[int]:
+    """Months from the origin month to a 'YYYY-MM-DD' (or 'YYYY-MM') date; None if unset or unparsable."""
+    if not value:
+        return None
+    try:
+        year, month = int(value[0:4]), int(value[5:7])
+    except (TypeError, ValueError):
+        return None
+    return (year - origin.year) * 12 + (month - origin.month)
+
+
+def _monthly_rate(annual_rate):
+    # Monthly rate that compounds to the annual rate over twelve months (-100% stays -100%).
+    annual_rate = np.maximum(annual_rate, -1.0)
+    return np.expm1(np.log1p(annual_rate) / 12)
+
+
+class MonthlyModel:
+    """
+    Per-account arrays for the monthly engine.
+
+    Accounts carry a balance unless they are income/expense flows. Each account is active from
+    the month of its start_date to the month of its end_date (inclusive); open ends extend to the
+    projection boundaries. Balances open at initial_balance in their first active month and are
+    closed (zero) after their last. Flows linked to an asset/liability ("linked_account") are
+    re-evaluated every month as a percentage of that balance. Accounts with a "monthly_schedule"
+    (amortizing loans and their payments, see amortization.py) take their balance or payment for
+    each month from it instead of compounding.
+    """
+    __slots__ = (
+        "names", "types", "is_flow", "initial", "monthly_rate", "contribution", "start", "end",
+        "dynamic_index", "dynamic_source", "dynamic_percentage", "dynamic_valid", "dynamic_sign",
+        "schedule_index", "schedule", "columns", "column_of",
+    )
+
+    def __init__(self, accounts: list, origin: date, months: int):
+        n = len(accounts)
+        self.names = [acc["name"] for acc in accounts]
+        self.types = [acc["type"] for acc in accounts]
+        self.is_flow = np.array([t in FLOW_TYPES for t in self.types], dtype=bool)
+        self.initial = np.array(
+            [0.0 if flow else float(acc["initial_balance"]) for acc, flow in zip(accounts, self.is_flow)],
+            dtype=np.float64,
+        )
+
+        # Balances grow by their signed rate; flows escalate by their annual increase (cash flow
+        # items carry inflation_percent there for expenses), independent of the change type.
+        annual_rate = np.array([(acc.get("annual_increase_percent") or 0.0) / 100.0 for acc in accounts], dtype=np.float64)
+        decrease = np.array([acc.get("annual_change_type", "increase") == "decrease" for acc in accounts], dtype=bool)
+        annual_rate = np.where(decrease & ~self.is_flow, -annual_rate, annual_rate)
+        self.monthly_rate = _monthly_rate(annual_rate) if n else np.zeros(0, dtype=np.float64)
+
+        self.contribution = np.array(
+            [projection_engine.signed_annual_contribution(acc["type"], acc.get("monthly_contribution", 0.0)) / 12
+             for acc in accounts],
+            dtype=np.float64,
+        )
+
+        start, end = [], []
+        for acc in accounts:
+            first = month_index(acc.get("start_date"), origin)
+            last = month_index(acc.get("end_date"), origin)
+            start.append(0 if first is None else max(first, 0))
+            end.append(months - 1 if last is None else min(last, months - 1))
+        self.start = np.array(start, dtype=np.int64)
+        self.end = np.array(end, dtype=np.int64)
+
+        column_by_name = {}
+        for name in self.names:
+            column_by_name.setdefault(name, len(column_by_name))
+        self.columns = list(column_by_name)
+        self.column_of = np.array([column_by_name[name] for name in self.names], dtype=np.int64)
+
+        dynamic_index, dynamic_source, dynamic_percentage, dynamic_valid = [], [], [], []
+        for i, acc in enumerate(accounts):
+            if "linked_account" not in acc:
+                continue
+            linked_name = acc["linked_account"]
+            dynamic_index.append(i)
+            dynamic_valid.append(linked_name in column_by_name)
+            dynamic_source.append(column_by_name.get(linked_name, 0))
+            dynamic_percentage.append((acc.get("percentage") or 0.0) / 100.0)
+        self.dynamic_index = np.array(dynamic_index, dtype=np.int64)
+        self.dynamic_source = np.array(dynamic_source, dtype=np.int64)
+        self.dynamic_percentage = np.array(dynamic_percentage, dtype=np.float64)
+        self.dynamic_valid = np.array(dynamic_valid, dtype=bool)
+        self.dynamic_sign = np.array(
+            [-1.0 if self.types[i] in projection_engine.NEGATIVE_FLOW_TYPES else 1.0 for i in dynamic_index],
+            dtype=np.float64,
+        )
+
+        # (months, scheduled accounts): balances hold their last scheduled value, payments stop.
+        schedule_index = [i for i, acc in enumerate(accounts) if acc.get("monthly_schedule") is not None]
+        self.schedule_index = np.array(schedule_index, dtype=np.int64)
+        self.schedule = np.zeros((months, len(schedule_index)), dtype=np.float64)
+        for column, i in enumerate(schedule_index):
+            scheduled = np.asarray(accounts[i]["monthly_schedule"], dtype=np.float64)[:months]
+            if self.is_flow[i]:
+                scheduled = scheduled * (-1.0 if self.types[i] in projection_engine.NEGATIVE_FLOW_TYPES else 1.0)
+            self.schedule[:len(scheduled), column] = scheduled
+            if not self.is_flow[i] and len(scheduled):
+                self.schedule[len(scheduled):, column] = scheduled[-1]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class MonthlyResult:
+    """Monthly arrays indexed [month, column] for values and [month] for totals."""
+    __slots__ = ("origin", "columns", "values", "is_flow_column", "starting_value",
+                 "total_contribution", "total_growth", "total_value")
+
+    def __init__(self, origin, columns, values, is_flow_column, starting_value, total_contribution, total_growth, total_value):
+        self.origin = origin
+        self.columns = columns
+        self.values = values
+        self.is_flow_column = is_flow_column
+        self.starting_value = starting_value
+        self.total_contribution = total_contribution
+        self.total_growth = total_growth
+        self.total_value = total_value
+
+    @property
+    def months(self) -> int:
+        return self.total_value.shape[0]
+
+    def to_records(self) -> list:
+        keys = [f"{name}_Value" for name in self.columns]
+        starting = self.starting_value.tolist()
+        contributions = self.total_contribution.tolist()
+        growth = self.total_growth.tolist()
+        totals = self.total_value.tolist()
+        records = []
+        for month, row in enumerate(self.values.tolist()):
+            year, month_of_year = divmod(self.origin.month - 1 + month, 12)
+            record = {
+                "Month": month + 1,
+                "Date": f"{self.origin.year + year:04d}-{month_of_year + 1:02d}",
+                "StartingValue": starting[month],
+            }
+            record.update(zip(keys, row))
+            record["Total_Contribution"] = contributions[month]
+            record["Total_Growth"] = growth[month]
+            record["Total_Value"] = totals[month]
+            records.append(record)
+        return records
+
+    def to_annual(self) -> projection_engine.ProjectionResult:
+        """
+        Rolls the months up into projection years: balances are taken at the last month of each
+        year, flows and totals of contributions/growth are summed over its twelve months.
+        """
+        years = self.months // 12
+        by_year = self.values[:years * 12].reshape(years, 12, -1)
+        values = np.where(self.is_flow_column, by_year.sum(axis=1), by_year[:, -1, :])
+        total_value = values.sum(axis=1)
+        total_contribution = self.total_contribution[:years * 12].reshape(years, 12).sum(axis=1)
+        starting_value = np.zeros(years, dtype=np.float64)
+        if years:
+            starting_value[0] = self.starting_value[0]
+            starting_value[1:] = total_value[:-1]
+        return projection_engine.ProjectionResult(
+            columns=self.columns,
+            values=values,
+            starting_value=starting_value,
+            total_contribution=total_contribution,
+            total_growth=self.total_growth[:years * 12].reshape(years, 12).sum(axis=1),
+            total_value=total_value,
+            total_contributed=float(total_contribution.sum()),
+        )
+
+
+def simulate_monthly(accounts: list, years: int, origin: Optional[date] = None) -> MonthlyResult:
+    """
+    Projects the accounts month by month over `years` years starting at the origin month
+    (default: the current month).
+
+    The recurrence b[k] = b[k-1] * (1 + g) + c * (1 + g / 2) of an active balance has the closed
+    form b[k] = B0 * f**k + c * (1 + g / 2) * (f**k - 1) / g with f = 1 + g, so every account and
+    month is evaluated at once as a (months, accounts) array, with activation masks from the
+    start/end dates. Linked flows read the resulting balances, so no month-by-month loop is needed.
+    """
+    origin = (origin or date.today()).replace(day=1)
+    months = max(int(years), 0) * 12
+    model = MonthlyModel(accounts, origin, months)
+
+    month = np.arange(months, dtype=np.int64)[:, None]
+    active = (month >= model.start) & (month <= model.end)
+    elapsed = (month - model.start + 1).astype(np.float64) # active months so far, including this one
+
+    g = model.monthly_rate
+    safe_g = np.where(g == 0.0, 1.0, g)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        log_f = np.log1p(g)
+        compounded = np.exp(elapsed * log_f)
+        annuity = np.where(g == 0.0, elapsed, np.expm1(elapsed * log_f) / safe_g)
+        escalation = np.exp(month * log_f)
+
+    balance = model.initial * compounded + model.contribution * (1.0 + g / 2) * annuity
+    flow = model.contribution * escalation
+    values = np.where(active, np.where(model.is_flow, flow, balance), 0.0)
+    contribution = np.where(active, np.where(model.is_flow, flow, model.contribution), 0.0)
+    if len(model.schedule_index):
+        scheduled = np.where(active[:, model.schedule_index], model.schedule, 0.0)
+        values[:, model.schedule_index] = scheduled
+        contribution[:, model.schedule_index] = np.where(model.is_flow[model.schedule_index], scheduled, 0.0)
+
+    columns = len(model.columns)
+    if len(model.dynamic_index):
+        # Linked flows track the named balance (summed over accounts sharing the name).
+        balance_columns = np.zeros((columns, months), dtype=np.float64)
+        balance_rows = np.flatnonzero(~model.is_flow)
+        np.add.at(balance_columns, model.column_of[balance_rows], values[:, balance_rows].T)
+        linked = balance_columns[model.dynamic_source].T * model.dynamic_percentage / 12
+        linked = np.where(model.dynamic_valid, model.dynamic_sign * np.abs(linked), 0.0)
+        dynamic_active = active[:, model.dynamic_index]
+        values[:, model.dynamic_index] = np.where(dynamic_active, linked, 0.0)
+        contribution[:, model.dynamic_index] = values[:, model.dynamic_index]
+
+    # Growth is what a balance gained beyond its contribution; the opening balance counts as
+    # the previous value in an account's first active month.
+    previous = np.zeros_like(values)
+    previous[1:] = values[:-1]
+    previous = np.where(elapsed == 1.0, model.initial, previous)
+    growth = np.where(active & ~model.is_flow, values - previous - contribution, 0.0)
+
+    column_values = np.zeros((columns, months), dtype=np.float64)
+    np.add.at(column_values, model.column_of, values.T)
+    is_flow_column = np.zeros(columns, dtype=bool)
+    is_flow_column[model.column_of[model.is_flow]] = True
+
+    total_value = values.sum(axis=1)
+    starting_value = np.zeros(months, dtype=np.float64)
+    if months:
+        starting_value[0] = float(model.initial[active[0]].sum())
+        starting_value[1:] = total_value[:-1]
+
+    return MonthlyResult(
+        origin=origin,
+        columns=model.columns,
+        values=column_values.T,
+        is_flow_column=is_flow_column,
+        starting_value=starting_value,
+        total_contribution=contribution.sum(axis=1),
+        total_growth=growth.sum(axis=1),
+        total_value=total_value,
+    )
+
+
+def project_monthly(combined_accounts: list, years: int, start_month: Optional[str] = None,
+                    granularity: str = "monthly") -> dict:
+    """Runs the monthly engine and returns the records at the requested granularity."""
+    origin = None
+    if start_month:
+        try:
+            origin = date(int(start_month[0:4]), int(start_month[5:7]), 1)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid start_month '{start_month}', expected YYYY-MM")
+
+    result = simulate_monthly(combined_accounts, years, origin)
+    if granularity == "annual":
+        annual = result.to_annual()
+        records = annual.to_records()
+        final_value = annual.final_value
+    else:
+        records = result.to_records()
+        final_value = float(result.total_value[-1]) if result.months else 0.0
+
+    return {
+        "granularity": granularity,
+        "start_month": f"{result.origin.year:04d}-{result.origin.month:02d}",
+        "final_value": final_value,
+        "total_contributed": float(result.total_contribution.sum()),
+        "total_growth": float(result.total_growth.sum()),
+        "data_json": json.dumps(records),
+    }
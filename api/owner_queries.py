@@ -0,0 +1,48 @@
+# api/owner_queries.py
+
+"""
+Owner-scoped statements behind the list, settings and token endpoints. The sync endpoints, the
+async ones (routers/async_api.py) and check_query_plans.py all build them here, so the query-plan
+check EXPLAINs exactly what the endpoints run.
+"""
+
+from sqlalchemy import delete, select
+
+import models
+
+
+def assets(owner_id: int):
+    return select(models.Asset).where(models.Asset.owner_id == owner_id).order_by(models.Asset.id.desc())
+
+
+def liabilities(owner_id: int):
+    return select(models.Liability).where(models.Liability.owner_id == owner_id).order_by(models.Liability.id.desc())
+
+
+def cashflow_items(owner_id: int, is_income: bool):
+    return (
+        select(models.CashFlowItem)
+        .where(models.CashFlowItem.owner_id == owner_id)
+        .where(models.CashFlowItem.is_income == is_income)
+        .order_by(models.CashFlowItem.id.desc())
+    )
+
+
+def projections(owner_id: int):
+    return select(models.Projection).where(models.Projection.owner_id == owner_id)
+
+
+def custom_charts(user_id: int):
+    return select(models.CustomChart).where(models.CustomChart.user_id == user_id)
+
+
+def user_settings(user_id: int):
+    return select(models.UserSettings).where(models.UserSettings.user_id == user_id)
+
+
+def delete_password_reset_tokens(user_id: int):
+    return delete(models.PasswordResetToken).where(models.PasswordResetToken.user_id == user_id)
+
+
+def delete_email_confirmation_tokens(user_id: int):
+    return delete(models.EmailConfirmationToken).where(models.EmailConfirmationToken.user_id == user_id)
@@ -0,0 +1,190 @@
+# api/projection_cache.py
+
+import dataclasses
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from config import settings
+
+
+def _row_fields(row) -> list:
+    # Every snapshot field, so any change to a value the projection could read changes the key.
+    if isinstance(row, dict):
+        return sorted(row.items())
+    return list(dataclasses.astuple(row))
+
+
+def fingerprint(payload) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def request_accounts(accounts: list) -> list:
+    return [acc.model_dump() if hasattr(acc, 'model_dump') else acc for acc in accounts]
+
+
+def make_key(years: int, accounts: list, owner_snapshot, filing_status=None) -> str:
+    """
+    Content address of a projection: a SHA-256 of the owner's snapshot (asset, liability and
+    cash flow records) plus the requested years, accounts and tax filing status. Any edit to
+    those inputs yields a different key.
+
+    The key needs the loaded snapshot, so a cache hit saves the projection but not the snapshot
+    query (one round trip, see snapshot_loader.load_snapshot). Keying on the snapshot contents
+    rather than on invalidation alone keeps results correct when another process or a direct
+    database write changes an owner's rows.
+    """
+    payload = {
+        "owner_id": owner_snapshot.owner_id,
+        "years": years,
+        "accounts": request_accounts(accounts),
+        "assets": [_row_fields(row) for row in owner_snapshot.assets],
+        "liabilities": [_row_fields(row) for row in owner_snapshot.liabilities],
+        "cashflow_items": [_row_fields(row) for row in owner_snapshot.cashflow_items],
+    }
+    if filing_status:
+        payload["filing_status"] = filing_status
+    return fingerprint(payload)
+
+
+def _result_size(result: dict) -> int:
+    return sys.getsizeof(result) + sum(sys.getsizeof(value) for value in result.values())
+
+
+class LRUCache:
+    """
+    Per-process LRU cache of dict values with a TTL and a total size bound. get() and put() hand
+    out and store copies, so callers cannot change cached entries.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict() # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, _, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: dict) -> None:
+        size = _result_size(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._insert(key, value, size)
+
+    def discard(self, key: str) -> None:
+        """Drops one entry, if cached."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _insert(self, key: str, value: dict, size: int) -> None:
+        # Caller must hold the lock. The new entry is never the one evicted (size <= max_bytes).
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (dict(value), size, time.monotonic() + self.ttl_seconds)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        # Caller must hold the lock.
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class ProjectionCache(LRUCache):
+    """
+    LRU cache of calculate_projection results, keyed by make_key() and indexed by owner so that
+    any write to an owner's assets, liabilities or cash flow items can drop all of that owner's
+    entries at once.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+        self._owner_by_key = {}
+        self._keys_by_owner = {}
+
+    def put(self, key: str, owner_id: int, result: dict) -> None:
+        size = _result_size(result)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._insert(key, result, size)
+            self._owner_by_key[key] = owner_id
+            self._keys_by_owner.setdefault(owner_id, set()).add(key)
+
+    def invalidate_owner(self, owner_id: int) -> None:
+        """Drops every cached projection for the owner."""
+        with self._lock:
+            for key in list(self._keys_by_owner.get(owner_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def _remove(self, key: str) -> None:
+        # Caller must hold the lock.
+        super()._remove(key)
+        owner_id = self._owner_by_key.pop(key, None)
+        owner_keys = self._keys_by_owner.get(owner_id)
+        if owner_keys is not None:
+            owner_keys.discard(key)
+            if not owner_keys:
+                del self._keys_by_owner[owner_id]
+
+
+# Shared instance used by calculations.calculate_projection and the write endpoints.
+cache = ProjectionCache(
+    max_entries=settings.PROJECTION_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PROJECTION_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PROJECTION_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_owner(owner_id: int) -> None:
+    cache.invalidate_owner(owner_id)
@@ -0,0 +1,261 @@
+# api/projection_core.py
+
+import logging
+from typing import Optional
+
+import amortization
+import dependency_graph
+import incremental
+import projection_cache
+import projection_format
+import tax
+from snapshot import OwnerSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _linked_account_name(item_dict: dict, assets_by_id: dict, liabilities_by_id: dict) -> Optional[str]:
+    """Returns the name of the asset/liability a dynamic cash flow item tracks, if it can be resolved."""
+    if not item_dict["linked_item_id"] or item_dict["percentage"] is None:
+        return None
+    if item_dict["linked_item_type"] == 'asset' and item_dict["linked_item_id"] in assets_by_id:
+        return assets_by_id[item_dict["linked_item_id"]].name
+    if item_dict["linked_item_type"] == 'liability' and item_dict["linked_item_id"] in liabilities_by_id:
+        return liabilities_by_id[item_dict["linked_item_id"]].name
+    return None
+
+def combine_accounts(accounts: list, owner_snapshot: OwnerSnapshot) -> list:
+    """Builds the combined account list from an already loaded owner snapshot (see calculations.assemble_accounts)."""
+    all_assets = owner_snapshot.assets
+    all_liabilities = owner_snapshot.liabilities
+    all_cashflow_items = owner_snapshot.cashflow_items
+
+    # Create lookup dictionaries for quick access
+    assets_by_id = {asset.id: asset for asset in all_assets}
+    liabilities_by_id = {liability.id: liability for liability in all_liabilities}
+    
+    # Create a mutable copy of cashflow items to work with
+    # Dynamic items will have their yearly_value replaced once links are resolved
+    processed_cashflow_items = []
+    for item in all_cashflow_items:
+        item_copy = {
+            "id": item.id,
+            "owner_id": item.owner_id,
+            "is_income": item.is_income,
+            "description": item.description,
+            "yearly_value": item.yearly_value,
+            "linked_item_id": item.linked_item_id,
+            "linked_item_type": item.linked_item_type,
+            "percentage": item.percentage,
+            "annual_increase_percent": item.annual_increase_percent,
+            "inflation_percent": item.inflation_percent,
+            "category": item.category,
+            "frequency": item.frequency,
+            "person": item.person,
+            "start_date": item.start_date,
+            "end_date": item.end_date,
+            "taxable": item.taxable,
+            "tax_deductible": item.tax_deductible,
+            "created_at": item.created_at, # Already a string in the snapshot
+        }
+        processed_cashflow_items.append(item_copy)
+
+    logger.debug("Initial processed cashflow items: %s", processed_cashflow_items)
+
+    # 2. Resolve dynamic CashFlowItems
+    # Links between cash flow items form a dependency graph that is built once and evaluated
+    # in topological order. Circular links raise DependencyCycleError naming the items involved.
+    resolved_values = dependency_graph.resolve_yearly_values(
+        processed_cashflow_items,
+        asset_values={asset.id: asset.value for asset in all_assets},
+        liability_values={liability.id: liability.value for liability in all_liabilities},
+    )
+    for item_dict in processed_cashflow_items:
+        item_dict["yearly_value"] = resolved_values[item_dict["id"]]
+        
+    logger.debug("Final processed cashflow items after dependency resolution: %s", processed_cashflow_items)
+
+    # After resolution, convert CashFlowItems to an account-like structure for projection
+    final_cashflow_accounts = []
+    for item_dict in processed_cashflow_items:
+        cf_account = {
+            "name": item_dict["description"], # Use description as name for projection clarity
+            "type": "income" if item_dict["is_income"] else "expense", # Treat as income/expense for cashflow
+            "initial_balance": 0.0, # Cash flow items don't have an initial balance in this context
+            "monthly_contribution": item_dict["yearly_value"] / 12, # Always monthly equivalent
+            "annual_increase_percent": item_dict["annual_increase_percent"] if item_dict["is_income"] else item_dict["inflation_percent"],
+            "annual_change_type": "increase" if item_dict["is_income"] else "decrease", # Income increases, expense decreases
+            "id": item_dict["id"], # Keep original ID for potential future lookup
+            "start_date": item_dict["start_date"], # Only used by the monthly engine
+            "end_date": item_dict["end_date"],
+            "taxable": item_dict["taxable"], # Read by tax.yearly_tax when a filing status is requested
+            "tax_deductible": item_dict["tax_deductible"],
+        }
+        # Items linked to an asset/liability are re-evaluated every year against the projected
+        # balance of that account. linked_account is None when the link cannot be resolved.
+        if item_dict["linked_item_type"] in ['asset', 'liability']:
+            cf_account["linked_account"] = _linked_account_name(item_dict, assets_by_id, liabilities_by_id)
+            cf_account["percentage"] = item_dict["percentage"]
+        final_cashflow_accounts.append(cf_account)
+    
+    logger.debug("Final cashflow accounts for projection: %s", final_cashflow_accounts)
+
+    # Amortizing liabilities follow their loan schedule, and their payments become an expense.
+    loans = amortization.loan_schedules(all_liabilities)
+    for liability in all_liabilities:
+        if liability.id in loans:
+            final_cashflow_accounts.append({
+                "name": f"{liability.name} Payment",
+                "type": "expense",
+                "initial_balance": 0.0,
+                "monthly_contribution": loans[liability.id]["payment"][0] / 12,
+                "annual_increase_percent": 0.0,
+                "annual_change_type": "decrease",
+                "loan_id": liability.id,
+                "start_date": liability.start_date,
+                "end_date": liability.end_date,
+                "taxable": False,
+                "tax_deductible": False,
+                "schedule": loans[liability.id]["payment"],
+                "monthly_schedule": loans[liability.id]["monthly_payment"], # Read by the monthly engine
+            })
+
+    # Combine original accounts with processed cash flow items
+    # Ensure 'accounts' passed in are already Pydantic models or similar dicts
+    # Convert incoming Pydantic AccountSchema objects to dicts for mutable list
+    # Start by including all assets and liabilities from the database to ensure their values are tracked
+    combined_accounts = []
+    for asset in all_assets:
+        combined_accounts.append({
+            "name": asset.name,
+            "initial_balance": asset.value,
+            "type": "asset",
+            "annual_increase_percent": asset.annual_increase_percent,
+            "annual_change_type": asset.annual_change_type,
+            "id": asset.id,
+            "start_date": asset.start_date,
+            "end_date": asset.end_date,
+        })
+    for liability in all_liabilities:
+        liability_account = {
+            "name": liability.name,
+            "initial_balance": liability.value,
+            "type": "liability",
+            "annual_increase_percent": liability.annual_increase_percent,
+            "annual_change_type": liability.annual_change_type,
+            "id": liability.id,
+            "start_date": liability.start_date,
+            "end_date": liability.end_date,
+        }
+        if liability.id in loans:
+            liability_account["schedule"] = loans[liability.id]["balance"]
+            liability_account["monthly_schedule"] = loans[liability.id]["monthly_balance"]
+            liability_account["amortization"] = {
+                "interest": loans[liability.id]["interest"],
+                "principal": loans[liability.id]["principal"],
+            }
+        combined_accounts.append(liability_account)
+
+    # Then, add incoming 'accounts' from the frontend, avoiding duplicates with existing assets/liabilities
+    existing_names = {acc["name"] for acc in combined_accounts}
+    for acc in accounts:
+        acc_dict = acc.model_dump() if hasattr(acc, 'model_dump') else acc
+        if acc_dict["name"] not in existing_names:
+            combined_accounts.append(acc_dict)
+            existing_names.add(acc_dict["name"])
+    
+    # Filter out cashflow_items that are already in `accounts` from `combined_accounts`
+    # This scenario would happen if a cashflow item is sent by the frontend as part of `accounts`
+    # We prioritize the dynamically calculated value, so we'll ensure no duplicates.
+    existing_account_names = {acc["name"] for acc in combined_accounts} # Re-initialize after adding assets/liabilities and initial accounts
+    for cf_acc in final_cashflow_accounts: # Now add cashflow items
+        if cf_acc["name"] not in existing_account_names:
+            combined_accounts.append(cf_acc)
+            existing_account_names.add(cf_acc["name"])
+
+    logger.debug("Combined accounts for main projection loop: %s", combined_accounts)
+    return combined_accounts
+
+def project_snapshot(owner_snapshot: OwnerSnapshot, years: int, accounts: list,
+                     filing_status: Optional[str] = None) -> dict:
+    """
+    Computes the projection from a preloaded snapshot without touching the database, reusing a
+    cached result for identical inputs (see compute_projection for the uncached computation).
+    The snapshot is part of the cache key, so callers load it even when the result is cached.
+    """
+    cache_key = projection_cache.make_key(years, accounts, owner_snapshot, filing_status)
+    cached = projection_cache.cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Projection cache hit for owner %s", owner_snapshot.owner_id)
+        return cached
+
+    result = compute_projection(owner_snapshot, years, accounts, filing_status)
+    projection_cache.cache.put(cache_key, owner_snapshot.owner_id, result)
+    return result
+
+def incremental_key(owner_id: int, years: int, accounts: list) -> tuple:
+    """Key of the incremental state for a request (see incremental.IncrementalProjector)."""
+    return (owner_id, years, projection_cache.fingerprint(projection_cache.request_accounts(accounts)))
+
+def compute_projection(owner_snapshot: OwnerSnapshot, years: int, accounts: list,
+                       filing_status: Optional[str] = None) -> dict:
+    """
+    Computes the projection from a snapshot in this process, using and updating the incremental
+    state kept here (compute_service.project runs compute_from_state in a worker instead).
+    With a filing_status the per-year tax columns of tax.yearly_tax are added to data_json, and
+    when the owner has amortizing liabilities so are their yearly Loan_Interest/Loan_Principal.
+    """
+    key = incremental_key(owner_snapshot.owner_id, years, accounts)
+    result, run = compute_from_state(owner_snapshot, years, accounts, filing_status, incremental.projector.get(key))
+    incremental.projector.record(key, run)
+    return result
+
+def compute_from_state(owner_snapshot: OwnerSnapshot, years: int, accounts: list,
+                       filing_status: Optional[str], state) -> tuple:
+    """
+    compute_projection against an explicit incremental state (None for a full run). Takes and
+    returns only plain picklable values, so it can run in a worker process (see compute_service.py);
+    returns the result dict and the incremental.Run for the caller to record.
+    """
+    run, extra = _project(owner_snapshot, years, accounts, filing_status, state)
+    projection = run.result
+    data_json = projection_format.encode_result(projection, extra)
+
+    logger.debug("Projection for owner %s: %d years, %d columns, %d bytes of data_json",
+                 owner_snapshot.owner_id, projection.years, len(projection.columns), len(data_json))
+
+    # 5. The final output structure (returned to the FastAPI endpoint)
+    return {
+        "final_value": projection.final_value,
+        "total_contributed": projection.total_contributed,
+        # The original loop never accumulated total growth; kept at 0.0 for compatibility.
+        "total_growth": 0.0,
+        # Columnar data_json (see projection_format.py); API responses convert it back to records by default
+        "data_json": data_json
+    }, run
+
+def columns_from_state(owner_snapshot: OwnerSnapshot, years: int, accounts: list,
+                       filing_status: Optional[str], state) -> tuple:
+    """
+    compute_from_state without the encoding: returns the columnar dict (projection_format.columnar_data)
+    instead of the data_json string, plus the incremental.Run, for streaming the records directly.
+    """
+    run, extra = _project(owner_snapshot, years, accounts, filing_status, state)
+    return projection_format.columnar_data(run.result, extra), run
+
+def _project(owner_snapshot: OwnerSnapshot, years: int, accounts: list, filing_status: Optional[str], state) -> tuple:
+    """Runs the projection; returns the incremental.Run and the extra per-year columns (or None)."""
+    combined_accounts = combine_accounts(accounts, owner_snapshot)
+
+    # Main Projection Loop
+    # All accounts are stepped through each year together as dense arrays (see projection_engine.py).
+    # The per-account columns of the previous run for the same request are kept, so after an edit
+    # only the changed accounts and the cash flow items linked to them are re-projected.
+    run = incremental.project_from_state(state, years, combined_accounts)
+    projection = run.result
+    extra = {}
+    if filing_status:
+        extra.update(tax.yearly_tax(combined_accounts, projection.accounts[1], filing_status))
+    if any("amortization" in acc for acc in combined_accounts):
+        extra.update(amortization.yearly_totals(combined_accounts, projection.years))
+    return run, extra or None
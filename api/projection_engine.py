@@ -0,0 +1,389 @@
+# api/projection_engine.py
+
+import numpy as np
+
+BALANCE_TYPES = ("asset", "liability")
+NEGATIVE_FLOW_TYPES = ("liability", "expense")
+
+
+class ProjectionModel:
+    """
+    Dense array representation of the combined accounts used by calculate_projection.
+
+    Every account gets a position in the account axis. Accounts that share a name also
+    share a balance slot (the original loop keyed its running balances by name), and
+    are split into "layers" so accounts sharing a slot are still applied in list order.
+
+    An account may carry a precomputed "schedule" (one amount per year, see amortization.py):
+    for balances it replaces the year-end balance, for income/expense flows the yearly amount.
+    """
+    __slots__ = (
+        "names", "types", "initial", "rate", "contribution", "carries_balance",
+        "slot", "layers", "layer_writers", "single_layer",
+        "dynamic_index", "dynamic_source", "dynamic_percentage", "dynamic_valid", "dynamic_sign",
+        "dynamic_scheduled", "dynamic_schedule_row",
+        "schedule_balance_index", "schedule_balance", "schedule_flow_index", "schedule_flow",
+        "columns", "column_last", "column_carries",
+    )
+
+    def __init__(self, accounts: list):
+        n = len(accounts)
+        self.names = [acc["name"] for acc in accounts]
+        self.types = [acc["type"] for acc in accounts]
+
+        self.initial = np.array([float(acc["initial_balance"]) for acc in accounts], dtype=np.float64)
+
+        rate = np.array([(acc.get("annual_increase_percent") or 0.0) / 100.0 for acc in accounts], dtype=np.float64)
+        decrease = np.array([acc.get("annual_change_type", "increase") == "decrease" for acc in accounts], dtype=bool)
+        self.rate = np.where(decrease, -rate, rate)
+
+        self.contribution = np.array(
+            [signed_annual_contribution(acc["type"], acc.get("monthly_contribution", 0.0)) for acc in accounts],
+            dtype=np.float64,
+        )
+        self.carries_balance = np.array([t in BALANCE_TYPES for t in self.types], dtype=bool)
+
+        # Balance slots: one per distinct name, in first-seen order.
+        slot_by_name = {}
+        occurrence = np.zeros(n, dtype=np.int64)
+        slot = np.zeros(n, dtype=np.int64)
+        last_in_slot = {}
+        for i, name in enumerate(self.names):
+            if name not in slot_by_name:
+                slot_by_name[name] = len(slot_by_name)
+                last_in_slot[name] = i
+            else:
+                occurrence[i] = occurrence[last_in_slot[name]] + 1
+                last_in_slot[name] = i
+            slot[i] = slot_by_name[name]
+        self.slot = slot
+
+        # Running balances (and output columns) are taken from the last account with each name.
+        last_index = np.array([last_in_slot[name] for name in slot_by_name], dtype=np.int64)
+
+        max_layer = int(occurrence.max()) + 1 if n else 0
+        self.layers = [np.flatnonzero(occurrence == layer) for layer in range(max_layer)]
+        self.layer_writers = [layer[self.carries_balance[layer]] for layer in self.layers]
+        self.single_layer = max_layer <= 1
+
+        # Cash flow items whose value tracks a linked asset/liability balance each year.
+        dynamic_index, dynamic_source, dynamic_percentage, dynamic_valid = [], [], [], []
+        for i, acc in enumerate(accounts):
+            if "linked_account" not in acc:
+                continue
+            linked_name = acc["linked_account"]
+            dynamic_index.append(i)
+            dynamic_valid.append(linked_name in slot_by_name)
+            dynamic_source.append(last_in_slot.get(linked_name, 0))
+            dynamic_percentage.append((acc.get("percentage") or 0.0) / 100.0)
+        self.dynamic_index = np.array(dynamic_index, dtype=np.int64)
+        self.dynamic_source = np.array(dynamic_source, dtype=np.int64)
+        self.dynamic_percentage = np.array(dynamic_percentage, dtype=np.float64)
+        self.dynamic_valid = np.array(dynamic_valid, dtype=bool)
+        self.dynamic_sign = np.array(
+            [_flow_sign(self.types[i]) for i in dynamic_index], dtype=np.float64
+        )
+
+        # Scheduled accounts: balances follow their schedule, flows pay their scheduled amount.
+        scheduled = [i for i, acc in enumerate(accounts) if acc.get("schedule") is not None]
+        balance_index = [i for i in scheduled if self.carries_balance[i]]
+        flow_index = [i for i in scheduled if not self.carries_balance[i]]
+        self.schedule_balance_index = np.array(balance_index, dtype=np.int64)
+        self.schedule_balance = _schedule_array([accounts[i]["schedule"] for i in balance_index], hold=True)
+        self.schedule_flow_index = np.array(flow_index, dtype=np.int64)
+        self.schedule_flow = _schedule_array([accounts[i]["schedule"] for i in flow_index], hold=False) * np.array(
+            [_flow_sign(self.types[i]) for i in flow_index], dtype=np.float64
+        )[:, None]
+        schedule_row = {i: row for row, i in enumerate(balance_index)}
+        self.dynamic_scheduled = np.array([i in schedule_row for i in dynamic_source], dtype=bool)
+        self.dynamic_schedule_row = np.array([schedule_row.get(i, 0) for i in dynamic_source], dtype=np.int64)
+
+        # Output columns: one "<name>_Value" per distinct name, written by the last account with that name.
+        self.columns = list(slot_by_name)
+        self.column_last = last_index
+        self.column_carries = self.carries_balance[last_index] if n else np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ProjectionResult:
+    """
+    Yearly projection arrays produced by simulate/run_projection.
+
+    Arrays are indexed [..., year, column] for account values and [..., year] for totals,
+    where "..." are the batch axes of the inputs (none for a plain run_projection).
+    When requested, `accounts` holds the per-account yearly arrays (values, contributions,
+    growth), each indexed [..., year, account].
+    """
+    __slots__ = ("columns", "values", "starting_value", "total_contribution",
+                 "total_growth", "total_value", "total_contributed", "accounts")
+
+    def __init__(self, columns, values, starting_value, total_contribution, total_growth, total_value, total_contributed,
+                 accounts=None):
+        self.columns = columns
+        self.values = values
+        self.starting_value = starting_value
+        self.total_contribution = total_contribution
+        self.total_growth = total_growth
+        self.total_value = total_value
+        self.total_contributed = total_contributed
+        self.accounts = accounts
+
+    @property
+    def years(self) -> int:
+        return self.total_value.shape[-1]
+
+    @property
+    def final_value(self):
+        """Total_Value in the last year; an array when the result has batch axes."""
+        if not self.years:
+            return 0.0 if self.total_value.ndim == 1 else np.zeros(self.total_value.shape[:-1])
+        final = self.total_value[..., -1]
+        return float(final) if final.ndim == 0 else final
+
+    def to_records(self) -> list:
+        """Builds the legacy list of per-year dicts stored in Projection.data_json."""
+        keys = [f"{name}_Value" for name in self.columns]
+        starting = self.starting_value.tolist()
+        contributions = self.total_contribution.tolist()
+        growth = self.total_growth.tolist()
+        totals = self.total_value.tolist()
+        records = []
+        for year, row in enumerate(self.values.tolist()):
+            record = {"Year": year + 1, "StartingValue": starting[year]}
+            record.update(zip(keys, row))
+            record["Total_Contribution"] = contributions[year]
+            record["Total_Growth"] = growth[year]
+            record["Total_Value"] = totals[year]
+            records.append(record)
+        return records
+
+
+def _schedule_array(schedules: list, hold: bool) -> np.ndarray:
+    """
+    Stacks yearly schedules into (accounts, years). Shorter schedules are padded with their last
+    value when `hold` (balances) and with zeros otherwise (flows).
+    """
+    width = max((len(schedule) for schedule in schedules), default=0)
+    array = np.zeros((len(schedules), width), dtype=np.float64)
+    for row, schedule in enumerate(schedules):
+        array[row, :len(schedule)] = schedule
+        if hold and len(schedule):
+            array[row, len(schedule):] = schedule[-1]
+    return array
+
+
+def _schedule_at(array: np.ndarray, year: int, hold: bool) -> np.ndarray:
+    """Scheduled amounts for a year; past the end a balance keeps its last value and a flow stops."""
+    if year < array.shape[1]:
+        return array[:, year]
+    if hold and array.shape[1]:
+        return array[:, -1]
+    return np.zeros(array.shape[0])
+
+
+def _flow_sign(account_type: str) -> float:
+    if account_type in NEGATIVE_FLOW_TYPES:
+        return -1.0
+    return 1.0
+
+
+def signed_annual_contribution(account_type: str, monthly_contribution: float) -> float:
+    annual = (monthly_contribution or 0.0) * 12
+    if account_type in NEGATIVE_FLOW_TYPES:
+        return -abs(annual)
+    if account_type == "income":
+        return abs(annual)
+    return annual
+
+
+def simulate(model: ProjectionModel, years: int, rate=None, contribution=None, initial=None,
+             rate_for_year=None, keep_values: bool = True, keep_accounts: bool = False,
+             dynamic_percentage=None) -> ProjectionResult:
+    """
+    Projects every account in the model for the given number of years.
+
+    `rate`, `contribution` and `initial` override the model's per-account arrays and may carry
+    leading batch axes (scenarios, Monte Carlo paths, ...), shaped (..., n_accounts). All batch
+    members are stepped together. `dynamic_percentage` likewise overrides the percentages of the
+    linked cash flow items, shaped (..., len(model.dynamic_index)). `rate_for_year(year, rate)` may return a different rate array
+    for each year. With keep_values=False the per-account columns are not stored, which keeps
+    memory flat for large batches. keep_accounts=True additionally stores every account's yearly
+    value, contribution and growth (see result_from_accounts).
+
+    Each year first re-evaluates cash flow items linked to an asset/liability against that
+    account's projected balance, then applies growth and contributions to all accounts at once.
+    """
+    n = len(model)
+    years = max(int(years), 0)
+
+    base_rate = model.rate if rate is None else np.asarray(rate, dtype=np.float64)
+    contribution = model.contribution if contribution is None else np.asarray(contribution, dtype=np.float64)
+    initial = model.initial if initial is None else np.asarray(initial, dtype=np.float64)
+    dynamic_percentage = (model.dynamic_percentage if dynamic_percentage is None
+                          else np.asarray(dynamic_percentage, dtype=np.float64))
+    batch_shape = np.broadcast_shapes(base_rate.shape[:-1], contribution.shape[:-1], initial.shape[:-1],
+                                      dynamic_percentage.shape[:-1])
+
+    contribution = np.array(np.broadcast_to(contribution, batch_shape + (n,)), dtype=np.float64)
+    initial = np.broadcast_to(initial, batch_shape + (n,))
+    balances = np.array(initial[..., model.column_last], dtype=np.float64)
+
+    values = np.zeros(batch_shape + (years, len(model.columns)), dtype=np.float64) if keep_values else None
+    total_value = np.zeros(batch_shape + (years,), dtype=np.float64)
+    total_contribution = np.zeros(batch_shape + (years,), dtype=np.float64)
+    total_growth = np.zeros(batch_shape + (years,), dtype=np.float64)
+    total_contributed = np.zeros(batch_shape, dtype=np.float64)
+    if keep_accounts:
+        account_values = np.zeros(batch_shape + (years, n), dtype=np.float64)
+        account_contributions = np.zeros(batch_shape + (years, n), dtype=np.float64)
+        account_growth = np.zeros(batch_shape + (years, n), dtype=np.float64)
+
+    # A single run sums accounts sequentially so totals are identical to the per-account loop;
+    # batched runs use NumPy's (faster, pairwise) reductions.
+    sequential = batch_shape == ()
+
+    def row_total(array):
+        return np.cumsum(array, axis=-1)[..., -1] if sequential else array.sum(axis=-1)
+
+    has_dynamic = len(model.dynamic_index) > 0
+    has_schedule = len(model.schedule_balance_index) > 0
+    has_scheduled_flow = len(model.schedule_flow_index) > 0
+    if not model.single_layer:
+        new_values = np.zeros(batch_shape + (n,), dtype=np.float64)
+        growth = np.zeros(batch_shape + (n,), dtype=np.float64)
+
+    for year in range(years):
+        rate = base_rate if rate_for_year is None else rate_for_year(year, base_rate)
+        if has_schedule:
+            scheduled_balance = _schedule_at(model.schedule_balance, year, hold=True)
+        if has_scheduled_flow:
+            contribution[..., model.schedule_flow_index] = _schedule_at(model.schedule_flow, year, hold=False)
+
+        if has_dynamic:
+            # Balance of the linked account after this year's growth, computed from the
+            # start-of-year balance with the contribution in effect before this update.
+            source = model.dynamic_source
+            linked_balance = balances[..., model.slot[source]]
+            linked_rate = rate[..., source]
+            linked_contribution = contribution[..., source]
+            projected = (linked_balance + linked_contribution
+                         + linked_balance * linked_rate + linked_contribution * linked_rate * 0.5)
+            if has_schedule:
+                projected = np.where(model.dynamic_scheduled, scheduled_balance[model.dynamic_schedule_row], projected)
+            yearly_value = np.where(model.dynamic_valid, projected * dynamic_percentage, 0.0)
+            contribution[..., model.dynamic_index] = model.dynamic_sign * np.abs((yearly_value / 12) * 12)
+
+        if model.single_layer:
+            # Every name is unique: one balance per account, all updated in one step.
+            growth_on_balance = balances * rate
+            growth_on_contributions = contribution * rate * 0.5
+            new_values = balances + contribution + growth_on_balance + growth_on_contributions
+            growth = growth_on_balance + growth_on_contributions
+            if has_schedule:
+                _apply_schedule(model, scheduled_balance, balances, contribution, new_values, growth)
+            balances = np.where(model.carries_balance, new_values, balances)
+        else:
+            for layer, writers in zip(model.layers, model.layer_writers):
+                current = balances[..., model.slot[layer]]
+                layer_rate = rate[..., layer]
+                layer_contribution = contribution[..., layer]
+                growth_on_balance = current * layer_rate
+                growth_on_contributions = layer_contribution * layer_rate * 0.5
+                new_values[..., layer] = current + layer_contribution + growth_on_balance + growth_on_contributions
+                growth[..., layer] = growth_on_balance + growth_on_contributions
+                if has_schedule:
+                    _apply_schedule(model, scheduled_balance, balances, contribution, new_values, growth)
+                balances[..., model.slot[writers]] = new_values[..., writers]
+
+        if n:
+            total_value[..., year] = row_total(new_values)
+            total_contribution[..., year] = row_total(contribution)
+            total_growth[..., year] = row_total(growth)
+            if sequential:
+                total_contributed = np.cumsum(np.concatenate([[total_contributed], contribution]))[-1]
+            else:
+                total_contributed = total_contributed + contribution.sum(axis=-1)
+        if keep_values:
+            if model.single_layer:
+                values[..., year, :] = np.where(model.carries_balance, new_values, contribution)
+            else:
+                values[..., year, :] = np.where(
+                    model.column_carries, new_values[..., model.column_last], contribution[..., model.column_last]
+                )
+        if keep_accounts:
+            account_values[..., year, :] = new_values
+            account_contributions[..., year, :] = contribution
+            account_growth[..., year, :] = growth
+
+    starting_value = np.zeros(batch_shape + (years,), dtype=np.float64)
+    if years:
+        starting_value[..., 0] = row_total(initial) if n else 0.0
+        starting_value[..., 1:] = total_value[..., :-1]
+
+    return ProjectionResult(
+        columns=model.columns,
+        values=values,
+        starting_value=starting_value,
+        total_contribution=total_contribution,
+        total_growth=total_growth,
+        total_value=total_value,
+        total_contributed=total_contributed,
+        accounts=(account_values, account_contributions, account_growth) if keep_accounts else None,
+    )
+
+
+def _apply_schedule(model: ProjectionModel, scheduled_balance, balances, contribution, new_values, growth) -> None:
+    """Sets scheduled balances to this year's value; the change from the start of the year counts as growth."""
+    index = model.schedule_balance_index
+    start = balances[..., model.slot[index]]
+    new_values[..., index] = scheduled_balance
+    growth[..., index] = scheduled_balance - start - contribution[..., index]
+
+
+def result_from_accounts(model: ProjectionModel, initial, account_values, account_contributions,
+                         account_growth) -> ProjectionResult:
+    """
+    Rebuilds an unbatched result from per-account yearly arrays shaped (years, n_accounts).
+
+    Totals are summed in the same sequential order simulate() uses for a single run, so
+    arrays spliced together from several runs give exactly the result of one full run.
+    """
+    years, n = account_values.shape
+    total_value = np.zeros(years, dtype=np.float64)
+    total_contribution = np.zeros(years, dtype=np.float64)
+    total_growth = np.zeros(years, dtype=np.float64)
+    total_contributed = 0.0
+    if n:
+        total_value = np.cumsum(account_values, axis=-1)[:, -1]
+        total_contribution = np.cumsum(account_contributions, axis=-1)[:, -1]
+        total_growth = np.cumsum(account_growth, axis=-1)[:, -1]
+        if years:
+            total_contributed = float(np.cumsum(account_contributions.ravel())[-1])
+
+    starting_value = np.zeros(years, dtype=np.float64)
+    if years:
+        starting_value[0] = np.cumsum(initial)[-1] if n else 0.0
+        starting_value[1:] = total_value[:-1]
+
+    values = np.where(
+        model.column_carries, account_values[:, model.column_last], account_contributions[:, model.column_last]
+    )
+    return ProjectionResult(
+        columns=model.columns,
+        values=values,
+        starting_value=starting_value,
+        total_contribution=total_contribution,
+        total_growth=total_growth,
+        total_value=total_value,
+        total_contributed=total_contributed,
+        accounts=(account_values, account_contributions, account_growth),
+    )
+
+
+def run_projection(model: ProjectionModel, years: int, keep_accounts: bool = False) -> ProjectionResult:
+    """Projects the model's accounts as given (no batch axes)."""
+    result = simulate(model, years, keep_accounts=keep_accounts)
+    result.total_contributed = float(result.total_contributed)
+    return result
@@ -0,0 +1,143 @@
+# api/projection_format.py
+
+import json
+
+LEGACY = "legacy"
+COLUMNAR = "columnar"
+COLUMNAR_VERSION = 2
+
+TOTAL_KEYS = ("Total_Contribution", "Total_Growth", "Total_Value")
+VALUE_SUFFIX = "_Value"
+
+
+def encode_result(result, extra: dict = None) -> str:
+    """Serializes a projection_engine.ProjectionResult in the columnar format (see columnar_data)."""
+    return json.dumps(columnar_data(result, extra))
+
+
+def columnar_data(result, extra: dict = None) -> dict:
+    """
+    The columnar layout of a projection_engine.ProjectionResult, as stored in data_json:
+
+        {"format": "columnar", "version": 2, "years": N, "accounts": [name, ...],
+         "values": [[per-year values of account 0], ...], "StartingValue": [...],
+         "Total_Contribution": [...], "Total_Growth": [...], "Total_Value": [...],
+         "extra": {"Total_Tax": [...], ...}}
+
+    Account names are stored once instead of once per year, and each series is a plain array.
+    `extra` holds optional per-year columns (e.g. the tax columns), written after Total_Value
+    in the legacy records; it is omitted when empty.
+    """
+    data = {
+        "format": COLUMNAR,
+        "version": COLUMNAR_VERSION,
+        "years": result.years,
+        "accounts": list(result.columns),
+        "values": result.values.T.tolist(),
+        "StartingValue": result.starting_value.tolist(),
+        "Total_Contribution": result.total_contribution.tolist(),
+        "Total_Growth": result.total_growth.tolist(),
+        "Total_Value": result.total_value.tolist(),
+    }
+    if extra:
+        data["extra"] = {name: list(map(float, values)) for name, values in extra.items()}
+    return data
+
+
+def detect(data) -> str:
+    if isinstance(data, dict) and data.get("format") == COLUMNAR:
+        if data.get("version", COLUMNAR_VERSION) > COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported columnar projection format version {data.get('version')}")
+        return COLUMNAR
+    if isinstance(data, list):
+        return LEGACY
+    raise ValueError("Unrecognised projection data format")
+
+
+def stored_format(data_json: str) -> str:
+    """Layout of serialized projection data, read from its first character without parsing it."""
+    return COLUMNAR if data_json and data_json.lstrip().startswith("{") else LEGACY
+
+
+def records_to_columnar(records: list) -> dict:
+    """Converts the legacy list of per-year dicts to the columnar layout."""
+    accounts = []
+    if records:
+        accounts = [key[:-len(VALUE_SUFFIX)] for key in records[0]
+                    if key.endswith(VALUE_SUFFIX) and key != "Total_Value"]
+    data = {
+        "format": COLUMNAR,
+        "version": COLUMNAR_VERSION,
+        "years": len(records),
+        "accounts": accounts,
+        "values": [[record.get(f"{name}{VALUE_SUFFIX}", 0.0) for record in records] for name in accounts],
+        "StartingValue": [record.get("StartingValue", 0.0) for record in records],
+    }
+    for key in TOTAL_KEYS:
+        data[key] = [record.get(key, 0.0) for record in records]
+    extra = [key for key in (records[0] if records else ()) if key not in ("Year", "StartingValue")
+             and key not in TOTAL_KEYS and not key.endswith(VALUE_SUFFIX)]
+    if extra:
+        data["extra"] = {key: [record.get(key, 0.0) for record in records] for key in extra}
+    return data
+
+
+def iter_records(data):
+    """Yields the legacy per-year dicts one at a time from parsed data in either format."""
+    if detect(data) == LEGACY:
+        yield from data
+        return
+    keys = [f"{name}{VALUE_SUFFIX}" for name in data["accounts"]]
+    rows = zip(*data["values"]) if keys else ((),) * data["years"]
+    extra = data.get("extra") or {}
+    extra_keys = list(extra)
+    extra_rows = zip(*extra.values()) if extra_keys else ((),) * data["years"]
+    for year, (starting, row, contribution, growth, total, extra_row) in enumerate(zip(
+            data["StartingValue"], rows, data["Total_Contribution"], data["Total_Growth"], data["Total_Value"],
+            extra_rows)):
+        record = {"Year": year + 1, "StartingValue": starting}
+        record.update(zip(keys, row))
+        record["Total_Contribution"] = contribution
+        record["Total_Growth"] = growth
+        record["Total_Value"] = total
+        record.update(zip(extra_keys, extra_row))
+        yield record
+
+
+def iter_ndjson(data):
+    """Yields parsed projection data (either format) as NDJSON: one per-year record per line."""
+    for record in iter_records(data):
+        yield json.dumps(record) + "\n"
+
+
+def columnar_to_records(data: dict) -> list:
+    """Expands the columnar layout back into the legacy list of per-year dicts."""
+    return list(iter_records(data))
+
+
+def load_records(data_json: str) -> list:
+    """Reads data_json in either format and returns the legacy list of per-year dicts."""
+    data = json.loads(data_json)
+    return columnar_to_records(data) if detect(data) == COLUMNAR else data
+
+
+def load_columnar(data_json: str) -> dict:
+    """Reads data_json in either format and returns the columnar dict."""
+    data = json.loads(data_json)
+    return data if detect(data) == COLUMNAR else records_to_columnar(data)
+
+
+def convert(data_json, target: str):
+    """Returns data_json re-encoded in the target format (unchanged if it already is, or empty)."""
+    if not data_json:
+        return data_json
+    data = json.loads(data_json)
+    try:
+        current = detect(data)
+    except ValueError:
+        return data_json # Not projection data (e.g. hand-written chart data); leave it alone
+    if current == target:
+        return data_json
+    if target == COLUMNAR:
+        return json.dumps(records_to_columnar(data))
+    return json.dumps(columnar_to_records(data))
@@ -0,0 +1,87 @@
+# api/real_basis.py
+
+import json
+from functools import lru_cache
+
+import numpy as np
+
+import projection_cache
+import projection_format
+from config import settings
+
+DEFAULT_INFLATION_PERCENT = 2.0 # Used when the user has no settings row
+
+
+@lru_cache(maxsize=256)
+def discount_vector(years: int, inflation_percent: float) -> np.ndarray:
+    """
+    Factors that turn nominal amounts into today's dollars: entry k is (1 + inflation)^-k, for
+    k = 0..years. Year y's amounts (at its end) use entry y, its StartingValue entry y - 1.
+    Cached per (years, rate); the returned array is read-only.
+    """
+    vector = np.exp(-np.arange(years + 1) * np.log1p(inflation_percent / 100.0))
+    vector.flags.writeable = False
+    return vector
+
+
+def to_real(data: dict, inflation_percent: float) -> dict:
+    """Deflates every series of a columnar projection dict; returns a new dict."""
+    years = data["years"]
+    if not years:
+        return dict(data)
+    discount = discount_vector(years, inflation_percent)
+    end_of_year = discount[1:]
+    real = dict(data)
+    real["values"] = (np.asarray(data["values"], dtype=np.float64).reshape(-1, years) * end_of_year).tolist()
+    real["StartingValue"] = (np.asarray(data["StartingValue"], dtype=np.float64) * discount[:-1]).tolist()
+    for key in projection_format.TOTAL_KEYS:
+        real[key] = (np.asarray(data[key], dtype=np.float64) * end_of_year).tolist()
+    if data.get("extra"):
+        real["extra"] = {name: (np.asarray(values, dtype=np.float64) * end_of_year).tolist()
+                         for name, values in data["extra"].items()}
+    return real
+
+
+# Real-dollar views of saved projections, keyed by projection, stored version and inflation rate.
+cache = projection_cache.ProjectionCache(
+    max_entries=settings.REAL_BASIS_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PROJECTION_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PROJECTION_CACHE_TTL_SECONDS,
+)
+
+
+def real_view(projection, inflation_percent: float) -> dict:
+    """
+    The saved projection's data_json (columnar), final_value and total_contributed in real
+    dollars, derived from the stored nominal result without re-running the projection. Memoized
+    per (projection, inflation rate); the stored timestamp is part of the key, so an updated
+    projection is never served from an older view.
+    """
+    key = f"{projection.id}:{projection.timestamp}:{inflation_percent!r}"
+    view = cache.get(key)
+    if view is not None:
+        return view
+
+    real = to_real(projection_format.load_columnar(projection.data_json or "[]"), inflation_percent)
+    view = {
+        "data_json": json.dumps(real),
+        "final_value": real["Total_Value"][-1] if real["years"] else projection.final_value,
+        # Contributions are deflated in the year they are made.
+        "total_contributed": float(np.sum(real["Total_Contribution"])) if real["years"] else projection.total_contributed,
+    }
+    cache.put(key, projection.owner_id, view)
+    return view
+
+
+def detail_fields(projection, inflation_percent: float) -> dict:
+    """ProjectionDetailOut fields for the real-dollar view of a saved projection."""
+    return {
+        "id": projection.id,
+        "name": projection.name,
+        "years": projection.years,
+        "total_growth": projection.total_growth,
+        "accounts_json": projection.accounts_json,
+        "basis": "real",
+        "inflation_percent": inflation_percent,
+        **real_view(projection, inflation_percent),
+    }
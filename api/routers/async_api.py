@@ -0,0 +1,378 @@
+from datetime import datetime
+from typing import List, Literal
+import json
+import logging
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import async_database
+import auth
+import compute_service
+import dependency_graph
+import models
+import owner_queries
+import projection_cache
+import real_basis
+import schemas
+import snapshot_loader
+
+logger = logging.getLogger(__name__)
+
+# Async versions of the CRUD and projection endpoints in main.py, on AsyncSession/asyncpg.
+# install() swaps them in for the sync routes when settings.ASYNC_DATABASE is set; paths,
+# payloads and responses are the same.
+router = APIRouter()
+
+
+async def get_current_user(token: str = Depends(auth.oauth2_scheme), db: AsyncSession = Depends(async_database.get_db)):
+    """auth.get_current_user without blocking the event loop on the user lookup."""
+    user_id = auth.user_id_from_token(token)
+    current_user = auth.cached_user(user_id)
+    if current_user is not None:
+        return current_user
+    user = await db.get(models.User, int(user_id))
+    if user is None:
+        raise auth.credentials_exception()
+    return auth.cache_user(user)
+
+
+def install(app: FastAPI) -> None:
+    """Replaces the app's routes for every path and method this router serves with the async ones."""
+    served = {(route.path, method) for route in router.routes for method in route.methods}
+    app.router.routes[:] = [
+        route for route in app.router.routes
+        if not (isinstance(route, APIRoute) and any((route.path, method) in served for method in route.methods))
+    ]
+    app.include_router(router)
+    logger.info("Serving %d endpoints on the async database path", len(router.routes))
+
+
+async def owned(db: AsyncSession, model, item_id: int, owner_id: int, not_found: str,
+                forbidden: str = "Not authorized"):
+    """Loads one row by id, raising 404 if it does not exist and 403 if another user owns it."""
+    item = await db.get(model, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail=not_found)
+    if item.owner_id != owner_id:
+        raise HTTPException(status_code=403, detail=forbidden)
+    return item
+
+
+async def owner_rows(db: AsyncSession, statement) -> list:
+    return list((await db.execute(statement)).scalars().all())
+
+
+@router.get("/users/me", response_model=schemas.UserOut)
+async def read_users_me(current_user: schemas.UserOut = Depends(get_current_user)):
+    return current_user
+
+
+# --- PROJECTION ENDPOINTS ---
+
+@router.post("/projections", response_model=schemas.ProjectionResponse, status_code=status.HTTP_201_CREATED)
+async def create_projection(
+    projection_data: schemas.ProjectionRequest,
+    user: schemas.UserOut = Depends(get_current_user),
+    db: AsyncSession = Depends(async_database.get_db)
+):
+    owner_snapshot = await snapshot_loader.load_snapshot_async(db, user.id)
+    try:
+        projection_results = await compute_service.project(
+            owner_snapshot,
+            years=projection_data.years,
+            accounts=projection_data.accounts,
+            filing_status=projection_data.tax_filing_status,
+        )
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db_projection = models.Projection(
+        owner_id=user.id,
+        name=projection_data.plan_name,
+        years=projection_data.years,
+        final_value=projection_results["final_value"],
+        total_contributed=projection_results["total_contributed"],
+        total_growth=projection_results["total_growth"],
+        data_json=projection_results["data_json"],
+        accounts_json=json.dumps([acc.model_dump() for acc in projection_data.accounts]),
+    )
+    return await async_database.commit_and_refresh(db, db_projection)
+
+
+@router.get("/projections/{projection_id}", response_model=schemas.ProjectionDetailOut, tags=["projections"])
+async def get_projection_details(
+    projection_id: int,
+    data_format: Literal["legacy", "columnar"] = Query("legacy", alias="format"),
+    basis: Literal["nominal", "real"] = Query("nominal"),
+    inflation: float | None = Query(None, gt=-100, le=100),
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    projection = await owned(db, models.Projection, projection_id, current_user.id,
+                             "Projection not found.", "Not authorized to view this projection.")
+    if basis == "real":
+        if inflation is None:
+            user_settings = (await db.execute(owner_queries.user_settings(current_user.id))).scalars().first()
+            inflation = user_settings.default_inflation_percent if user_settings else real_basis.DEFAULT_INFLATION_PERCENT
+        try:
+            fields = real_basis.detail_fields(projection, inflation)
+        except ValueError as e:
+            logger.error("Projection %s has unreadable data_json: %s", projection_id, e)
+            raise HTTPException(status_code=500, detail="Stored projection data could not be read.")
+        return schemas.ProjectionDetailOut.model_validate(fields, context={"data_format": data_format})
+    return schemas.ProjectionDetailOut.model_validate(projection, context={"data_format": data_format})
+
+
+@router.get("/projections", response_model=List[schemas.ProjectionResponse], tags=["projections"])
+async def list_projections(
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    return await owner_rows(db, owner_queries.projections(current_user.id))
+
+
+@router.put("/projections/{projection_id}", response_model=schemas.ProjectionOut, tags=["projections"])
+async def update_projection(
+    projection_id: int,
+    req: schemas.ProjectionRequest,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    projection = await owned(db, models.Projection, projection_id, current_user.id,
+                             "Projection not found.", "Not authorized to update this projection.")
+    owner_snapshot = await snapshot_loader.load_snapshot_async(db, current_user.id)
+    try:
+        result = await compute_service.project(
+            owner_snapshot,
+            years=req.years,
+            accounts=req.accounts,
+            filing_status=req.tax_filing_status,
+        )
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except dependency_graph.DependencyCycleError as e:
+        # Cycles are rejected when items are linked, but rows stored before that check may still have one
+        raise HTTPException(status_code=400, detail=str(e))
+
+    projection.name = req.plan_name
+    projection.years = req.years
+    projection.final_value = result["final_value"]
+    projection.total_contributed = result["total_contributed"]
+    projection.total_growth = result["total_growth"]
+    projection.data_json = result["data_json"]
+    projection.accounts_json = json.dumps([acc.model_dump() for acc in req.accounts])
+    projection.timestamp = datetime.utcnow()
+    return await async_database.commit_and_refresh(db, projection)
+
+
+@router.delete("/projections/{projection_id}", status_code=204, tags=["projections"])
+async def delete_projection(
+    projection_id: int,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    projection = await owned(db, models.Projection, projection_id, current_user.id, "Projection not found.")
+    await db.delete(projection)
+    await db.commit()
+    return Response(status_code=204)
+
+
+# --- CASH FLOW ENDPOINTS ---
+
+def _yearly_value(payload) -> float:
+    # Linked items get their value from the item they track when a projection runs.
+    if payload.linked_item_id and payload.linked_item_type and payload.percentage is not None:
+        return 0.0
+    return payload.value * 12 if payload.frequency == "monthly" else payload.value
+
+
+@router.get("/cashflow", response_model=List[schemas.CashFlowOut], tags=["cashflow"])
+async def list_cashflow(
+    is_income: bool,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    return await owner_rows(db, owner_queries.cashflow_items(current_user.id, is_income))
+
+
+@router.post("/cashflow", response_model=schemas.CashFlowOut, status_code=201, tags=["cashflow"])
+async def create_cashflow(
+    payload: schemas.CashFlowCreate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    item = models.CashFlowItem(
+        owner_id=current_user.id,
+        is_income=payload.is_income,
+        category=payload.category,
+        description=payload.description,
+        frequency=payload.frequency,
+        yearly_value=_yearly_value(payload),
+        annual_increase_percent=payload.annual_increase_percent,
+        inflation_percent=payload.inflation_percent,
+        person=payload.person,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        taxable=payload.taxable,
+        tax_deductible=payload.tax_deductible,
+        linked_item_id=payload.linked_item_id,
+        linked_item_type=payload.linked_item_type,
+        percentage=payload.percentage
+    )
+    item = await async_database.commit_and_refresh(db, item)
+    projection_cache.invalidate_owner(current_user.id)
+    return item
+
+
+@router.put("/cashflow/{item_id}", response_model=schemas.CashFlowOut, tags=["cashflow"])
+async def update_cashflow(
+    item_id: int,
+    payload: schemas.CashFlowUpdate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    item = await owned(db, models.CashFlowItem, item_id, current_user.id, "Item not found")
+    item.is_income = payload.is_income
+    item.category = payload.category
+    item.description = payload.description
+    item.frequency = payload.frequency
+    item.yearly_value = _yearly_value(payload)
+    item.annual_increase_percent = payload.annual_increase_percent
+    item.inflation_percent = payload.inflation_percent
+    item.person = payload.person
+    item.start_date = payload.start_date
+    item.end_date = payload.end_date
+    item.taxable = payload.taxable
+    item.tax_deductible = payload.tax_deductible
+    item.linked_item_id = payload.linked_item_id
+    item.linked_item_type = payload.linked_item_type
+    item.percentage = payload.percentage
+
+    # Re-linking an item is the only way to introduce a cycle, so validate the owner's graph here.
+    owner_items = await owner_rows(db, select(models.CashFlowItem).where(models.CashFlowItem.owner_id == current_user.id))
+    try:
+        dependency_graph.CashFlowGraph(owner_items).check_acyclic()
+    except dependency_graph.DependencyCycleError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    item = await async_database.commit_and_refresh(db, item)
+    projection_cache.invalidate_owner(current_user.id)
+    return item
+
+
+@router.delete("/cashflow/{item_id}", status_code=204, tags=["cashflow"])
+async def delete_cashflow(
+    item_id: int,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    item = await owned(db, models.CashFlowItem, item_id, current_user.id, "Item not found")
+    await db.delete(item)
+    await db.commit()
+    projection_cache.invalidate_owner(current_user.id)
+    return Response(status_code=204)
+
+
+# --- ASSET ENDPOINTS ---
+
+@router.get("/assets", response_model=List[schemas.AssetOut], tags=["assets"])
+async def list_assets(
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    return await owner_rows(db, owner_queries.assets(current_user.id))
+
+
+@router.post("/assets", response_model=schemas.AssetOut, status_code=201, tags=["assets"])
+async def create_asset(
+    payload: schemas.AssetCreate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    asset = models.Asset(owner_id=current_user.id, **payload.model_dump())
+    asset = await async_database.commit_and_refresh(db, asset)
+    projection_cache.invalidate_owner(current_user.id)
+    return asset
+
+
+@router.put("/assets/{asset_id}", response_model=schemas.AssetOut, tags=["assets"])
+async def update_asset(
+    asset_id: int,
+    payload: schemas.AssetUpdate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    asset = await owned(db, models.Asset, asset_id, current_user.id, "Asset not found")
+    for field, value in payload.model_dump().items():
+        setattr(asset, field, value)
+    asset = await async_database.commit_and_refresh(db, asset)
+    projection_cache.invalidate_owner(current_user.id)
+    return asset
+
+
+@router.delete("/assets/{asset_id}", status_code=204, tags=["assets"])
+async def delete_asset(
+    asset_id: int,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    asset = await owned(db, models.Asset, asset_id, current_user.id, "Asset not found")
+    await db.delete(asset)
+    await db.commit()
+    projection_cache.invalidate_owner(current_user.id)
+    return Response(status_code=204)
+
+
+# --- LIABILITY ENDPOINTS ---
+
+@router.get("/liabilities", response_model=List[schemas.LiabilityOut], tags=["liabilities"])
+async def list_liabilities(
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    return await owner_rows(db, owner_queries.liabilities(current_user.id))
+
+
+@router.post("/liabilities", response_model=schemas.LiabilityOut, status_code=201, tags=["liabilities"])
+async def create_liability(
+    payload: schemas.LiabilityCreate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    liability = models.Liability(owner_id=current_user.id, **payload.model_dump())
+    liability = await async_database.commit_and_refresh(db, liability)
+    projection_cache.invalidate_owner(current_user.id)
+    return liability
+
+
+@router.put("/liabilities/{liability_id}", response_model=schemas.LiabilityOut, tags=["liabilities"])
+async def update_liability(
+    liability_id: int,
+    payload: schemas.LiabilityUpdate,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    liability = await owned(db, models.Liability, liability_id, current_user.id, "Liability not found")
+    for field, value in payload.model_dump().items():
+        setattr(liability, field, value)
+    liability = await async_database.commit_and_refresh(db, liability)
+    projection_cache.invalidate_owner(current_user.id)
+    return liability
+
+
+@router.delete("/liabilities/{liability_id}", status_code=204, tags=["liabilities"])
+async def delete_liability(
+    liability_id: int,
+    db: AsyncSession = Depends(async_database.get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    liability = await owned(db, models.Liability, liability_id, current_user.id, "Item not found")
+    await db.delete(liability)
+    await db.commit()
+    projection_cache.invalidate_owner(current_user.id)
+    return Response(status_code=204)
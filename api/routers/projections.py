@@ -0,0 +1,253 @@
+import json
+import logging
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+import schemas
+import models
+import calculations
+import compute_service
+import goal_seek
+import jobs
+import monte_carlo
+import monthly_engine
+import projection_core
+import projection_format
+import scenarios
+import sensitivity
+import snapshot_loader
+from database import get_db, SessionLocal
+from auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/projections",
+    tags=["projections"],
+)
+
+@router.post("/montecarlo", response_model=schemas.MonteCarloResponse)
+def run_monte_carlo_projection(
+    request: schemas.MonteCarloRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Runs a stochastic projection of the user's accounts and returns Total_Value percentile bands per year.
+    Accounts are assembled exactly as for POST /projections.
+    """
+    logger.debug("Monte Carlo projection for user %s: %d paths, %d years", current_user.id, request.paths, request.years)
+    assumptions = {a.asset_id: (a.mean_percent, a.volatility_percent) for a in request.assumptions}
+    try:
+        combined_accounts = calculations.assemble_accounts(request.accounts, db, current_user.id)
+        return monte_carlo.run_monte_carlo(
+            combined_accounts,
+            years=request.years,
+            paths=request.paths,
+            assumptions=assumptions,
+            seed=request.seed,
+        )
+    except Exception as e:
+        logger.error("Monte Carlo projection failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Monte Carlo projection failed: {e}")
+
+@router.post("/batch", response_model=schemas.BatchProjectionResponse)
+def run_batch_projection(
+    request: schemas.BatchProjectionRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Evaluates several what-if variants of the user's projection. The user's assets, liabilities and
+    cash flow items are loaded once and all scenarios are projected together in one batched pass.
+    """
+    logger.debug("Batch projection for user %s: %d scenarios", current_user.id, len(request.scenarios))
+    try:
+        combined_accounts = calculations.assemble_accounts(request.accounts, db, current_user.id)
+        results = scenarios.run_scenarios(
+            combined_accounts,
+            years=request.years,
+            scenarios=[scenario.model_dump() for scenario in request.scenarios],
+        )
+    except Exception as e:
+        logger.error("Batch projection failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Batch projection failed: {e}")
+    return {"scenarios": results}
+
+@router.post("/solve", response_model=schemas.SolveResponse)
+def solve_projection_goal(
+    request: schemas.SolveRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Finds the monthly contribution, growth rate or number of years needed for Total_Value to reach
+    target_value, evaluating many candidate values per batched engine pass (see goal_seek.solve).
+    """
+    logger.debug("Goal-seek for user %s: %s to reach %s", current_user.id, request.variable, request.target_value)
+    try:
+        combined_accounts = calculations.assemble_accounts(request.accounts, db, current_user.id)
+        return goal_seek.solve(
+            combined_accounts,
+            years=request.years,
+            target_value=request.target_value,
+            variable=request.variable,
+            account_name=request.account_name,
+            lower=request.lower,
+            upper=request.upper,
+            tolerance=request.tolerance,
+        )
+    except Exception as e:
+        logger.error("Goal-seek failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Goal-seek failed: {e}")
+
+@router.post("/sensitivity", response_model=schemas.SensitivityResponse)
+def run_sensitivity_analysis(
+    request: schemas.SensitivityRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Scales each asset growth rate, cash flow value and the inflation rate by -/+ perturbation_percent
+    and reports the effect on final_value (tornado chart data). All perturbed runs are projected
+    together in one batched pass.
+    """
+    logger.debug("Sensitivity analysis for user %s: +/-%s%%", current_user.id, request.perturbation_percent)
+    try:
+        combined_accounts = calculations.assemble_accounts(request.accounts, db, current_user.id)
+        return sensitivity.run_sensitivity(combined_accounts, request.years, request.perturbation_percent)
+    except Exception as e:
+        logger.error("Sensitivity analysis failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Sensitivity analysis failed: {e}")
+
+@router.post("/monthly", response_model=schemas.MonthlyProjectionResponse)
+def run_monthly_projection(
+    request: schemas.MonthlyProjectionRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Projects the user's accounts at monthly resolution, honouring the start_date/end_date of assets,
+    liabilities and cash flow items. With granularity "annual" the months are rolled up into years.
+    """
+    logger.debug("Monthly projection for user %s: %d years, %s", current_user.id, request.years, request.granularity)
+    try:
+        combined_accounts = calculations.assemble_accounts(request.accounts, db, current_user.id)
+        return monthly_engine.project_monthly(
+            combined_accounts,
+            years=request.years,
+            start_month=request.start_month,
+            granularity=request.granularity,
+        )
+    except Exception as e:
+        logger.error("Monthly projection failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Monthly projection failed: {e}")
+
+@router.post("/stream")
+async def stream_projection(
+    request: schemas.ProjectionStreamRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Runs a projection like POST /projections without saving it and streams the result as NDJSON,
+    one per-year record per line. The projection is computed in full first (the engine steps all
+    years as arrays); the records are then built and sent one year at a time from its columns,
+    without the data_json string or the per-year record list.
+    """
+    logger.debug("Streaming projection for user %s: %d years", current_user.id, request.years)
+    try:
+        owner_snapshot = await run_in_threadpool(snapshot_loader.load_snapshot, db, current_user.id)
+        columns = await compute_service.project_columns(owner_snapshot, request.years, request.accounts,
+                                                        request.tax_filing_status)
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        logger.error("Streaming projection failed for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Projection failed: {e}")
+    return StreamingResponse(
+        projection_format.iter_ndjson(columns),
+        media_type="application/x-ndjson",
+    )
+
+def save_projection_result(owner_id: int, plan_name: str, years: int, accounts: list, result: dict) -> int:
+    """Stores a finished projection job as a Projection in its own session; returns the new id."""
+    db = SessionLocal()
+    try:
+        db_projection = models.Projection(
+            owner_id=owner_id,
+            name=plan_name,
+            years=years,
+            final_value=result["final_value"],
+            total_contributed=result["total_contributed"],
+            total_growth=result["total_growth"],
+            data_json=result["data_json"],
+            accounts_json=json.dumps(accounts),
+        )
+        db.add(db_projection)
+        db.commit()
+        return db_projection.id
+    finally:
+        db.close()
+
+@router.post("/jobs", response_model=schemas.ProjectionJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_projection_job(
+    request: schemas.ProjectionJobRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Starts a projection, Monte Carlo or batch run in the background and returns its job immediately.
+    Poll GET /projections/jobs/{job_id} for status ("queued" until a running slot is free, see
+    PROJECTION_JOBS_CONCURRENCY), progress and the result. With persist=true a finished projection
+    job is also saved as a Projection named plan_name. A seeded Monte Carlo job returns the same
+    bands as POST /projections/montecarlo.
+    """
+    logger.debug("Projection job request for user %s: %s, %d years", current_user.id, request.kind, request.years)
+    if request.persist and (request.kind != "projection" or not request.plan_name):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="persist requires kind 'projection' and a plan_name")
+    if request.kind == "batch" and not request.scenarios:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Batch jobs need at least one scenario")
+
+    accounts = [acc.model_dump() for acc in request.accounts]
+    try:
+        owner_snapshot = await run_in_threadpool(snapshot_loader.load_snapshot, db, current_user.id)
+        combined_accounts = None
+        if request.kind != "projection":
+            combined_accounts = projection_core.combine_accounts(accounts, owner_snapshot)
+        job = jobs.store.create(current_user.id, request.kind)
+    except compute_service.ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        logger.error("Could not start projection job for user %s: %s", current_user.id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Could not start projection job: {e}")
+
+    if request.kind == "projection":
+        persist = None
+        if request.persist:
+            persist = partial(save_projection_result, current_user.id, request.plan_name, request.years, accounts)
+        work = jobs.projection_work(job, owner_snapshot, request.years, accounts, persist=persist,
+                                   filing_status=request.tax_filing_status)
+    elif request.kind == "montecarlo":
+        assumptions = {a.asset_id: (a.mean_percent, a.volatility_percent) for a in request.assumptions}
+        work = jobs.monte_carlo_work(job, combined_accounts, request.years, request.paths, assumptions, seed=request.seed)
+    else:
+        work = jobs.batch_work(job, combined_accounts, request.years, [scenario.model_dump() for scenario in request.scenarios])
+
+    jobs.start(job, work)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", response_model=schemas.ProjectionJobOut)
+def get_projection_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user)
+):
+    """Returns the status, progress and (once finished) the result of one of the user's projection jobs."""
+    job = jobs.store.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projection job not found")
+    return job.to_dict()
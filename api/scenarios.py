@@ -0,0 +1,90 @@
+# api/scenarios.py
+
+import numpy as np
+
+import projection_engine
+
+CASHFLOW_TYPES = ("income", "expense")
+
+
+def _account_rate(annual_increase_percent: float, annual_change_type: str) -> float:
+    rate = (annual_increase_percent or 0.0) / 100.0
+    return -rate if annual_change_type == "decrease" else rate
+
+
+def build_scenario_arrays(model: projection_engine.ProjectionModel, combined_accounts: list, scenarios: list):
+    """
+    Stacks per-scenario copies of the model's rate and contribution arrays along a leading
+    scenario axis, applying each scenario's overrides.
+
+    Each scenario is a dict with optional keys:
+      growth_rate_delta_percent - added to the effective rate of every asset-like account
+      contribution_multiplier   - scales the contributions of every non cash flow account
+      account_overrides         - list of {name, annual_increase_percent, monthly_contribution, initial_balance}
+    Raises ValueError if an override names an account that is not part of the projection.
+    """
+    n = len(model)
+    count = len(scenarios)
+    rate = np.tile(model.rate, (count, 1))
+    contribution = np.tile(model.contribution, (count, 1))
+    initial = np.tile(model.initial, (count, 1))
+
+    types = np.array(model.types, dtype=object)
+    asset_like = ~np.isin(types, ("liability",) + CASHFLOW_TYPES) if n else np.zeros(0, dtype=bool)
+    contributing = ~np.isin(types, CASHFLOW_TYPES) if n else np.zeros(0, dtype=bool)
+
+    positions_by_name = {}
+    for i, name in enumerate(model.names):
+        positions_by_name.setdefault(name, []).append(i)
+
+    for s, scenario in enumerate(scenarios):
+        delta = (scenario.get("growth_rate_delta_percent") or 0.0) / 100.0
+        if delta:
+            rate[s, asset_like] += delta
+        multiplier = scenario.get("contribution_multiplier")
+        if multiplier is not None and multiplier != 1.0:
+            contribution[s, contributing] *= multiplier
+
+        for override in scenario.get("account_overrides") or []:
+            positions = positions_by_name.get(override["name"])
+            if positions is None:
+                raise ValueError(f"Scenario '{scenario.get('name')}' overrides unknown account '{override['name']}'")
+            for i in positions:
+                account = combined_accounts[i]
+                if override.get("annual_increase_percent") is not None:
+                    rate[s, i] = _account_rate(override["annual_increase_percent"], account.get("annual_change_type", "increase")) + (delta if asset_like[i] else 0.0)
+                if override.get("monthly_contribution") is not None:
+                    contribution[s, i] = projection_engine.signed_annual_contribution(account["type"], override["monthly_contribution"])
+                if override.get("initial_balance") is not None:
+                    initial[s, i] = override["initial_balance"]
+    return rate, contribution, initial
+
+
+def run_scenarios(combined_accounts: list, years: int, scenarios: list) -> list:
+    """
+    Projects every scenario from the same combined accounts in a single batched pass.
+
+    Scenarios may use different horizons (`years`); all are stepped to the longest horizon
+    and each result is cut at its own. Returns one compact summary dict per scenario.
+    """
+    if not scenarios:
+        return []
+    model = projection_engine.ProjectionModel(combined_accounts)
+    horizons = [int(scenario.get("years") or years) for scenario in scenarios]
+    rate, contribution, initial = build_scenario_arrays(model, combined_accounts, scenarios)
+
+    result = projection_engine.simulate(
+        model, max(horizons), rate=rate, contribution=contribution, initial=initial, keep_values=False
+    )
+
+    summaries = []
+    for s, (scenario, horizon) in enumerate(zip(scenarios, horizons)):
+        total_value = result.total_value[s, :horizon]
+        summaries.append({
+            "name": scenario.get("name"),
+            "years": horizon,
+            "final_value": float(total_value[-1]) if horizon else 0.0,
+            "total_contributed": float(result.total_contribution[s, :horizon].sum()),
+            "total_value": total_value.tolist(),
+        })
+    return summaries
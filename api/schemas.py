@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator, ValidationInfo
 import re
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Literal
 from datetime import datetime
 
+import projection_format
+
 # --- USER SCHEMAS ---
 
 class UserBase(BaseModel):
@@ -81,6 +83,8 @@ class AccountSchema(BaseModel):
     monthly_contribution: float
     annual_increase_percent: float # NOTE: Must be a float
     annual_change_type: str = "increase"
+    start_date: str | None = None # YYYY-MM-DD, honoured by the monthly engine
+    end_date: str | None = None
 
 class ProjectionRequest(BaseModel):
     """
@@ -89,6 +93,8 @@ class ProjectionRequest(BaseModel):
     plan_name: str
     years: int
     accounts: List[AccountSchema] # <--- CRITICAL CHANGE
+    # Adds Taxable_Income, Total_Tax and After_Tax_Cashflow to every year (see tax.py)
+    tax_filing_status: Optional[Literal["single", "married_joint"]] = None
     
     class Config:
         from_attributes = True
@@ -115,6 +121,15 @@ class ProjectionResponse(BaseModel):
     # CRITICAL FIX: The response schema must use the model's attribute name
     data_json: str
     timestamp: Optional[datetime] = None  # Optional for backward compatibility with existing records
+    data_format: Literal["legacy", "columnar"] = "legacy" # Layout of data_json as stored
+
+    @model_validator(mode="after")
+    def read_data_format(self):
+        # data_json is returned as stored (not re-encoded per row); GET /projections/{id}
+        # converts to per-year records for clients that need them.
+        self.data_format = projection_format.stored_format(self.data_json)
+        return self
+
     class Config:
         from_attributes = True
 
@@ -135,8 +150,174 @@ class ProjectionDetailOut(BaseModel):
     total_growth: float | None = None
     data_json: str | None = None
     accounts_json: str | None = None
+    data_format: Literal["legacy", "columnar"] = "legacy" # Layout of data_json in this response
+    basis: Literal["nominal", "real"] = "nominal" # "real": amounts deflated to today's dollars
+    inflation_percent: float | None = None # Rate used for the real basis
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="after")
+    def read_data_json(self, info: ValidationInfo):
+        # Reads both stored layouts and returns data_json in the requested one
+        # (validation context {"data_format": ...}, default per-year records).
+        if info.context and info.context.get("data_format"):
+            self.data_format = info.context["data_format"]
+        self.data_json = projection_format.convert(self.data_json, self.data_format)
+        return self
+
+# --- MONTE CARLO SCHEMAS ---
+
+class MonteCarloAssumption(BaseModel):
+    asset_id: int
+    mean_percent: float # Expected annual return, in percent
+    volatility_percent: float = Field(..., ge=0) # Standard deviation of the annual return, in percent
+
+class MonteCarloRequest(BaseModel):
+    years: int = Field(..., ge=1, le=150)
+    paths: int = Field(1000, ge=1, le=20000)
+    seed: Optional[int] = Field(None, ge=0) # numpy seeds must be non-negative
+    accounts: List[AccountSchema] = []
+    assumptions: List[MonteCarloAssumption] = []
+
+class MonteCarloBand(BaseModel):
+    Year: int
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+class MonteCarloResponse(BaseModel):
+    paths: int
+    years: int
+    seed: int # Echoed back (or generated) so a run can be reproduced
+    bands: List[MonteCarloBand]
+
+# --- BATCH SCENARIO SCHEMAS ---
+
+class ScenarioAccountOverride(BaseModel):
+    name: str # Account (or cash flow item description) as it appears in the projection
+    annual_increase_percent: Optional[float] = None
+    monthly_contribution: Optional[float] = None
+    initial_balance: Optional[float] = None
+
+class ScenarioOverride(BaseModel):
+    name: str
+    years: Optional[int] = Field(None, ge=1, le=150) # Defaults to the request's years
+    growth_rate_delta_percent: float = 0.0 # Added to the rate of every asset-like account
+    contribution_multiplier: float = 1.0 # Scales contributions of every non cash flow account
+    account_overrides: List[ScenarioAccountOverride] = []
+
+class BatchProjectionRequest(BaseModel):
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    scenarios: List[ScenarioOverride] = Field(..., min_length=1, max_length=100)
+
+class ScenarioResult(BaseModel):
+    name: str
+    years: int
+    final_value: float
+    total_contributed: float
+    total_value: List[float] # Total_Value per year
+
+class BatchProjectionResponse(BaseModel):
+    scenarios: List[ScenarioResult]
+
+# --- GOAL-SEEK SCHEMAS ---
+
+class SolveRequest(BaseModel):
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    target_value: float # Total_Value to reach after `years`
+    variable: Literal["monthly_contribution", "growth_rate", "years"]
+    account_name: Optional[str] = None # Required for monthly_contribution; optional for growth_rate
+    lower: Optional[float] = None # Search range; widened automatically when both are omitted
+    upper: Optional[float] = None
+    tolerance: Optional[float] = Field(None, gt=0)
+
+class SolveResponse(BaseModel):
+    variable: str
+    account_name: Optional[str] = None
+    target_value: float
+    value: Optional[float] = None # Monthly contribution, growth percent or number of years
+    years: int
+    final_value: float # Total_Value after `years` with `value` applied
+    converged: bool
+    iterations: int
+    evaluations: int # Batched engine passes
+
+# --- SENSITIVITY SCHEMAS ---
+
+class SensitivityRequest(BaseModel):
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    perturbation_percent: float = Field(10.0, gt=0, le=100) # Each input is scaled by 1 -/+ this percent
+
+class SensitivityInput(BaseModel):
+    name: str # Account, cash flow item, or "Inflation"
+    input: str # annual_increase_percent | yearly_value | linked_percentage | inflation_percent
+    low_final_value: float
+    high_final_value: float
+    low_delta: float # Change from base_final_value
+    high_delta: float
+    swing: float # |high_final_value - low_final_value|
+
+class SensitivityResponse(BaseModel):
+    years: int
+    perturbation_percent: float
+    base_final_value: float
+    inputs: List[SensitivityInput] # Largest swing first (tornado order)
+
+# --- MONTHLY PROJECTION SCHEMAS ---
+
+class MonthlyProjectionRequest(BaseModel):
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    start_month: Optional[str] = None # YYYY-MM the projection starts at; defaults to the current month
+    granularity: Literal["monthly", "annual"] = "monthly" # "annual" rolls the months up into years
+
+class MonthlyProjectionResponse(BaseModel):
+    granularity: str
+    start_month: str
+    final_value: float
+    total_contributed: float
+    total_growth: float
+    data_json: str # Monthly records (Month, Date, ...) or yearly records in the Projection.data_json layout
+
+# --- PROJECTION JOB SCHEMAS ---
+
+class ProjectionJobRequest(BaseModel):
+    kind: Literal["projection", "montecarlo", "batch"] = "projection"
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    # Monte Carlo jobs
+    paths: int = Field(1000, ge=1, le=200000)
+    seed: Optional[int] = Field(None, ge=0) # numpy seeds must be non-negative
+    assumptions: List[MonteCarloAssumption] = []
+    # Batch jobs
+    scenarios: List[ScenarioOverride] = Field([], max_length=1000)
+    # Projection jobs: store the finished result as a Projection named plan_name
+    persist: bool = False
+    plan_name: Optional[str] = None
+    tax_filing_status: Optional[Literal["single", "married_joint"]] = None
+
+class ProjectionJobOut(BaseModel):
+    id: str
+    kind: str
+    status: str # queued | running | succeeded | failed
+    progress: float # 0.0 - 1.0
+    result: Optional[Any] = None # Same shape as the synchronous endpoint's response
+    error: Optional[str] = None
+    projection_id: Optional[int] = None # Set when a persisted projection job succeeds
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class ProjectionStreamRequest(BaseModel):
+    """Body of POST /projections/stream; the records are streamed back and not saved."""
+    years: int = Field(..., ge=1, le=150)
+    accounts: List[AccountSchema] = []
+    tax_filing_status: Optional[Literal["single", "married_joint"]] = None
+
 # --- CASH FLOW SCHEMAS ---
 
 class CashFlowBase(BaseModel):
@@ -272,6 +453,10 @@ class LiabilityCreate(BaseModel):
     annual_change_type: str = "increase" # New field
     start_date: str | None = None  # New field
     end_date: str | None = None    # New field
+    # Amortization mode (see amortization.py): set a rate plus a remaining term and/or a monthly payment
+    interest_rate_percent: float | None = Field(default=None, ge=0)
+    term_months: int | None = Field(default=None, gt=0, le=1800)
+    monthly_payment: float | None = Field(default=None, gt=0)
 
 class LiabilityUpdate(LiabilityCreate):
     pass
@@ -285,6 +470,9 @@ class LiabilityOut(BaseModel):
     annual_change_type: str # New field
     start_date: str | None = None  # New field
     end_date: str | None = None    # New field
+    interest_rate_percent: float | None = None
+    term_months: int | None = None
+    monthly_payment: float | None = None
     model_config = ConfigDict(from_attributes=True)
 
 # --- CUSTOM CHART SCHEMAS ---
@@ -320,3 +508,9 @@ class CustomChartOut(CustomChartBase):
     total_contributed: float | None = None
     total_growth: float | None = None
     model_config = ConfigDict(from_attributes=True)
+
+    @field_validator('data_json')
+    @classmethod
+    def read_data_json(cls, v: str | None) -> str | None:
+        # Charts store columnar projection data; the chart views read per-year records
+        return projection_format.convert(v, projection_format.LEGACY)
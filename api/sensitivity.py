@@ -0,0 +1,81 @@
+# api/sensitivity.py
+
+import numpy as np
+
+import projection_engine
+
+CASHFLOW_TYPES = ("income", "expense")
+
+
+def _inputs(model: projection_engine.ProjectionModel, combined_accounts: list) -> list:
+    """
+    Lists the perturbable inputs as (name, input, positions): every asset's growth rate, every
+    cash flow item's yearly value (its percentage when linked to an account) and the inflation
+    rate of all expense items together.
+    """
+    dynamic_position = {int(i): j for j, i in enumerate(model.dynamic_index)}
+    inputs = []
+    for i, acc in enumerate(combined_accounts):
+        if acc["type"] == "asset":
+            inputs.append((acc["name"], "annual_increase_percent", [i]))
+        elif acc["type"] in CASHFLOW_TYPES:
+            inputs.append((acc["name"], "linked_percentage" if i in dynamic_position else "yearly_value", [i]))
+    expenses = [i for i, t in enumerate(model.types) if t == "expense"]
+    if expenses:
+        inputs.append(("Inflation", "inflation_percent", expenses))
+    return inputs
+
+
+def run_sensitivity(combined_accounts: list, years: int, perturbation_percent: float) -> dict:
+    """
+    Scales each input down and up by perturbation_percent (relative to its current value) and
+    reports the resulting final_value, largest swing first.
+
+    The base run and all 2N perturbed runs are stacked along a batch axis and projected in one
+    simulate() pass, so the cost grows with the array size rather than with Python-level runs.
+    """
+    model = projection_engine.ProjectionModel(combined_accounts)
+    inputs = _inputs(model, combined_accounts)
+    dynamic_position = {int(i): j for j, i in enumerate(model.dynamic_index)}
+    factors = (1.0 - perturbation_percent / 100.0, 1.0 + perturbation_percent / 100.0)
+
+    count = 1 + 2 * len(inputs) # Row 0 is the unperturbed base
+    n = len(model)
+    rate = np.tile(model.rate, (count, 1))
+    contribution = np.tile(model.contribution, (count, 1))
+    percentage = np.tile(model.dynamic_percentage, (count, 1))
+    for k, (name, kind, positions) in enumerate(inputs):
+        for side, factor in enumerate(factors):
+            row = 1 + 2 * k + side
+            if kind == "yearly_value":
+                contribution[row, positions] *= factor
+            elif kind == "linked_percentage":
+                percentage[row, dynamic_position[positions[0]]] *= factor
+            else:
+                rate[row, positions] *= factor
+
+    result = projection_engine.simulate(
+        model, years, rate=rate, contribution=contribution, dynamic_percentage=percentage, keep_values=False
+    )
+    final = result.total_value[:, -1] if years and n else np.zeros(count)
+    base = float(final[0])
+
+    rows = []
+    for k, (name, kind, positions) in enumerate(inputs):
+        low, high = float(final[1 + 2 * k]), float(final[2 + 2 * k])
+        rows.append({
+            "name": name,
+            "input": kind,
+            "low_final_value": low,
+            "high_final_value": high,
+            "low_delta": low - base,
+            "high_delta": high - base,
+            "swing": abs(high - low),
+        })
+    rows.sort(key=lambda row: row["swing"], reverse=True)
+    return {
+        "years": years,
+        "perturbation_percent": perturbation_percent,
+        "base_final_value": base,
+        "inputs": rows,
+    }
@@ -0,0 +1,66 @@
+# api/snapshot.py
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class AssetRecord:
+    id: int
+    name: str
+    value: float
+    annual_increase_percent: Optional[float]
+    annual_change_type: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class LiabilityRecord:
+    id: int
+    name: str
+    value: float
+    annual_increase_percent: Optional[float]
+    annual_change_type: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    # Amortization terms; a loan with a rate and a term or payment follows amortization.schedules
+    interest_rate_percent: Optional[float] = None
+    term_months: Optional[int] = None
+    monthly_payment: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CashFlowRecord:
+    id: int
+    owner_id: int
+    is_income: bool
+    description: str
+    yearly_value: float
+    linked_item_id: Optional[int]
+    linked_item_type: Optional[str]
+    percentage: Optional[float]
+    annual_increase_percent: Optional[float]
+    inflation_percent: Optional[float]
+    category: str
+    frequency: str
+    person: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    taxable: Optional[bool]
+    tax_deductible: Optional[bool]
+    created_at: str
+
+
+@dataclass(frozen=True, slots=True)
+class OwnerSnapshot:
+    """
+    Everything a projection reads from the database for one owner, as immutable plain records.
+
+    Snapshots hold no Session or ORM state, so they can be cached, pickled to worker processes
+    or built by hand in tests and benchmarks.
+    """
+    owner_id: int
+    assets: tuple = ()
+    liabilities: tuple = ()
+    cashflow_items: tuple = ()
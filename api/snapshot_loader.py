@@ -0,0 +1,117 @@
+# api/snapshot_loader.py
+
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+import models
+from snapshot import AssetRecord, LiabilityRecord, CashFlowRecord, OwnerSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+# Row kinds in the combined snapshot statement.
+_ASSET, _LIABILITY, _CASHFLOW = 0, 1, 2
+
+
+def _typed_null(type_):
+    return sa.cast(sa.null(), type_)
+
+
+def snapshot_statement(owner_id: int):
+    """
+    One UNION ALL statement returning exactly the columns the snapshot records need from the
+    assets, liabilities and cash flow items of an owner, tagged with their kind. Columns a table
+    does not have are typed NULLs, so every row has the same shape.
+    """
+    asset = models.Asset.__table__
+    liability = models.Liability.__table__
+    item = models.CashFlowItem.__table__
+    no_cashflow_fields = [
+        _typed_null(sa.Boolean), _typed_null(sa.Integer), _typed_null(sa.String), _typed_null(sa.Float),
+        _typed_null(sa.Float), _typed_null(sa.String), _typed_null(sa.String), _typed_null(sa.String),
+        _typed_null(sa.Boolean), _typed_null(sa.Boolean), _typed_null(sa.DateTime(timezone=True)),
+    ]
+    no_loan_fields = [_typed_null(sa.Float), _typed_null(sa.Integer), _typed_null(sa.Float)]
+
+    assets = sa.select(
+        sa.literal(_ASSET).label("kind"), asset.c.id, asset.c.name, asset.c.value,
+        asset.c.annual_increase_percent, asset.c.annual_change_type, asset.c.start_date, asset.c.end_date,
+        *no_loan_fields, *no_cashflow_fields,
+    ).where(asset.c.owner_id == owner_id)
+    liabilities = sa.select(
+        sa.literal(_LIABILITY), liability.c.id, liability.c.name, liability.c.value,
+        liability.c.annual_increase_percent, liability.c.annual_change_type, liability.c.start_date,
+        liability.c.end_date, liability.c.interest_rate_percent, liability.c.term_months,
+        liability.c.monthly_payment, *no_cashflow_fields,
+    ).where(liability.c.owner_id == owner_id)
+    cashflow_items = sa.select(
+        sa.literal(_CASHFLOW), item.c.id, item.c.description, item.c.yearly_value,
+        item.c.annual_increase_percent, _typed_null(sa.String), item.c.start_date, item.c.end_date,
+        *no_loan_fields,
+        item.c.is_income, item.c.linked_item_id, item.c.linked_item_type, item.c.percentage,
+        item.c.inflation_percent, item.c.category, item.c.frequency, item.c.person,
+        item.c.taxable, item.c.tax_deductible, item.c.created_at,
+    ).where(item.c.owner_id == owner_id)
+    return sa.union_all(assets, liabilities, cashflow_items).order_by(sa.literal_column("kind"), sa.literal_column("id"))
+
+
+def snapshot_from_rows(owner_id: int, rows) -> OwnerSnapshot:
+    """Builds the OwnerSnapshot from the rows of snapshot_statement."""
+    assets, liabilities, cashflow_items = [], [], []
+    for (kind, id, name, value, annual_increase_percent, annual_change_type, start_date, end_date,
+         interest_rate_percent, term_months, monthly_payment,
+         is_income, linked_item_id, linked_item_type, percentage, inflation_percent, category, frequency,
+         person, taxable, tax_deductible, created_at) in rows:
+        if kind == _ASSET:
+            assets.append(AssetRecord(id, name, value, annual_increase_percent, annual_change_type,
+                                      start_date, end_date))
+        elif kind == _LIABILITY:
+            liabilities.append(LiabilityRecord(id, name, value, annual_increase_percent, annual_change_type,
+                                               start_date, end_date, interest_rate_percent, term_months,
+                                               monthly_payment))
+        else:
+            cashflow_items.append(CashFlowRecord(
+                id=id,
+                owner_id=owner_id,
+                is_income=is_income,
+                description=name,
+                yearly_value=value,
+                linked_item_id=linked_item_id,
+                linked_item_type=linked_item_type,
+                percentage=percentage,
+                annual_increase_percent=annual_increase_percent,
+                inflation_percent=inflation_percent,
+                category=category,
+                frequency=frequency,
+                person=person,
+                start_date=start_date,
+                end_date=end_date,
+                taxable=taxable,
+                tax_deductible=tax_deductible,
+                created_at=str(created_at),
+            ))
+
+    logger.debug("Fetched %d assets, %d liabilities, %d cashflow items for owner %s",
+                 len(assets), len(liabilities), len(cashflow_items), owner_id)
+    return OwnerSnapshot(
+        owner_id=owner_id,
+        assets=tuple(assets),
+        liabilities=tuple(liabilities),
+        cashflow_items=tuple(cashflow_items),
+    )
+
+
+def load_snapshot(db: Session, owner_id: int) -> OwnerSnapshot:
+    """
+    Fetches the owner's assets, liabilities and cash flow items into an OwnerSnapshot with a
+    single statement (one database round trip). Rows are read as plain tuples, bypassing ORM
+    objects and the identity map, and come back ordered by kind and id.
+    """
+    return snapshot_from_rows(owner_id, db.execute(snapshot_statement(owner_id)))
+
+
+async def load_snapshot_async(db, owner_id: int) -> OwnerSnapshot:
+    """load_snapshot for an AsyncSession (see async_database.py)."""
+    return snapshot_from_rows(owner_id, await db.execute(snapshot_statement(owner_id)))
@@ -0,0 +1,69 @@
+# api/tax.py
+
+import numpy as np
+
+FILING_STATUSES = ("single", "married_joint")
+
+# Federal ordinary income brackets (2024): lower bound of each bracket and its marginal rate.
+_RATES = np.array([0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37])
+BRACKETS = {
+    "single": (np.array([0.0, 11600.0, 47150.0, 100525.0, 191950.0, 243725.0, 609350.0]), _RATES),
+    "married_joint": (np.array([0.0, 23200.0, 94300.0, 201050.0, 383900.0, 487450.0, 731200.0]), _RATES),
+}
+STANDARD_DEDUCTION = {"single": 14600.0, "married_joint": 29200.0}
+
+# Bracket thresholds and the standard deduction grow by this much per projection year.
+BRACKET_INDEX_PERCENT = 2.0
+
+# Tax owed at the lower bound of every bracket, so a lookup only adds the partial top bracket.
+_CUMULATIVE = {
+    status: np.concatenate([[0.0], np.cumsum(np.diff(thresholds) * rates[:-1])])
+    for status, (thresholds, rates) in BRACKETS.items()
+}
+
+TAX_COLUMNS = ("Taxable_Income", "Total_Tax", "After_Tax_Cashflow")
+
+
+def bracket_tax(taxable_income, filing_status: str, index_factor=1.0):
+    """
+    Tax on an array of taxable incomes. index_factor scales every bracket threshold (inflation
+    indexing); since the schedule is piecewise linear, that equals index_factor times the tax on
+    income / index_factor under the base table, so one searchsorted covers all years at once.
+    """
+    thresholds, rates = BRACKETS[filing_status]
+    scaled = np.maximum(np.asarray(taxable_income, dtype=np.float64) / index_factor, 0.0)
+    bracket = np.searchsorted(thresholds, scaled, side="right") - 1
+    return index_factor * (_CUMULATIVE[filing_status][bracket] + (scaled - thresholds[bracket]) * rates[bracket])
+
+
+def yearly_tax(combined_accounts: list, account_contributions, filing_status: str,
+               bracket_index_percent: float = BRACKET_INDEX_PERCENT) -> dict:
+    """
+    Per-year tax columns from the per-account contributions of a projection, shaped (years, n).
+
+    Taxable income is the sum of income items flagged `taxable`. Deductions are the expense items
+    flagged `tax_deductible`, or the standard deduction if larger. After_Tax_Cashflow is all
+    income minus all expenses minus the tax. Returns {column name: array of length years}.
+    """
+    if filing_status not in BRACKETS:
+        raise ValueError(f"Unknown filing status '{filing_status}'")
+    account_contributions = np.asarray(account_contributions, dtype=np.float64)
+    years = account_contributions.shape[0]
+    types = [acc["type"] for acc in combined_accounts]
+    taxable = np.array([t == "income" and bool(acc.get("taxable")) for t, acc in zip(types, combined_accounts)], dtype=bool)
+    deductible = np.array([t == "expense" and bool(acc.get("tax_deductible")) for t, acc in zip(types, combined_accounts)], dtype=bool)
+    cashflow = np.array([t in ("income", "expense") for t in types], dtype=bool)
+
+    index_factor = (1.0 + bracket_index_percent / 100.0) ** np.arange(years)
+    income = account_contributions[:, taxable].sum(axis=1) if taxable.any() else np.zeros(years)
+    itemized = -account_contributions[:, deductible].sum(axis=1) if deductible.any() else np.zeros(years)
+    deduction = np.maximum(itemized, STANDARD_DEDUCTION[filing_status] * index_factor)
+    taxable_income = np.maximum(income - deduction, 0.0)
+    total_tax = bracket_tax(taxable_income, filing_status, index_factor)
+    net_cashflow = account_contributions[:, cashflow].sum(axis=1) if cashflow.any() else np.zeros(years)
+
+    return {
+        "Taxable_Income": taxable_income,
+        "Total_Tax": total_tax,
+        "After_Tax_Cashflow": net_cashflow - total_tax,
+    }
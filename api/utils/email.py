@@ -1,3 +1,4 @@
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -5,6 +6,8 @@ from typing import List
 
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 def send_email(
     to_email: str,
     subject: str,
@@ -15,7 +18,7 @@ def send_email(
     Sends an email using the configured SMTP server.
     """
     if not settings.MAIL_USERNAME or not settings.MAIL_PASSWORD or not settings.MAIL_FROM or not settings.MAIL_SERVER:
-        print("Email configuration missing. Skipping email send.")
+        logger.warning("Email configuration missing. Skipping email send.")
         return
 
     msg = MIMEMultipart("alternative")
@@ -33,6 +36,6 @@ def send_email(
             server.starttls()  # Upgrade connection to secure TLS
             server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
             server.sendmail(settings.MAIL_FROM, to_email if not recipients else recipients, msg.as_string())
-        print(f"Email sent to {to_email if not recipients else ', '.join(recipients)} successfully.")
+        logger.info("Email sent to %s successfully.", to_email if not recipients else ", ".join(recipients))
     except Exception as e:
-        print(f"Failed to send email to {to_email if not recipients else ', '.join(recipients)}: {e}")
\ No newline at end of file
+        logger.error("Failed to send email to %s: %s", to_email if not recipients else ", ".join(recipients), e)
\ No newline at end of file
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the projection pipeline on synthetic households.
+
+Each case builds an owner with the given numbers of assets, liabilities, static cash flow items
+and linked cash flow items (linked to assets, liabilities or other cash flow items), then times
+every phase of a projection separately:
+
+    load        - snapshot_loader.load_snapshot: synthetic owners are written to a temporary SQLite
+                  database first; with --owner-id a real owner is loaded from the configured database
+    resolve     - projection_core.combine_accounts (dependency resolution and account assembly)
+    model       - building the ProjectionModel arrays
+    simulate    - the yearly projection loop
+    serialize   - encoding data_json
+    total       - projection_core.compute_projection end to end, with caches bypassed
+    sensitivity - sensitivity.run_sensitivity (+/-10%) on the resolved accounts
+
+With --owner-id a single case is run, recording that owner's real item counts.
+
+Peak traced memory per phase is measured in a separate tracemalloc pass so it does not distort
+the timings. Results are written as JSON; pass --compare to print the change against an earlier
+result file, e.g.
+
+    python benchmark_projection.py --output before.json
+    git checkout my-branch
+    python benchmark_projection.py --output after.json --compare before.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api'))
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import dependency_graph
+import incremental
+import models
+import projection_core
+import projection_engine
+import projection_format
+import sensitivity
+import snapshot
+import snapshot_loader
+
+PHASES = ("load", "resolve", "model", "simulate", "serialize", "total", "sensitivity")
+
+DEFAULT_CASES = [
+    {"name": "small", "assets": 5, "liabilities": 2, "static": 10, "linked": 3, "years": 30},
+    {"name": "medium", "assets": 25, "liabilities": 10, "static": 60, "linked": 25, "years": 50},
+    {"name": "large", "assets": 80, "liabilities": 20, "static": 150, "linked": 50, "years": 100},
+]
+
+
+def synthetic_owner(owner_id: int, assets: int, liabilities: int, static: int, linked: int, seed: int = 0):
+    """Builds a reproducible OwnerSnapshot with the given item counts."""
+    rng = random.Random(seed)
+    asset_records = tuple(
+        snapshot.AssetRecord(i + 1, f"Asset {i}", rng.uniform(1000, 500000), rng.uniform(0, 8),
+                             rng.choice(["increase", "increase", "decrease"]), None, None)
+        for i in range(assets)
+    )
+    liability_records = tuple(
+        snapshot.LiabilityRecord(assets + i + 1, f"Liability {i}", rng.uniform(1000, 300000), rng.uniform(0, 6),
+                                 "decrease", None, None)
+        for i in range(liabilities)
+    )
+
+    items = []
+    next_id = assets + liabilities + 1
+
+    def cashflow(description, yearly_value, linked_item_id=None, linked_item_type=None, percentage=None):
+        nonlocal next_id
+        is_income = rng.random() < 0.4
+        record = snapshot.CashFlowRecord(
+            id=next_id, owner_id=owner_id, is_income=is_income, description=description,
+            yearly_value=yearly_value, linked_item_id=linked_item_id, linked_item_type=linked_item_type,
+            percentage=percentage, annual_increase_percent=rng.uniform(0, 3), inflation_percent=rng.uniform(1, 3),
+            category="Benchmark", frequency="yearly", person=None, start_date=None, end_date=None,
+            taxable=False, tax_deductible=False, created_at="2026-01-01T00:00:00",
+        )
+        next_id += 1
+        items.append(record)
+        return record
+
+    for i in range(static):
+        cashflow(f"Flow {i}", rng.uniform(500, 60000))
+    for i in range(linked):
+        kind = rng.choice(["asset", "liability", "cashflow"])
+        if kind == "asset" and asset_records:
+            target = rng.choice(asset_records)
+            cashflow(f"Linked {i}", 0.0, target.id, "asset", rng.uniform(0.5, 5))
+        elif kind == "liability" and liability_records:
+            target = rng.choice(liability_records)
+            cashflow(f"Linked {i}", 0.0, target.id, "liability", rng.uniform(0.5, 5))
+        elif items:
+            # Link to an earlier item so the dependency graph stays acyclic.
+            target = rng.choice(items)
+            cashflow(f"Linked {i}", 0.0, target.id, "income" if target.is_income else "expense", rng.uniform(1, 50))
+        else:
+            cashflow(f"Linked {i}", rng.uniform(500, 60000))
+
+    return snapshot.OwnerSnapshot(owner_id, asset_records, liability_records, tuple(items))
+
+
+def run_phases(years: int, load) -> dict:
+    """Runs every phase once and returns {phase: seconds}, plus the data_json size."""
+    timings = {}
+
+    start = time.perf_counter()
+    loaded = load()
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combined = projection_core.combine_accounts([], loaded)
+    timings["resolve"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = projection_engine.ProjectionModel(combined)
+    timings["model"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = projection_engine.run_projection(model, years)
+    timings["simulate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data_json = projection_format.encode_result(result)
+    timings["serialize"] = time.perf_counter() - start
+
+    incremental.projector.discard_owner(loaded.owner_id)
+    start = time.perf_counter()
+    projection_core.compute_projection(loaded, years, [])
+    timings["total"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sensitivity.run_sensitivity(combined, years, 10.0)
+    timings["sensitivity"] = time.perf_counter() - start
+    return timings, len(data_json)
+
+
+def peak_memory(years: int, load) -> dict:
+    """Peak traced allocation per phase, in KiB."""
+    peaks = {}
+
+    def traced(phase, fn):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        value = fn()
+        peaks[phase] = round((tracemalloc.get_traced_memory()[1] - before) / 1024, 1)
+        return value
+
+    tracemalloc.start()
+    try:
+        loaded = traced("load", load)
+        combined = traced("resolve", lambda: projection_core.combine_accounts([], loaded))
+        model = traced("model", lambda: projection_engine.ProjectionModel(combined))
+        result = traced("simulate", lambda: projection_engine.run_projection(model, years))
+        traced("serialize", lambda: projection_format.encode_result(result))
+        incremental.projector.discard_owner(loaded.owner_id)
+        traced("total", lambda: projection_core.compute_projection(loaded, years, []))
+        traced("sensitivity", lambda: sensitivity.run_sensitivity(combined, years, 10.0))
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def database_loader(sessions, owner_id: int):
+    """Loads the owner's snapshot through snapshot_loader, in a new session from `sessions` each time."""
+    def load():
+        db = sessions()
+        try:
+            return snapshot_loader.load_snapshot(db, owner_id)
+        finally:
+            db.close()
+    return load
+
+
+def write_owner(db, owner_snapshot) -> None:
+    """Inserts the owner's user, asset, liability and cash flow rows."""
+    owner_id = owner_snapshot.owner_id
+    db.add(models.User(id=owner_id, email=f"benchmark-{owner_id}@example.invalid", hashed_password="-"))
+    db.add_all([models.Asset(owner_id=owner_id, category="Benchmark", **dataclasses.asdict(record))
+                for record in owner_snapshot.assets])
+    db.add_all([models.Liability(owner_id=owner_id, category="Benchmark", **dataclasses.asdict(record))
+                for record in owner_snapshot.liabilities])
+    db.add_all([models.CashFlowItem(**{key: value for key, value in dataclasses.asdict(record).items()
+                                       if key != "created_at"}) # Column default
+                for record in owner_snapshot.cashflow_items])
+    db.commit()
+
+
+def owner_case(owner_id: int, years: int) -> dict:
+    """The single case for a real owner (--owner-id), with that owner's item counts."""
+    import database
+
+    owner = database_loader(database.SessionLocal, owner_id)()
+    linked = sum(1 for item in owner.cashflow_items if dependency_graph.is_dynamic(item))
+    return {"name": f"owner-{owner_id}", "owner_id": owner_id, "assets": len(owner.assets),
+            "liabilities": len(owner.liabilities), "static": len(owner.cashflow_items) - linked,
+            "linked": linked, "years": years}
+
+
+def measure(case: dict, repeat: int, load) -> dict:
+    run_phases(case["years"], load) # Warm-up
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        timings, data_json_bytes = run_phases(case["years"], load)
+        for phase, seconds in timings.items():
+            samples[phase].append(seconds * 1000)
+    peaks = peak_memory(case["years"], load)
+
+    return {
+        **case,
+        "repeat": repeat,
+        "data_json_bytes": data_json_bytes,
+        "phases": {
+            phase: {
+                "min_ms": round(min(values), 3),
+                "median_ms": round(statistics.median(values), 3),
+                "mean_ms": round(statistics.fmean(values), 3),
+                "peak_kib": peaks[phase],
+            }
+            for phase, values in samples.items()
+        },
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_case(case: dict, repeat: int) -> dict:
+    """
+    Benchmarks one case. A synthetic owner is written to a temporary SQLite database and loaded
+    from there; a real owner's case (see owner_case) loads from the configured database.
+    """
+    if "owner_id" in case:
+        import database
+        return {**measure(case, repeat, database_loader(database.SessionLocal, case["owner_id"])),
+                "load_source": "database"}
+
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        models.Base.metadata.create_all(engine)
+        sessions = sessionmaker(bind=engine)
+        with sessions() as db:
+            write_owner(db, synthetic_owner(1, case["assets"], case["liabilities"], case["static"], case["linked"],
+                                            seed=case.get("seed", 0)))
+        return {**measure(case, repeat, database_loader(sessions, 1)), "load_source": "sqlite"}
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict) -> None:
+    """Prints the median time change per case and phase against an earlier result file."""
+    previous_cases = {case["name"]: case for case in previous.get("cases", [])}
+    print(f"\nCompared with {previous.get('commit') or 'previous run'} ({previous.get('timestamp')}):")
+    for case in current["cases"]:
+        before = previous_cases.get(case["name"])
+        if before is None:
+            continue
+        changes = []
+        for phase in PHASES:
+            old = before["phases"].get(phase, {}).get("median_ms")
+            new = case["phases"][phase]["median_ms"]
+            if old:
+                changes.append(f"{phase} {100.0 * (new - old) / old:+.1f}%")
+        print(f"  {case['name']}: " + ", ".join(changes))
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, help="Run a single custom case with this many assets")
+    parser.add_argument("--liabilities", type=int, default=5)
+    parser.add_argument("--static", type=int, default=20, help="Static cash flow items")
+    parser.add_argument("--linked", type=int, default=10, help="Linked cash flow items")
+    parser.add_argument("--years", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--owner-id", type=int,
+                        help="Benchmark this owner from the configured database instead of the synthetic cases")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    if args.owner_id is not None:
+        cases = [owner_case(args.owner_id, args.years)]
+    elif args.assets is not None:
+        cases = [{"name": "custom", "assets": args.assets, "liabilities": args.liabilities, "static": args.static,
+                  "linked": args.linked, "years": args.years, "seed": args.seed}]
+    else:
+        cases = [{**case, "seed": args.seed} for case in DEFAULT_CASES]
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cases": [],
+    }
+    for case in cases:
+        result = run_case(case, args.repeat)
+        results["cases"].append(result)
+        phases = ", ".join(f"{phase} {values['median_ms']:.2f} ms" for phase, values in result["phases"].items())
+        print(f"{case['name']}: {phases}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -203,6 +203,110 @@ def test_projection_request():
     return True
 
 
+def test_user_cache():
+    """Test that get_current_user serves cached users without the database until invalidated."""
+    print("=== Testing authenticated user cache ===\n")
+
+    import asyncio
+    import os
+    from datetime import datetime, timezone
+    from types import SimpleNamespace
+    api_path = os.path.join(os.path.dirname(__file__), 'api')
+    sys.path.insert(0, api_path)
+    import auth
+    import projection_cache
+
+    user = SimpleNamespace(id=987654, email="cached@example.com", created_at=datetime.now(timezone.utc),
+                           is_confirmed=True, is_admin=False)
+    token = auth.create_access_token({"sub": str(user.id)})
+    auth.cache_user(user)
+
+    # db=None: a cache hit must not query the session.
+    current_user = asyncio.run(auth.get_current_user(token=token, db=None))
+    assert current_user.id == user.id and current_user.email == user.email
+    assert current_user.is_admin is False
+    print("✓ Cached user served without a database session")
+
+    hits = auth.user_cache.stats()["hits"]
+    auth.invalidate_user(user.id)
+    assert auth.cached_user(user.id) is None
+    assert auth.user_cache.stats()["hits"] == hits
+    print("✓ invalidate_user drops the cached user")
+
+    # Least recently used entries go first once the cache is full.
+    small = projection_cache.LRUCache(max_entries=2, max_bytes=1024 * 1024, ttl_seconds=30)
+    for user_id in ("1", "2"):
+        small.put(user_id, {"id": user_id})
+    assert small.get("1") == {"id": "1"}
+    small.put("3", {"id": "3"})
+    assert small.get("2") is None and small.get("1") == {"id": "1"} and small.stats()["evictions"] == 1
+    small.discard("1")
+    assert small.get("1") is None and small.stats()["invalidations"] == 1
+    print("✓ User cache evicts the least recently used user")
+
+    print("\n=== User Cache Tests Passed! ===\n")
+
+
+def test_admin_demotion_takes_effect():
+    """An admin demoted through set-admin-status loses admin access on their next request."""
+    print("=== Testing admin demotion with the user cache ===\n")
+
+    import os
+    import tempfile
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    api_path = os.path.join(os.path.dirname(__file__), 'api')
+    sys.path.insert(0, api_path)
+    import auth
+    import database
+    import main
+    import models
+
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with sessions() as db:
+        db.add_all([models.User(id=user_id, email=f"admin{user_id}@example.com", hashed_password="-",
+                                is_confirmed=True, is_admin=True) for user_id in (801, 802)])
+        db.commit()
+
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def headers(user_id):
+        return {"Authorization": f"Bearer {auth.create_access_token({'sub': str(user_id)})}"}
+
+    main.app.dependency_overrides[database.get_db] = get_db
+    try:
+        client = TestClient(main.app)
+        assert client.get("/admin/users", headers=headers(802)).status_code == 200
+        hits = auth.user_cache.stats()["hits"]
+        assert client.get("/admin/users", headers=headers(802)).status_code == 200
+        assert auth.user_cache.stats()["hits"] == hits + 1 # Served from the cache
+        print("✓ Admin served from the user cache")
+
+        response = client.put("/admin/users/802/set-admin-status", json={"is_admin": False}, headers=headers(801))
+        assert response.status_code == 200 and response.json()["is_admin"] is False
+        assert client.get("/admin/users", headers=headers(802)).status_code == 403
+        assert client.get("/users/me", headers=headers(802)).json()["is_admin"] is False
+        print("✓ Demoted admin is refused on the next request")
+    finally:
+        main.app.dependency_overrides.clear()
+        for user_id in (801, 802):
+            auth.invalidate_user(user_id)
+        engine.dispose()
+        os.remove(path)
+
+    print("\n=== Admin Demotion Test Passed! ===\n")
+
+
 if __name__ == "__main__":
     success = True
     
@@ -212,6 +316,9 @@ if __name__ == "__main__":
         
         if not test_projection_request():
             success = False
+
+        test_user_cache()
+        test_admin_demotion_takes_effect()
         
         if success:
             print("=" * 50)
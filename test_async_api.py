@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Tests for the native async database path (settings.ASYNC_DATABASE, see routers/async_api.py).
+
+main.py is loaded a second time with ASYNC_DATABASE on, so async_api.install() runs exactly as in
+production. The same requests are then sent to the sync app and to the async app, each backed by
+its own SQLite database (pysqlite for the sync sessions, aiosqlite for the async ones), and the
+responses are compared, including the 403/404 paths.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+VOLATILE_KEYS = {"timestamp", "created_at"}
+
+
+def load_async_main():
+    """Executes api/main.py as a separate module with ASYNC_DATABASE enabled."""
+    from config import settings
+
+    original = settings.ASYNC_DATABASE
+    settings.ASYNC_DATABASE = True
+    try:
+        path = os.path.join(os.path.dirname(__file__), 'api', 'main.py')
+        spec = importlib.util.spec_from_file_location("main_async", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        settings.ASYNC_DATABASE = original
+    return module
+
+
+def served_by(app, path: str, method: str):
+    """The endpoint function the app routes (path, method) to, looking into included routers."""
+    from fastapi.routing import APIRoute
+
+    def walk(routes):
+        for route in routes:
+            if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+                yield route.endpoint
+            nested = getattr(getattr(route, "original_router", None), "routes", None) # include_router() entries
+            if nested:
+                yield from walk(nested)
+
+    return list(walk(app.router.routes))
+
+
+def test_install_replaces_sync_routes():
+    """Every (path, method) served by async_api is routed to the async endpoint, and only to it."""
+    import main
+    from routers import async_api
+
+    async_main = load_async_main()
+    for route in async_api.router.routes:
+        for method in route.methods:
+            endpoints = served_by(async_main.app, route.path, method)
+            assert endpoints == [route.endpoint], (route.path, method, endpoints)
+            sync_endpoints = served_by(main.app, route.path, method)
+            assert len(sync_endpoints) == 1 and sync_endpoints[0] is not route.endpoint, (route.path, method)
+    # Routes the async path does not serve stay on the sync endpoints.
+    assert served_by(async_main.app, "/projections/montecarlo", "POST") == served_by(main.app, "/projections/montecarlo", "POST")
+    print("✓ async_api.install() replaces the sync routes")
+
+
+def strip_volatile(value):
+    if isinstance(value, dict):
+        return {key: strip_volatile(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [strip_volatile(item) for item in value]
+    return value
+
+
+def exercise(client, current) -> list:
+    """Runs the same CRUD and projection requests as user 1 (and user 2 for the 403 paths)."""
+    owner, other = current["owner"], current["other"]
+    responses = []
+
+    def call(label, method, url, user=owner, **kwargs):
+        current["user"] = user
+        response = client.request(method, url, **kwargs)
+        body = response.json() if response.content else None
+        responses.append((label, response.status_code, strip_volatile(body)))
+        return body
+
+    call("me", "GET", "/users/me")
+
+    asset = call("create asset", "POST", "/assets", json={"name": "Brokerage", "category": "Investments", "value": 50000.0,
+                                                          "annual_increase_percent": 6.0})
+    call("update asset", "PUT", f"/assets/{asset['id']}", json={"name": "Brokerage", "category": "Investments",
+                                                                "value": 55000.0, "annual_increase_percent": 5.0})
+    call("update asset (other user)", "PUT", f"/assets/{asset['id']}", user=other,
+         json={"name": "X", "category": "Investments", "value": 1.0})
+    call("update missing asset", "PUT", "/assets/999", json={"name": "X", "category": "Investments", "value": 1.0})
+    call("list assets", "GET", "/assets")
+
+    liability = call("create liability", "POST", "/liabilities", json={
+        "name": "Mortgage", "category": "Mortgage", "value": 200000.0, "annual_increase_percent": 0.0,
+        "interest_rate_percent": 5.5, "term_months": 240})
+    call("update liability", "PUT", f"/liabilities/{liability['id']}", json={
+        "name": "Mortgage", "category": "Mortgage", "value": 190000.0, "interest_rate_percent": 5.5, "term_months": 228})
+    call("delete liability (other user)", "DELETE", f"/liabilities/{liability['id']}", user=other)
+    call("list liabilities", "GET", "/liabilities")
+
+    flow = call("create cashflow", "POST", "/cashflow", json={
+        "is_income": True, "category": "Salary", "description": "Salary", "frequency": "monthly", "value": 5000.0,
+        "annual_increase_percent": 2.0})
+    call("create linked cashflow", "POST", "/cashflow", json={
+        "is_income": False, "category": "Fees", "description": "Advisory fee", "frequency": "yearly", "value": 0.0,
+        "linked_item_id": asset["id"], "linked_item_type": "asset", "percentage": 1.0})
+    call("update cashflow", "PUT", f"/cashflow/{flow['id']}", json={
+        "is_income": True, "category": "Salary", "description": "Salary", "frequency": "yearly", "value": 70000.0})
+    call("update cashflow (other user)", "PUT", f"/cashflow/{flow['id']}", user=other, json={
+        "is_income": True, "category": "Salary", "description": "Salary", "frequency": "yearly", "value": 1.0})
+    call("list income", "GET", "/cashflow", params={"is_income": True})
+    call("list expenses", "GET", "/cashflow", params={"is_income": False})
+
+    accounts = [{"name": "Savings", "type": "asset", "initial_balance": 1000.0, "monthly_contribution": 100.0,
+                 "annual_increase_percent": 3.0}]
+    projection = call("create projection", "POST", "/projections",
+                      json={"plan_name": "Plan", "years": 20, "accounts": accounts})
+    call("get projection", "GET", f"/projections/{projection['id']}")
+    call("get projection (columnar)", "GET", f"/projections/{projection['id']}", params={"format": "columnar"})
+    call("get projection (other user)", "GET", f"/projections/{projection['id']}", user=other)
+    call("get missing projection", "GET", "/projections/999")
+    call("update projection", "PUT", f"/projections/{projection['id']}",
+         json={"plan_name": "Plan B", "years": 25, "accounts": accounts})
+    call("list projections", "GET", "/projections")
+    call("delete projection (other user)", "DELETE", f"/projections/{projection['id']}", user=other)
+    call("delete projection", "DELETE", f"/projections/{projection['id']}")
+    call("delete missing projection", "DELETE", f"/projections/{projection['id']}")
+
+    call("delete cashflow", "DELETE", f"/cashflow/{flow['id']}")
+    call("delete asset (other user)", "DELETE", f"/assets/{asset['id']}", user=other)
+    call("delete asset", "DELETE", f"/assets/{asset['id']}")
+    call("delete missing asset", "DELETE", f"/assets/{asset['id']}")
+    return responses
+
+
+def test_async_responses_match_sync():
+    """CRUD and projection endpoints answer identically on the sync and async paths."""
+    try:
+        import aiosqlite # noqa: F401 -- test-only driver for the async sessions
+    except ImportError:
+        print("- skipped: aiosqlite is not installed")
+        return
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    import async_database
+    import auth
+    import compute_service
+    import database
+    import main
+    import models
+    import schemas
+    from routers import async_api
+
+    async_main = load_async_main()
+    now = datetime.now(timezone.utc)
+    users = [schemas.UserOut(id=i, email=f"user{i}@example.com", created_at=now, is_confirmed=True) for i in (1, 2)]
+    current = {"owner": users[0], "other": users[1], "user": users[0]}
+
+    def database_file():
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        models.Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add_all([models.User(id=user.id, email=user.email, hashed_password="-", is_confirmed=True) for user in users])
+            db.commit()
+        return path, engine
+
+    sync_path, sync_engine = database_file()
+    async_path, _ = database_file()
+    sync_sessions = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{async_path}")
+    async_sessions = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+    def sync_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with async_sessions() as session:
+            yield session
+
+    main.app.dependency_overrides.update({database.get_db: sync_db, auth.get_current_user: lambda: current["user"]})
+    async_main.app.dependency_overrides.update({async_database.get_db: async_db,
+                                                async_api.get_current_user: lambda: current["user"]})
+    original_service = compute_service.service
+    compute_service.service = compute_service.ComputeService(workers=0, max_queue=8, timeout_seconds=30, max_tasks_per_child=0)
+    try:
+        sync_responses = exercise(TestClient(main.app), current)
+        async_responses = exercise(TestClient(async_main.app), current)
+    finally:
+        compute_service.service.shutdown()
+        compute_service.service = original_service
+        main.app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+        os.remove(sync_path)
+        os.remove(async_path)
+
+    assert [label for label, _, _ in sync_responses] == [label for label, _, _ in async_responses]
+    for sync_response, async_response in zip(sync_responses, async_responses):
+        assert sync_response == async_response, (sync_response, async_response)
+    statuses = {label: status for label, status, _ in sync_responses}
+    assert statuses["update asset (other user)"] == 403 and statuses["update missing asset"] == 404
+    assert statuses["get projection (other user)"] == 403 and statuses["delete missing projection"] == 404
+    print("✓ Async responses match the sync ones")
+
+
+if __name__ == "__main__":
+    test_install_replaces_sync_routes()
+    test_async_responses_match_sync()
+    print("\n=== All Async API Tests Passed! ===\n")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for the projection compute service: process-pool execution, queue bound and timeouts.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def sample_snapshot():
+    import snapshot
+
+    return snapshot.OwnerSnapshot(
+        owner_id=7,
+        assets=(snapshot.AssetRecord(1, "Brokerage", 50000.0, 6.0, "increase", None, None),),
+        liabilities=(snapshot.LiabilityRecord(2, "Car loan", 12000.0, 5.0, "decrease", None, None),),
+    )
+
+
+def test_process_pool_matches_inline():
+    """A projection computed in a worker process equals the in-process result."""
+    import compute_service
+    import projection_core
+
+    service = compute_service.ComputeService(workers=1, max_queue=4, timeout_seconds=60, max_tasks_per_child=2)
+    owner_snapshot = sample_snapshot()
+    accounts = [{"name": "Savings", "type": "asset", "initial_balance": 1000.0, "monthly_contribution": 200.0,
+                 "annual_increase_percent": 2.0, "annual_change_type": "increase"}]
+    try:
+        for _ in range(3):  # more jobs than max_tasks_per_child, so the worker is recycled
+            result = asyncio.run(service.run(projection_core.compute_projection, owner_snapshot, 20, accounts))
+            assert result == projection_core.compute_projection(owner_snapshot, 20, accounts)
+        stats = service.stats()
+        assert stats["completed"] == 3 and stats["pending"] == 0
+    finally:
+        service.shutdown()
+    print("✓ Process pool matches in-process projection")
+
+
+def test_incremental_state_survives_worker_recycling():
+    """A second projection through compute_service.project takes the incremental path in a fresh worker."""
+    import dataclasses
+    import compute_service
+    import incremental
+    import projection_core
+    import snapshot
+
+    owner_snapshot = dataclasses.replace(sample_snapshot(), owner_id=8, assets=(
+        snapshot.AssetRecord(1, "Brokerage", 50000.0, 6.0, "increase", None, None),
+        snapshot.AssetRecord(3, "House", 400000.0, 3.0, "increase", None, None),
+    ))
+    edited = dataclasses.replace(owner_snapshot, assets=(
+        snapshot.AssetRecord(1, "Brokerage", 65000.0, 6.0, "increase", None, None),
+        owner_snapshot.assets[1],
+    ))
+
+    original_service = compute_service.service
+    # max_tasks_per_child=1: every job runs in a new worker process.
+    compute_service.service = compute_service.ComputeService(workers=1, max_queue=4, timeout_seconds=60, max_tasks_per_child=1)
+    before = incremental.projector.stats()
+    try:
+        asyncio.run(compute_service.project(owner_snapshot, 25, []))
+        result = asyncio.run(compute_service.project(edited, 25, []))
+    finally:
+        compute_service.service.shutdown()
+        compute_service.service = original_service
+    after = incremental.projector.stats()
+
+    assert after["full_runs"] == before["full_runs"] + 1
+    assert after["incremental_runs"] == before["incremental_runs"] + 1
+    full, _ = projection_core.compute_from_state(edited, 25, [], None, None)
+    assert result == full
+    print("✓ Incremental state survives worker recycling")
+
+
+def test_queue_bound_and_timeout():
+    """Jobs beyond max_queue are rejected and callers stop waiting after the timeout."""
+    import compute_service
+
+    service = compute_service.ComputeService(workers=0, max_queue=1, timeout_seconds=0.1, max_tasks_per_child=0)
+    try:
+        future = service.submit(time.sleep, 0.5)
+        try:
+            service.submit(time.sleep, 0)
+            assert False, "Expected ComputeQueueFull"
+        except compute_service.ComputeQueueFull as e:
+            assert e.status_code == 503
+        future.result()
+
+        try:
+            asyncio.run(service.run(time.sleep, 0.5))
+            assert False, "Expected ComputeTimeout"
+        except compute_service.ComputeTimeout as e:
+            assert e.status_code == 504
+        stats = service.stats()
+        assert stats["rejected"] == 1 and stats["timed_out"] == 1
+    finally:
+        service.shutdown()
+    print("✓ Queue bound and timeout enforced")
+
+
+def test_background_jobs_report_progress_and_results():
+    """Monte Carlo and batch jobs run in chunks, finish with full progress and match direct runs."""
+    import compute_service
+    import jobs
+    import monte_carlo
+    import scenarios
+    from test_projection_engine import random_household
+
+    accounts = random_household(random.Random(5), 4, 2, 1, 6)
+    for i, acc in enumerate(accounts):
+        acc["id"] = i + 1
+    variants = [{"name": f"Scenario {i}", "growth_rate_delta_percent": i * 0.5} for i in range(7)]
+
+    original_service = compute_service.service
+    compute_service.service = compute_service.ComputeService(workers=0, max_queue=8, timeout_seconds=30, max_tasks_per_child=0)
+    original_chunks = (jobs.settings.PROJECTION_JOB_MONTE_CARLO_CHUNK, jobs.settings.PROJECTION_JOB_SCENARIO_CHUNK)
+    jobs.settings.PROJECTION_JOB_MONTE_CARLO_CHUNK, jobs.settings.PROJECTION_JOB_SCENARIO_CHUNK = 300, 3
+    store = jobs.JobStore(max_jobs=10, retention_seconds=60)
+
+    async def run_all():
+        mc_job = store.create(1, "montecarlo")
+        jobs.start(mc_job, jobs.monte_carlo_work(mc_job, accounts, 15, 1000, {1: (6.0, 15.0)}, seed=11))
+        batch_job = store.create(1, "batch")
+        jobs.start(batch_job, jobs.batch_work(batch_job, accounts, 15, variants))
+        await asyncio.gather(mc_job.task, batch_job.task)
+        return mc_job, batch_job
+
+    try:
+        mc_job, batch_job = asyncio.run(run_all())
+    finally:
+        compute_service.service.shutdown()
+        compute_service.service = original_service
+        jobs.settings.PROJECTION_JOB_MONTE_CARLO_CHUNK, jobs.settings.PROJECTION_JOB_SCENARIO_CHUNK = original_chunks
+
+    assert mc_job.status == jobs.SUCCEEDED and mc_job.progress == 1.0, mc_job.error
+    # Same seed, same result as the synchronous endpoint, whatever the chunk size.
+    assert mc_job.result == monte_carlo.run_monte_carlo(accounts, 15, 1000, {1: (6.0, 15.0)}, seed=11)
+
+    assert batch_job.status == jobs.SUCCEEDED and batch_job.progress == 1.0, batch_job.error
+    assert batch_job.result == {"scenarios": scenarios.run_scenarios(accounts, 15, variants)}
+    assert store.get(mc_job.id, owner_id=2) is None
+    print("✓ Background jobs report progress and results")
+
+
+def test_jobs_stay_queued_until_a_slot_is_free():
+    """Jobs report queued -> running -> succeeded, and only PROJECTION_JOBS_CONCURRENCY run at once."""
+    import compute_service
+    import jobs
+    import monte_carlo
+    from test_projection_engine import random_household
+
+    accounts = random_household(random.Random(8), 3, 1, 1, 3)
+    for i, acc in enumerate(accounts):
+        acc["id"] = i + 1
+    assumptions = {1: (5.0, 12.0)}
+
+    original_service = compute_service.service
+    compute_service.service = compute_service.ComputeService(workers=0, max_queue=8, timeout_seconds=30, max_tasks_per_child=0)
+    original_concurrency = jobs.settings.PROJECTION_JOBS_CONCURRENCY
+    jobs.settings.PROJECTION_JOBS_CONCURRENCY = 1
+    store = jobs.JobStore(max_jobs=10, retention_seconds=60)
+
+    async def run_all():
+        gates = {"first": asyncio.Event(), "second": asyncio.Event()}
+
+        async def gated(name, work):
+            await gates[name].wait()
+            return await work
+
+        async def settle():
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        first, second = store.create(1, "montecarlo"), store.create(1, "montecarlo")
+        assert first.status == second.status == jobs.QUEUED
+        jobs.start(first, gated("first", jobs.monte_carlo_work(first, accounts, 10, 600, assumptions, seed=3)))
+        jobs.start(second, gated("second", jobs.monte_carlo_work(second, accounts, 10, 600, assumptions, seed=4)))
+        await settle()
+        observed = [(first.status, second.status)]
+        assert second.started_at is None
+        gates["first"].set()
+        await first.task
+        await settle()
+        observed.append((first.status, second.status))
+        gates["second"].set()
+        await second.task
+        observed.append((first.status, second.status))
+        return first, second, observed
+
+    try:
+        first, second, observed = asyncio.run(run_all())
+    finally:
+        compute_service.service.shutdown()
+        compute_service.service = original_service
+        jobs.settings.PROJECTION_JOBS_CONCURRENCY = original_concurrency
+
+    assert observed == [(jobs.RUNNING, jobs.QUEUED), (jobs.SUCCEEDED, jobs.RUNNING), (jobs.SUCCEEDED, jobs.SUCCEEDED)]
+    assert second.started_at >= first.finished_at
+    assert first.result == monte_carlo.run_monte_carlo(accounts, 10, 600, assumptions, seed=3)
+    assert second.result == monte_carlo.run_monte_carlo(accounts, 10, 600, assumptions, seed=4)
+    print("✓ Jobs stay queued until a running slot is free")
+
+
+def test_project_columns_match_data_json():
+    """The columns streamed by POST /projections/stream equal the parsed data_json of a stored projection."""
+    import json
+
+    import compute_service
+    import projection_format
+
+    owner_snapshot = sample_snapshot()
+    accounts = [{"name": "Savings", "type": "asset", "initial_balance": 1000.0, "monthly_contribution": 200.0,
+                 "annual_increase_percent": 2.0, "annual_change_type": "increase"}]
+    columns = asyncio.run(compute_service.project_columns(owner_snapshot, 15, accounts, "single"))
+    result = asyncio.run(compute_service.project(owner_snapshot, 15, accounts, "single"))
+    assert "Total_Tax" in columns["extra"]
+    assert columns == json.loads(result["data_json"])
+    assert list(projection_format.iter_ndjson(columns)) == \
+        list(projection_format.iter_ndjson(json.loads(result["data_json"])))
+    print("✓ Streamed columns match the stored data_json")
+
+
+if __name__ == "__main__":
+    test_process_pool_matches_inline()
+    test_incremental_state_survives_worker_recycling()
+    test_queue_bound_and_timeout()
+    test_background_jobs_report_progress_and_results()
+    test_jobs_stay_queued_until_a_slot_is_free()
+    test_project_columns_match_data_json()
+    print("\n=== All Compute Service Tests Passed! ===\n")
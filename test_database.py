@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy engine creation, the connection pool warm-up and GET /ready.
+
+SQLite files stand in for Postgres: a writable path warms up, a path in a missing directory
+fails to connect with OperationalError.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+UNREACHABLE_URL = "sqlite:////nonexistent-directory/finmodel.db"
+
+
+def use_database(url):
+    """Points database.py at `url` (None: back to the environment) and drops the current engine."""
+    import database
+
+    database.dispose()
+    if url is None:
+        os.environ.pop("DATABASE_URL", None)
+    else:
+        os.environ["DATABASE_URL"] = url
+    database.get_database_url.cache_clear()
+    database.get_engine_instance.cache_clear()
+
+
+def test_import_does_not_create_engine():
+    """Importing main creates no engine and needs no database settings."""
+    environment = {key: value for key, value in os.environ.items()
+                   if key not in ("DATABASE_URL", "DB_USER", "DB_PASSWORD", "DB_NAME")}
+    code = ("import main, database; "
+            "assert database.get_engine_instance.cache_info().currsize == 0; "
+            "assert database.pool_status()['created'] is False")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=environment,
+                               capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    print("✓ Importing main does not create the engine")
+
+
+def test_warm_up_retries_then_raises():
+    """warm_up retries with the configured delay and re-raises the last OperationalError."""
+    from sqlalchemy.exc import OperationalError
+    import database
+
+    sleeps = []
+    original_sleep = database.time.sleep
+    database.time.sleep = sleeps.append
+    use_database(UNREACHABLE_URL)
+    try:
+        try:
+            database.warm_up(2, retries=3, delay=0.5)
+            assert False, "Expected OperationalError"
+        except OperationalError:
+            pass
+        assert sleeps == [0.5, 0.5] # No sleep after the last attempt
+    finally:
+        database.time.sleep = original_sleep
+        use_database(None)
+    print("✓ warm_up retries, then re-raises OperationalError")
+
+
+def test_ready_reflects_warm_up():
+    """/ready is 503 before the warm-up and after a failed one, 200 once the pool is warm."""
+    from fastapi.testclient import TestClient
+    import main
+    from config import settings
+
+    original = (settings.DB_WARMUP_CONNECTIONS, settings.DB_WARMUP_RETRIES, settings.DB_WARMUP_RETRY_DELAY_SECONDS)
+    settings.DB_WARMUP_CONNECTIONS, settings.DB_WARMUP_RETRIES, settings.DB_WARMUP_RETRY_DELAY_SECONDS = 3, 2, 0
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    client = TestClient(main.app) # Not entered, so the lifespan warm-up does not run
+    try:
+        main.readiness.update(state="pending", error=None)
+        response = client.get("/ready")
+        assert response.status_code == 503 and response.json()["status"] == "pending"
+
+        use_database(UNREACHABLE_URL)
+        asyncio.run(main.warm_up_database())
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed" and "unable to open database file" in response.json()["error"]
+
+        use_database(f"sqlite:///{path}")
+        main.readiness.update(state="pending", error=None)
+        asyncio.run(main.warm_up_database())
+        response = client.get("/ready")
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["status"] == "ready" and "error" not in body
+        assert body["pool"]["created"] is True and body["pool"]["checked_in"] == 3 and body["pool"]["checked_out"] == 0
+    finally:
+        settings.DB_WARMUP_CONNECTIONS, settings.DB_WARMUP_RETRIES, settings.DB_WARMUP_RETRY_DELAY_SECONDS = original
+        main.readiness.update(state="pending", error=None)
+        use_database(None)
+        os.remove(path)
+    print("✓ /ready reflects the warm-up")
+
+
+if __name__ == "__main__":
+    test_import_does_not_create_engine()
+    test_warm_up_retries_then_raises()
+    test_ready_reflects_warm_up()
+    print("\n=== All Database Tests Passed! ===\n")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for resolving linked cash flow items through the dependency graph.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def make_item(item_id, yearly_value=0.0, linked_item_id=None, linked_item_type=None, percentage=None):
+    return {
+        "id": item_id,
+        "description": f"Item {item_id}",
+        "yearly_value": yearly_value,
+        "linked_item_id": linked_item_id,
+        "linked_item_type": linked_item_type,
+        "percentage": percentage,
+    }
+
+
+def test_resolves_chains_in_dependency_order():
+    """Items linked through other items resolve regardless of list order."""
+    from dependency_graph import resolve_yearly_values
+
+    items = [
+        make_item(3, linked_item_id=2, linked_item_type="expense", percentage=50.0),
+        make_item(2, linked_item_id=1, linked_item_type="income", percentage=10.0),
+        make_item(1, yearly_value=100000.0),
+        make_item(4, linked_item_id=7, linked_item_type="asset", percentage=4.0),
+        make_item(5, linked_item_id=99, linked_item_type="income", percentage=10.0), # dangling link
+        make_item(6, yearly_value=500.0, linked_item_type="income"), # incomplete link
+    ]
+    values = resolve_yearly_values(items, asset_values={7: 250000.0}, liability_values={})
+
+    assert values[1] == 100000.0
+    assert values[2] == 10000.0
+    assert values[3] == 5000.0
+    assert values[4] == 10000.0
+    assert values[5] == 0.0
+    assert values[6] == 0.0
+    print("✓ Linked items resolve in dependency order")
+
+
+def test_cycle_is_reported():
+    """A circular link raises an error naming every item in the cycle."""
+    from dependency_graph import CashFlowGraph, DependencyCycleError, resolve_yearly_values
+
+    items = [
+        make_item(1, yearly_value=1000.0),
+        make_item(2, linked_item_id=3, linked_item_type="income", percentage=10.0),
+        make_item(3, linked_item_id=4, linked_item_type="expense", percentage=10.0),
+        make_item(4, linked_item_id=2, linked_item_type="income", percentage=10.0),
+    ]
+    try:
+        resolve_yearly_values(items, asset_values={}, liability_values={})
+    except DependencyCycleError as e:
+        assert [item_id for item_id, _ in e.cycle] == [2, 3, 4, 2]
+        assert "Item 3 (ID: 3)" in str(e)
+    else:
+        raise AssertionError("Expected DependencyCycleError")
+
+    assert CashFlowGraph(items[:2]).find_cycle() is None
+    assert CashFlowGraph([make_item(8, linked_item_id=8, linked_item_type="income", percentage=1.0)]).find_cycle()
+    print("✓ Cycles are reported")
+
+
+def cyclic_flows(owner_id=1):
+    """Two expenses linked to each other, as rows stored before links were validated."""
+    import models
+
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        models.CashFlowItem(id=1, owner_id=owner_id, is_income=False, category="Fees", description="Fee A",
+                            frequency="yearly", yearly_value=0.0, linked_item_id=2, linked_item_type="expense",
+                            percentage=10.0, created_at=created),
+        models.CashFlowItem(id=2, owner_id=owner_id, is_income=False, category="Fees", description="Fee B",
+                            frequency="yearly", yearly_value=0.0, linked_item_id=1, linked_item_type="expense",
+                            percentage=10.0, created_at=created),
+    ]
+
+
+def test_cycle_error_crosses_process_boundary():
+    """A cycle found in a compute worker reaches the caller as DependencyCycleError; the pool keeps working."""
+    import pickle
+    import compute_service
+    import projection_core
+    import snapshot
+    from dependency_graph import DependencyCycleError
+
+    error = DependencyCycleError([(1, "Fee A"), (2, "Fee B"), (1, "Fee A")])
+    copy = pickle.loads(pickle.dumps(error))
+    assert copy.cycle == error.cycle and str(copy) == str(error)
+
+    flows = tuple(snapshot.CashFlowRecord(
+        id=item.id, owner_id=7, is_income=False, description=item.description, yearly_value=0.0,
+        linked_item_id=item.linked_item_id, linked_item_type="expense", percentage=10.0,
+        annual_increase_percent=None, inflation_percent=None, category="Fees", frequency="yearly", person=None,
+        start_date=None, end_date=None, taxable=None, tax_deductible=None, created_at="2026-01-01",
+    ) for item in cyclic_flows())
+    cyclic = snapshot.OwnerSnapshot(owner_id=7, cashflow_items=flows)
+    service = compute_service.ComputeService(workers=1, max_queue=4, timeout_seconds=60, max_tasks_per_child=0)
+    try:
+        try:
+            asyncio.run(service.run(projection_core.compute_projection, cyclic, 10, []))
+        except DependencyCycleError as e:
+            assert [item_id for item_id, _ in e.cycle] in ([1, 2, 1], [2, 1, 2])
+        else:
+            raise AssertionError("Expected DependencyCycleError")
+        result = asyncio.run(service.run(projection_core.compute_projection, snapshot.OwnerSnapshot(owner_id=7), 10, []))
+        assert result["final_value"] == 0.0
+    finally:
+        service.shutdown()
+    print("✓ DependencyCycleError crosses the process boundary")
+
+
+def test_endpoints_reject_stored_cycle():
+    """Projection and chart endpoints answer 400, not 500, when stored cash flow links form a cycle."""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import auth
+    import compute_service
+    import database
+    import main
+    import models
+    import schemas
+
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with sessions() as db:
+        db.add(models.User(id=1, email="owner@example.com", hashed_password="-", is_confirmed=True))
+        db.add(models.Projection(id=5, owner_id=1, name="Plan", years=10, final_value=0.0, total_contributed=0.0,
+                                 total_growth=0.0, data_json="[]", accounts_json="[]"))
+        db.add_all(cyclic_flows())
+        db.commit()
+
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    user = schemas.UserOut(id=1, email="owner@example.com", created_at=datetime.now(timezone.utc), is_confirmed=True)
+    main.app.dependency_overrides.update({database.get_db: get_db, auth.get_current_user: lambda: user})
+    original_service = compute_service.service
+    compute_service.service = compute_service.ComputeService(workers=0, max_queue=4, timeout_seconds=30, max_tasks_per_child=0)
+    try:
+        client = TestClient(main.app)
+        request = {"plan_name": "Plan", "years": 10, "accounts": []}
+        chart = {"name": "Fees", "chart_type": "line", "series_configurations": '[{"data_type": "expense", "item_id": 1}]'}
+        for method, url, body in (("POST", "/projections", request), ("PUT", "/projections/5", request),
+                                  ("POST", "/custom_charts/", chart)):
+            response = client.request(method, url, json=body)
+            assert response.status_code == 400, (method, url, response.status_code, response.text)
+            assert "Circular dependency" in response.json()["detail"]
+    finally:
+        compute_service.service.shutdown()
+        compute_service.service = original_service
+        main.app.dependency_overrides.clear()
+        engine.dispose()
+        os.remove(path)
+    print("✓ Endpoints answer 400 for a stored cycle")
+
+
+if __name__ == "__main__":
+    test_resolves_chains_in_dependency_order()
+    test_cycle_is_reported()
+    test_cycle_error_crosses_process_boundary()
+    test_endpoints_reject_stored_cycle()
+    print("\n=== All Dependency Graph Tests Passed! ===\n")
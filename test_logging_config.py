@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the logging setup: lazy formatting, per-module levels, sampling and JSON output.
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+class CountingRepr:
+    """Counts how often it is turned into a string."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "payload"
+
+
+def capture(stream):
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if getattr(handler, "_finmodel_handler", False):
+            handler.setStream(stream)
+
+
+def test_levels_and_lazy_formatting():
+    """Records below a module's level are never formatted; overrides apply per module."""
+    import logging_config
+
+    original_level = logging.getLogger().level
+    stream = io.StringIO()
+    try:
+        logging_config.configure(level="INFO", module_levels="projection_core=DEBUG", log_format="json", sample_rate=1.0)
+        capture(stream)
+        payload = CountingRepr()
+        logging.getLogger("routers.custom_charts").debug("Accounts: %s", payload)
+        assert payload.calls == 0, "DEBUG message was formatted at INFO level"
+
+        logging.getLogger("projection_core").debug("Combined accounts: %s", payload, extra={"owner_id": 7})
+        entry = json.loads(stream.getvalue().strip())
+        assert entry["severity"] == "DEBUG" and entry["logger"] == "projection_core"
+        assert entry["message"] == "Combined accounts: payload" and entry["owner_id"] == 7
+        assert payload.calls >= 1 # Formatted once per handler that emits it
+    finally:
+        logging.getLogger("projection_core").setLevel(logging.NOTSET)
+        logging.getLogger().setLevel(original_level)
+    print("✓ Per-module levels and lazy formatting")
+
+
+def test_sampling_keeps_warnings():
+    """Sampling drops low-level records but never warnings or errors."""
+    import logging_config
+
+    original_level = logging.getLogger().level
+    stream = io.StringIO()
+    try:
+        logging_config.configure(level="INFO", module_levels="", log_format="text", sample_rate=0.0)
+        capture(stream)
+        logger = logging.getLogger("jobs")
+        for _ in range(20):
+            logger.info("progress")
+        logger.warning("slow job")
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1 and lines[0].endswith("WARNING jobs: slow job")
+    finally:
+        logging_config.configure(level=logging.getLevelName(original_level), module_levels="", sample_rate=1.0)
+    print("✓ Sampling keeps warnings")
+
+
+if __name__ == "__main__":
+    test_levels_and_lazy_formatting()
+    test_sampling_keeps_warnings()
+    print("\n=== All Logging Tests Passed! ===\n")
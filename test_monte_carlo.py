@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo projection: agreement with the deterministic engine, reproducibility
+from a seed, percentile ordering and request validation of POST /projections/montecarlo.
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def sample_accounts():
+    from test_projection_engine import random_household
+
+    accounts = random_household(random.Random(3), 4, 2, 1, 6)
+    for i, acc in enumerate(accounts):
+        acc["id"] = i + 1
+    return accounts
+
+
+def test_zero_volatility_matches_deterministic_run():
+    """With zero volatility and the deterministic rate as mean, every path equals the plain projection."""
+    import monte_carlo
+    import projection_engine
+
+    accounts = sample_accounts()
+    assumptions = {
+        acc["id"]: ((acc["annual_increase_percent"] if acc["annual_change_type"] == "increase"
+                     else -acc["annual_increase_percent"]), 0.0)
+        for acc in accounts if acc["type"] == "asset"
+    }
+    deterministic = projection_engine.run_projection(projection_engine.ProjectionModel(accounts), 20).total_value
+
+    paths = monte_carlo.simulate_paths(accounts, 20, assumptions, monte_carlo.path_blocks(50, 1))
+    assert paths.shape == (50, 20)
+    assert np.allclose(paths, deterministic, rtol=1e-12)
+    result = monte_carlo.run_monte_carlo(accounts, 20, 50, assumptions, seed=1)
+    for band, expected in zip(result["bands"], deterministic):
+        assert all(np.isclose(band[f"p{p}"], expected, rtol=1e-12) for p in monte_carlo.PERCENTILES)
+    print("✓ Zero volatility matches the deterministic run")
+
+
+def test_seed_reproducibility_and_percentile_order():
+    """The same seed reproduces the output exactly; bands are ordered p5 <= ... <= p95 every year."""
+    import monte_carlo
+
+    accounts = sample_accounts()
+    assumptions = {acc["id"]: (6.0, 18.0) for acc in accounts if acc["type"] == "asset"}
+
+    first = monte_carlo.run_monte_carlo(accounts, 25, 500, assumptions, seed=42)
+    assert first == monte_carlo.run_monte_carlo(accounts, 25, 500, assumptions, seed=42)
+    assert first["seed"] == 42
+    assert first != monte_carlo.run_monte_carlo(accounts, 25, 500, assumptions, seed=43)
+
+    unseeded = monte_carlo.run_monte_carlo(accounts, 5, 10, assumptions)
+    assert unseeded == monte_carlo.run_monte_carlo(accounts, 5, 10, assumptions, seed=unseeded["seed"])
+
+    for band in first["bands"]:
+        values = [band[f"p{p}"] for p in monte_carlo.PERCENTILES]
+        assert values == sorted(values), band
+    assert first["bands"][-1]["p95"] > first["bands"][-1]["p5"]
+    print("✓ Seeded runs reproduce and percentiles are ordered")
+
+
+def test_endpoint_validates_paths_and_seed():
+    """POST /projections/montecarlo rejects out-of-range path counts and negative seeds with 422."""
+    from fastapi.testclient import TestClient
+    import calculations
+    import database
+    import main
+    from auth import get_current_user
+    from datetime import datetime, timezone
+    import schemas
+
+    accounts = sample_accounts()
+    user = schemas.UserOut(id=1, email="mc@example.com", created_at=datetime.now(timezone.utc))
+    main.app.dependency_overrides[database.get_db] = lambda: None
+    main.app.dependency_overrides[get_current_user] = lambda: user
+    original_assemble = calculations.assemble_accounts
+    calculations.assemble_accounts = lambda request_accounts, db, owner_id: accounts # No database here
+    try:
+        client = TestClient(main.app)
+        for payload in ({"years": 10, "paths": 0}, {"years": 10, "paths": 20001}, {"years": 10, "seed": -1},
+                        {"years": 0}, {"years": 10, "assumptions": [{"asset_id": 1, "mean_percent": 5, "volatility_percent": -1}]}):
+            response = client.post("/projections/montecarlo", json=payload)
+            assert response.status_code == 422, (payload, response.status_code)
+
+        payload = {"years": 10, "paths": 200, "seed": 7,
+                   "assumptions": [{"asset_id": 1, "mean_percent": 5, "volatility_percent": 12}]}
+        response = client.post("/projections/montecarlo", json=payload)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["seed"] == 7 and body["paths"] == 200 and len(body["bands"]) == 10
+        assert client.post("/projections/montecarlo", json=payload).json() == body
+    finally:
+        calculations.assemble_accounts = original_assemble
+        main.app.dependency_overrides.clear()
+    print("✓ Monte Carlo endpoint validates paths and seed")
+
+
+if __name__ == "__main__":
+    test_zero_volatility_matches_deterministic_run()
+    test_seed_reproducibility_and_percentile_order()
+    test_endpoint_validates_paths_and_seed()
+    print("\n=== All Monte Carlo Tests Passed! ===\n")
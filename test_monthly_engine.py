@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the monthly projection engine.
+
+The closed-form, array-based engine is checked against a straightforward month-by-month
+loop over the same rules, including start/end dates and linked cash flow items.
+"""
+
+import math
+import os
+import random
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def reference_monthly(accounts, years, origin):
+    """Month-by-month loop: balances compound monthly, flows escalate, linked flows track balances."""
+    import monthly_engine
+
+    months = years * 12
+    monthly_rates, windows = [], []
+    for acc in accounts:
+        is_flow = acc["type"] in monthly_engine.FLOW_TYPES
+        annual = (acc.get("annual_increase_percent") or 0.0) / 100.0
+        if acc.get("annual_change_type") == "decrease" and not is_flow:
+            annual = -annual
+        monthly_rates.append((1 + max(annual, -1.0)) ** (1 / 12) - 1)
+        first = monthly_engine.month_index(acc.get("start_date"), origin)
+        last = monthly_engine.month_index(acc.get("end_date"), origin)
+        windows.append((0 if first is None else max(first, 0), months - 1 if last is None else last))
+
+    balances = [None] * len(accounts)
+    totals = []
+    for month in range(months):
+        values = [0.0] * len(accounts)
+        for i, acc in enumerate(accounts):
+            start, end = windows[i]
+            if not start <= month <= end or "linked_account" in acc:
+                continue
+            g = monthly_rates[i]
+            contribution = (acc.get("monthly_contribution") or 0.0)
+            if acc["type"] in ("liability", "expense"):
+                contribution = -abs(contribution)
+            elif acc["type"] == "income":
+                contribution = abs(contribution)
+            if acc["type"] in monthly_engine.FLOW_TYPES:
+                values[i] = contribution * (1 + g) ** month
+            else:
+                balance = acc["initial_balance"] if balances[i] is None else balances[i]
+                balances[i] = balance * (1 + g) + contribution * (1 + g / 2)
+                values[i] = balances[i]
+        for i, acc in enumerate(accounts):
+            start, end = windows[i]
+            if "linked_account" in acc and start <= month <= end:
+                source = sum(values[j] for j, other in enumerate(accounts)
+                             if other["name"] == acc["linked_account"] and other["type"] not in monthly_engine.FLOW_TYPES)
+                sign = -1.0 if acc["type"] == "expense" else 1.0
+                values[i] = sign * abs(source * acc["percentage"] / 100.0 / 12)
+        totals.append(sum(values))
+    return totals
+
+
+def test_monthly_engine_matches_loop():
+    """The array engine agrees with a month-by-month loop, honouring start and end dates."""
+    import monthly_engine
+
+    rng = random.Random(21)
+    origin = date(2025, 3, 1)
+    for _ in range(10):
+        accounts = []
+        for i in range(rng.randint(1, 6)):
+            accounts.append({
+                "name": f"Asset {i}", "type": rng.choice(["asset", "liability"]),
+                "initial_balance": rng.uniform(0, 200000), "monthly_contribution": rng.uniform(0, 800),
+                "annual_increase_percent": rng.uniform(0, 9), "annual_change_type": rng.choice(["increase", "decrease"]),
+                "start_date": rng.choice([None, "2024-01-01", f"{rng.randint(2025, 2040)}-{rng.randint(1, 12):02d}-15"]),
+                "end_date": rng.choice([None, f"{rng.randint(2030, 2060)}-{rng.randint(1, 12):02d}-01"]),
+            })
+        for i in range(rng.randint(0, 6)):
+            account = {
+                "name": f"Flow {i}", "type": rng.choice(["income", "expense"]), "initial_balance": 0.0,
+                "monthly_contribution": rng.uniform(0, 3000), "annual_increase_percent": rng.uniform(0, 4),
+                "start_date": rng.choice([None, f"{rng.randint(2025, 2035)}-{rng.randint(1, 12):02d}-01"]),
+                "end_date": rng.choice([None, f"{rng.randint(2030, 2050)}-{rng.randint(1, 12):02d}-28"]),
+            }
+            if rng.random() < 0.4:
+                account["linked_account"] = rng.choice([acc["name"] for acc in accounts] + [None])
+                account["percentage"] = rng.uniform(0, 10)
+            accounts.append(account)
+
+        years = rng.randint(1, 40)
+        expected = reference_monthly(accounts, years, origin)
+        result = monthly_engine.simulate_monthly(accounts, years, origin)
+        assert result.months == years * 12
+        for month, (want, got) in enumerate(zip(expected, result.total_value.tolist())):
+            assert math.isclose(want, got, rel_tol=1e-9, abs_tol=1e-6), f"Month {month}: {want} != {got}"
+    print("✓ Monthly engine matches month-by-month loop")
+
+
+def test_monthly_engine_annual_rollup():
+    """Annual roll-up takes year-end balances and sums flows over the year."""
+    import monthly_engine
+
+    accounts = [
+        {"name": "Savings", "type": "asset", "initial_balance": 1000.0, "monthly_contribution": 100.0,
+         "annual_increase_percent": 0.0, "annual_change_type": "increase"},
+        {"name": "Salary", "type": "income", "initial_balance": 0.0, "monthly_contribution": 2000.0,
+         "annual_increase_percent": 0.0, "end_date": "2026-06-30"},
+    ]
+    result = monthly_engine.simulate_monthly(accounts, 2, date(2026, 1, 1))
+    records = result.to_annual().to_records()
+    assert [record["Year"] for record in records] == [1, 2]
+    assert records[0]["Savings_Value"] == 1000.0 + 12 * 100.0
+    assert records[0]["Salary_Value"] == 6 * 2000.0
+    assert records[1]["Salary_Value"] == 0.0
+    assert records[1]["StartingValue"] == records[0]["Total_Value"]
+    monthly_records = result.to_records()
+    assert monthly_records[0]["Date"] == "2026-01" and monthly_records[-1]["Date"] == "2027-12"
+    print("✓ Annual roll-up of monthly results")
+
+
+def test_monthly_engine_amortizing_loan():
+    """An amortizing loan reaches zero at payoff and its payment stops there, month by month."""
+    import monthly_engine
+    import projection_core
+    import snapshot
+
+    owner_snapshot = snapshot.OwnerSnapshot(owner_id=7, liabilities=(
+        snapshot.LiabilityRecord(1, "Mortgage", 300000.0, 3.0, "increase", None, None,
+                                 interest_rate_percent=6.5, term_months=120),
+    ))
+    combined_accounts = projection_core.combine_accounts([], owner_snapshot)
+    records = monthly_engine.simulate_monthly(combined_accounts, 15, date(2026, 1, 1)).to_records()
+
+    rate = 6.5 / 1200
+    payment = 300000.0 * rate / (1 - (1 + rate) ** -120)
+    balance = 300000.0
+    for month in range(120):
+        balance = balance * (1 + rate) - payment
+        assert math.isclose(records[month]["Mortgage_Value"], max(balance, 0.0), rel_tol=1e-9, abs_tol=1e-6), month
+        assert math.isclose(records[month]["Mortgage Payment_Value"], -payment, rel_tol=1e-9), month
+    assert math.isclose(records[119]["Mortgage_Value"], 0.0, abs_tol=1e-6)
+    for record in records[120:]:
+        assert record["Mortgage_Value"] == 0.0 and record["Mortgage Payment_Value"] == 0.0
+
+    annual = monthly_engine.simulate_monthly(combined_accounts, 15, date(2026, 1, 1)).to_annual().to_records()
+    assert math.isclose(annual[0]["Mortgage Payment_Value"], -12 * payment, rel_tol=1e-9)
+    assert annual[14]["Mortgage_Value"] == 0.0 and annual[14]["Mortgage Payment_Value"] == 0.0
+    print("✓ Amortizing loan pays off in the monthly engine")
+
+
+if __name__ == "__main__":
+    test_monthly_engine_matches_loop()
+    test_monthly_engine_annual_rollup()
+    test_monthly_engine_amortizing_loan()
+    print("\n=== All Monthly Engine Tests Passed! ===\n")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-process projection result cache: LRU, TTL and size eviction, owner
+invalidation and the statistics reported by /debug/projection-cache.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+class FakeClock:
+    """Stands in for the time module inside projection_cache so TTLs expire without sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def result(size: int = 10) -> dict:
+    return {"final_value": 1.0, "data_json": "x" * size}
+
+
+def test_lru_eviction_and_counters():
+    """The least recently used entry is evicted first; hits, misses and evictions are counted."""
+    import projection_cache
+
+    cache = projection_cache.ProjectionCache(max_entries=2, max_bytes=10**6, ttl_seconds=60)
+    cache.put("a", 1, result())
+    cache.put("b", 1, result())
+    assert cache.get("a") == result() # "a" is now the most recently used
+    cache.put("c", 2, result())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    returned = cache.get("a")
+    returned["final_value"] = 99.0
+    assert cache.get("a")["final_value"] == 1.0 # Callers get a copy
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 5 and stats["misses"] == 1
+    assert stats["hit_rate"] == 5 / 6
+    print("✓ LRU eviction and hit/miss counters")
+
+
+def test_ttl_expiry():
+    """Entries older than ttl_seconds are dropped on lookup and count as misses."""
+    import projection_cache
+
+    clock = FakeClock()
+    original_time = projection_cache.time
+    projection_cache.time = clock
+    try:
+        cache = projection_cache.ProjectionCache(max_entries=10, max_bytes=10**6, ttl_seconds=30)
+        cache.put("a", 1, result())
+        clock.now += 29
+        assert cache.get("a") is not None
+        clock.now += 2
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert stats["entries"] == 0 and stats["bytes"] == 0
+        assert stats["hits"] == 1 and stats["misses"] == 1
+    finally:
+        projection_cache.time = original_time
+    print("✓ TTL expiry")
+
+
+def test_max_bytes_eviction():
+    """The total size stays under max_bytes by evicting the oldest entries; oversized results are not cached."""
+    import projection_cache
+
+    entry_size = projection_cache._result_size(result(1000))
+    cache = projection_cache.ProjectionCache(max_entries=100, max_bytes=entry_size * 2 + 10, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.put(key, 1, result(1000))
+    assert cache.get("a") is None and cache.get("b") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == entry_size * 2 and cache.stats()["evictions"] == 1
+
+    cache.put("huge", 1, result(entry_size * 3))
+    assert cache.get("huge") is None
+    assert cache.stats()["entries"] == 2
+    print("✓ max_bytes eviction")
+
+
+def test_invalidate_owner():
+    """invalidate_owner drops every entry of that owner and nothing else."""
+    import projection_cache
+
+    cache = projection_cache.ProjectionCache(max_entries=10, max_bytes=10**6, ttl_seconds=60)
+    cache.put("a", 1, result())
+    cache.put("b", 1, result())
+    cache.put("c", 2, result())
+    cache.invalidate_owner(1)
+    cache.invalidate_owner(3) # Unknown owners are a no-op
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["invalidations"] == 2
+    assert stats["bytes"] == projection_cache._result_size(result())
+    print("✓ Owner invalidation")
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_counters()
+    test_ttl_expiry()
+    test_max_bytes_eviction()
+    test_invalidate_owner()
+    print("\n=== All Projection Cache Tests Passed! ===\n")
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Parity test for the vectorized projection engine.
+
+Runs randomly generated households through both the engine and a reference copy of
+the original per-account loop from calculations.py and checks the yearly records match.
+"""
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def reference_projection(years, combined_accounts):
+    """The Phase 1/2/3 loop from calculations.calculate_projection before vectorization."""
+    combined_accounts = [dict(acc) for acc in combined_accounts]
+    account_balances = {acc["name"]: acc["initial_balance"] for acc in combined_accounts}
+    yearly_results = []
+    total_contribution = 0.0
+    previous_year_total_value = sum(acc["initial_balance"] for acc in combined_accounts)
+
+    def signed(account, monthly_contribution):
+        adjusted = monthly_contribution * 12
+        if account["type"] == "liability" or account["type"] == "expense":
+            return -abs(adjusted)
+        if account["type"] == "income":
+            return abs(adjusted)
+        return adjusted
+
+    def effective_rate(account):
+        rate = account.get('annual_increase_percent', 0.0) / 100.0
+        return -rate if account.get('annual_change_type', 'increase') == "decrease" else rate
+
+    for year in range(1, years + 1):
+        yearly_record = {"Year": year, "StartingValue": previous_year_total_value}
+        current_year_total_value = 0.0
+        year_total_contributions = 0.0
+        year_total_growth = 0.0
+        current_year_balances = account_balances.copy()
+
+        for account in combined_accounts:
+            current_balance = account_balances.get(account["name"], 0.0)
+            rate = effective_rate(account)
+            contribution = signed(account, account.get("monthly_contribution", 0.0))
+            current_year_balances[account["name"]] = (
+                current_balance + contribution + current_balance * rate + contribution * rate * 0.5
+            )
+
+        for account in combined_accounts:
+            if "linked_account" in account:
+                yearly_value = 0.0
+                if account["linked_account"] is not None:
+                    yearly_value = current_year_balances[account["linked_account"]] * (account["percentage"] / 100.0)
+                account["monthly_contribution"] = yearly_value / 12
+
+        for account in combined_accounts:
+            current_balance = account_balances.get(account["name"], 0.0)
+            contribution = signed(account, account.get("monthly_contribution", 0.0))
+            total_contribution += contribution
+            year_total_contributions += contribution
+            rate = effective_rate(account)
+            growth_on_balance = current_balance * rate
+            growth_on_contributions = contribution * rate * 0.5
+            year_total_growth += growth_on_balance + growth_on_contributions
+            new_balance = current_balance + contribution + growth_on_balance + growth_on_contributions
+            if account["type"] in ['asset', 'liability']:
+                account_balances[account["name"]] = new_balance
+                yearly_record[f"{account['name']}_Value"] = new_balance
+            else:
+                yearly_record[f"{account['name']}_Value"] = contribution
+            current_year_total_value += new_balance
+
+        yearly_record["Total_Contribution"] = year_total_contributions
+        yearly_record["Total_Growth"] = year_total_growth
+        yearly_record["Total_Value"] = current_year_total_value
+        yearly_results.append(yearly_record)
+        previous_year_total_value = current_year_total_value
+
+    return yearly_results, total_contribution
+
+
+def random_household(rng, n_assets, n_liabilities, n_frontend, n_cashflow):
+    accounts = []
+    asset_names = [f"Asset {rng.randint(0, n_assets)}" for _ in range(n_assets)]  # allows duplicate names
+    for name in asset_names:
+        accounts.append({
+            "name": name, "type": "asset", "initial_balance": rng.uniform(0, 500000),
+            "annual_increase_percent": rng.uniform(0, 10),
+            "annual_change_type": rng.choice(["increase", "increase", "decrease"]),
+        })
+    for i in range(n_liabilities):
+        accounts.append({
+            "name": f"Loan {i}", "type": "liability", "initial_balance": rng.uniform(0, 300000),
+            "annual_increase_percent": rng.uniform(0, 6),
+            "annual_change_type": rng.choice(["increase", "decrease"]),
+        })
+    for i in range(n_frontend):
+        accounts.append({
+            "name": f"Savings {i}", "type": rng.choice(["asset", "Savings (High-Yield)", "income"]),
+            "initial_balance": rng.uniform(0, 20000), "monthly_contribution": rng.uniform(-100, 1000),
+            "annual_increase_percent": rng.uniform(0, 8), "annual_change_type": "increase",
+        })
+    balance_names = [acc["name"] for acc in accounts if acc["type"] in ("asset", "liability")]
+    for i in range(n_cashflow):
+        is_income = rng.random() < 0.5
+        account = {
+            "name": f"Flow {i}", "type": "income" if is_income else "expense", "initial_balance": 0.0,
+            "monthly_contribution": rng.uniform(0, 5000) / 12, "annual_increase_percent": rng.uniform(0, 4),
+            "annual_change_type": "increase" if is_income else "decrease", "id": i + 1,
+        }
+        if balance_names and rng.random() < 0.4:
+            account["linked_account"] = rng.choice(balance_names + [None])
+            account["percentage"] = rng.uniform(0, 10)
+        accounts.append(account)
+    return accounts
+
+
+def assert_records_match(expected, actual):
+    assert len(expected) == len(actual), "Year count differs"
+    for expected_record, actual_record in zip(expected, actual):
+        assert list(expected_record) == list(actual_record), "Record keys/order differ"
+        for key, value in expected_record.items():
+            assert math.isclose(value, actual_record[key], rel_tol=1e-12, abs_tol=1e-9), \
+                f"Year {expected_record['Year']} {key}: {value} != {actual_record[key]}"
+
+
+def test_engine_matches_reference_loop():
+    """The engine reproduces the original loop for randomly generated households."""
+    import projection_engine
+
+    rng = random.Random(1234)
+    for _ in range(25):
+        accounts = random_household(rng, rng.randint(0, 8), rng.randint(0, 4), rng.randint(0, 4), rng.randint(0, 12))
+        years = rng.randint(0, 60)
+
+        expected, expected_contributed = reference_projection(years, accounts)
+        result = projection_engine.run_projection(projection_engine.ProjectionModel(accounts), years)
+
+        assert_records_match(expected, result.to_records())
+        assert math.isclose(expected_contributed, result.total_contributed, rel_tol=1e-12, abs_tol=1e-9)
+        expected_final = expected[-1]["Total_Value"] if expected else 0.0
+        assert math.isclose(expected_final, result.final_value, rel_tol=1e-12, abs_tol=1e-9)
+    print("✓ Engine matches reference loop")
+
+
+def test_batched_scenarios_match_individual_runs():
+    """Scenarios stacked on a batch axis give the same results as projecting each variant alone."""
+    import projection_engine
+    import scenarios
+
+    rng = random.Random(99)
+    accounts = random_household(rng, 6, 3, 3, 10)
+    target = accounts[0]["name"]
+    variants = [
+        {"name": "Base"},
+        {"name": "Short", "years": 12},
+        {"name": "Override", "account_overrides": [{"name": target, "annual_increase_percent": 3.0, "initial_balance": 5000.0}]},
+    ]
+    results = scenarios.run_scenarios(accounts, 40, variants)
+
+    overridden = [dict(acc) for acc in accounts]
+    for acc in overridden:
+        if acc["name"] == target:
+            acc["annual_increase_percent"] = 3.0
+            acc["initial_balance"] = 5000.0
+    expected = [
+        projection_engine.run_projection(projection_engine.ProjectionModel(accounts), 40),
+        projection_engine.run_projection(projection_engine.ProjectionModel(accounts), 12),
+        projection_engine.run_projection(projection_engine.ProjectionModel(overridden), 40),
+    ]
+    for result, single in zip(results, expected):
+        assert result["years"] == single.years
+        assert math.isclose(result["final_value"], single.final_value, rel_tol=1e-12)
+        for batched_value, single_value in zip(result["total_value"], single.total_value.tolist()):
+            assert math.isclose(batched_value, single_value, rel_tol=1e-12, abs_tol=1e-9)
+    print("✓ Batched scenarios match individual runs")
+
+
+def test_engine_empty_household():
+    """A household with no accounts projects to zero."""
+    import projection_engine
+
+    result = projection_engine.run_projection(projection_engine.ProjectionModel([]), 5)
+    records = result.to_records()
+    assert len(records) == 5
+    assert all(record["Total_Value"] == 0.0 for record in records)
+    assert result.final_value == 0.0
+    print("✓ Empty household projects to zero")
+
+
+def test_incremental_update_matches_full_run():
+    """Re-projecting only the accounts affected by an edit gives exactly the full-run result."""
+    import incremental
+    import projection_engine
+
+    rng = random.Random(7)
+    projector = incremental.IncrementalProjector(max_entries=4)
+    accounts = random_household(rng, 8, 3, 2, 12)
+    projector.project(1, 30, "request", accounts)
+
+    for step in range(10):
+        accounts = [dict(acc) for acc in accounts]
+        edited = accounts[rng.randrange(len(accounts))]
+        edited["initial_balance"] = rng.uniform(0, 100000)
+        edited["annual_increase_percent"] = rng.uniform(0, 9)
+
+        result = projector.project(1, 30, "request", accounts)
+        full = projection_engine.run_projection(projection_engine.ProjectionModel(accounts), 30)
+        assert result.to_records() == full.to_records(), f"Step {step}: records differ from a full run"
+        assert result.total_contributed == full.total_contributed
+
+    stats = projector.stats()
+    assert stats["full_runs"] == 1 and stats["incremental_runs"] == 10
+    assert stats["accounts_recomputed"] < len(accounts) * 11
+    print("✓ Incremental updates match full runs")
+
+
+def test_project_snapshot_without_database():
+    """A hand-built snapshot is projected without a Session and survives pickling."""
+    import pickle
+    import projection_core
+    import projection_format
+    import snapshot
+
+    owner_snapshot = snapshot.OwnerSnapshot(
+        owner_id=42,
+        assets=(snapshot.AssetRecord(1, "House", 300000.0, 3.0, "increase", None, None),),
+        liabilities=(snapshot.LiabilityRecord(2, "Mortgage", 200000.0, 4.0, "decrease", None, None),),
+        cashflow_items=(
+            snapshot.CashFlowRecord(
+                id=3, owner_id=42, is_income=False, description="Property tax", yearly_value=0.0,
+                linked_item_id=1, linked_item_type="asset", percentage=1.0, annual_increase_percent=0.0,
+                inflation_percent=2.0, category="Housing", frequency="yearly", person=None,
+                start_date=None, end_date=None, taxable=False, tax_deductible=True, created_at="2026-01-01",
+            ),
+        ),
+    )
+    restored = pickle.loads(pickle.dumps(owner_snapshot))
+    assert restored == owner_snapshot
+
+    result = projection_core.project_snapshot(restored, 10, [])
+    records = projection_format.load_records(result["data_json"])
+    assert len(records) == 10
+    assert list(records[0]) == ["Year", "StartingValue", "House_Value", "Mortgage_Value", "Property tax_Value",
+                                "Total_Contribution", "Total_Growth", "Total_Value"]
+    assert math.isclose(records[0]["Property tax_Value"], -300000.0 * 1.03 * 0.01)
+    assert result["final_value"] == records[-1]["Total_Value"]
+    print("✓ Snapshot projected without a database")
+
+
+def test_goal_seek_reaches_target():
+    """Solved contributions, growth rates and horizons reproduce the target in a plain run."""
+    import copy
+    import goal_seek
+    import projection_engine
+
+    accounts = [
+        {"name": "Brokerage", "type": "asset", "initial_balance": 10000.0, "monthly_contribution": 500.0,
+         "annual_increase_percent": 6.0, "annual_change_type": "increase"},
+        {"name": "Loan", "type": "liability", "initial_balance": 20000.0, "monthly_contribution": 300.0,
+         "annual_increase_percent": 4.0, "annual_change_type": "decrease"},
+    ]
+
+    def final_value(accs, years=30):
+        return projection_engine.run_projection(projection_engine.ProjectionModel(accs), years).final_value
+
+    solved = goal_seek.solve(accounts, 30, 1_000_000.0, "monthly_contribution", "Brokerage")
+    assert solved["converged"] and solved["evaluations"] < 10
+    adjusted = copy.deepcopy(accounts)
+    adjusted[0]["monthly_contribution"] = solved["value"]
+    assert final_value(adjusted) >= 1_000_000.0
+    adjusted[0]["monthly_contribution"] = solved["value"] - 2 * goal_seek.DEFAULT_TOLERANCE["monthly_contribution"]
+    assert final_value(adjusted) < 1_000_000.0
+
+    solved = goal_seek.solve(accounts, 30, 1_000_000.0, "growth_rate", "Brokerage")
+    adjusted = copy.deepcopy(accounts)
+    adjusted[0]["annual_increase_percent"] = solved["value"]
+    assert solved["converged"] and math.isclose(final_value(adjusted), 1_000_000.0, rel_tol=1e-5)
+
+    solved = goal_seek.solve(accounts, 30, 1_000_000.0, "years")
+    assert final_value(accounts, solved["years"]) >= 1_000_000.0 > final_value(accounts, solved["years"] - 1)
+
+    try:
+        goal_seek.solve(accounts, 30, 1_000_000.0, "monthly_contribution", "Unknown")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print("✓ Goal-seek reaches the target")
+
+
+def test_sensitivity_matches_individual_runs():
+    """Each batched tornado row equals a separate run with that one input scaled."""
+    import copy
+    import projection_engine
+    import sensitivity
+
+    accounts = random_household(random.Random(21), 80, 20, 20, 80)
+    years = 40
+    report = sensitivity.run_sensitivity(accounts, years, 10.0)
+
+    def final_value(accs):
+        return projection_engine.run_projection(projection_engine.ProjectionModel(accs), years).final_value
+
+    assert math.isclose(report["base_final_value"], final_value(accounts), rel_tol=1e-9)
+    model = projection_engine.ProjectionModel(accounts)
+    expected = []
+    for name, kind, positions in sensitivity._inputs(model, accounts):
+        finals = []
+        for factor in (0.9, 1.1):
+            perturbed = copy.deepcopy(accounts)
+            for i in positions:
+                key = {"yearly_value": "monthly_contribution", "linked_percentage": "percentage"}.get(kind, "annual_increase_percent")
+                perturbed[i][key] *= factor
+            finals.append(final_value(perturbed))
+        expected.append(abs(finals[1] - finals[0]))
+    assert len(report["inputs"]) == len(expected)
+    for swing, row in zip(sorted(expected, reverse=True), report["inputs"]):
+        assert math.isclose(swing, row["swing"], rel_tol=1e-6, abs_tol=1e-3)
+    print(f"✓ Sensitivity matches individual runs ({len(accounts)} items)")
+
+
+def test_tax_columns():
+    """Vectorized bracket lookup matches a per-bracket loop; tax columns appear only when requested."""
+    import numpy as np
+    import projection_core
+    import projection_format
+    import snapshot
+    import tax
+
+    def reference_tax(income, status, factor):
+        thresholds, rates = tax.BRACKETS[status]
+        owed = 0.0
+        for k, (low, rate) in enumerate(zip(thresholds * factor, rates)):
+            high = thresholds[k + 1] * factor if k + 1 < len(thresholds) else float("inf")
+            owed += max(min(income, high) - low, 0.0) * rate
+        return owed
+
+    incomes = np.array([0.0, 5000.0, 11600.0, 50000.0, 250000.0, 1_000_000.0, -10.0])
+    factors = 1.02 ** np.arange(len(incomes))
+    for status in tax.FILING_STATUSES:
+        vectorized = tax.bracket_tax(incomes, status, factors)
+        for income, factor, owed in zip(incomes, factors, vectorized):
+            assert math.isclose(owed, reference_tax(income, status, factor), rel_tol=1e-12, abs_tol=1e-9)
+
+    def cashflow(id, description, is_income, yearly_value, taxable=False, tax_deductible=False):
+        return snapshot.CashFlowRecord(
+            id=id, owner_id=5, is_income=is_income, description=description, yearly_value=yearly_value,
+            linked_item_id=None, linked_item_type=None, percentage=None, annual_increase_percent=0.0,
+            inflation_percent=0.0, category="Other", frequency="yearly", person=None, start_date=None,
+            end_date=None, taxable=taxable, tax_deductible=tax_deductible, created_at="2026-01-01",
+        )
+
+    owner_snapshot = snapshot.OwnerSnapshot(owner_id=5, cashflow_items=(
+        cashflow(1, "Salary", True, 120000.0, taxable=True),
+        cashflow(2, "Gift", True, 5000.0),
+        cashflow(3, "Mortgage interest", False, 20000.0, tax_deductible=True),
+        cashflow(4, "Groceries", False, 9000.0),
+    ))
+    plain = projection_format.load_records(projection_core.compute_projection(owner_snapshot, 3, [])["data_json"])
+    assert "Total_Tax" not in plain[0]
+
+    taxed = projection_format.load_records(
+        projection_core.compute_projection(owner_snapshot, 3, [], filing_status="single")["data_json"])
+    assert list(taxed[0])[-4:] == ["Total_Value", "Taxable_Income", "Total_Tax", "After_Tax_Cashflow"]
+    assert math.isclose(taxed[0]["Taxable_Income"], 120000.0 - 20000.0)
+    assert math.isclose(taxed[0]["Total_Tax"], reference_tax(100000.0, "single", 1.0))
+    assert math.isclose(taxed[0]["After_Tax_Cashflow"], 125000.0 - 29000.0 - taxed[0]["Total_Tax"])
+    assert taxed[2]["Total_Tax"] < taxed[0]["Total_Tax"], "Indexed brackets should lower tax on flat income"
+    print("✓ Tax columns")
+
+
+def test_amortization_schedules():
+    """Closed-form schedules match a month-by-month loop; loans drive their balance and payment columns."""
+    import numpy as np
+    import amortization
+    import projection_core
+    import projection_format
+    import snapshot
+
+    def reference_schedule(balance, annual_rate, term, payment):
+        rate = annual_rate / 1200.0
+        if payment is None:
+            payment = balance * rate / (1 - (1 + rate) ** -term) if rate else balance / term
+        rows = {"balance": [], "interest": [], "principal": [], "payment": []}
+        year = dict.fromkeys(rows, 0.0)
+        for month in range(1, 12 * 40 + 1):
+            interest = balance * rate
+            paid = min(payment, balance + interest)
+            if term is not None and month == term:
+                paid = balance + interest # Whatever is left is due with the last payment
+            year["interest"] += interest
+            year["principal"] += paid - interest
+            year["payment"] += paid
+            balance = balance + interest - paid
+            if month % 12 == 0:
+                year["balance"] = balance
+                for key in rows:
+                    rows[key].append(year[key])
+                year = dict.fromkeys(rows, 0.0)
+        return rows
+
+    loans = [(300000.0, 6.5, 360, None), (25000.0, 0.0, 60, None), (80000.0, 4.0, None, 900.0),
+             (50000.0, 5.0, 120, 300.0)]
+    result = amortization.schedules(
+        balance=[loan[0] for loan in loans], annual_rate_percent=[loan[1] for loan in loans],
+        term_months=[loan[2] or np.nan for loan in loans], payment=[loan[3] or np.nan for loan in loans],
+    )
+    for row, loan in enumerate(loans):
+        expected = reference_schedule(*loan)
+        for key, values in expected.items():
+            years = min(len(values), result[key].shape[1])
+            assert np.allclose(result[key][row, :years], values[:years], rtol=1e-9, atol=1e-6), (loan, key)
+    assert math.isclose(result["balance"][0, 29], 0.0, abs_tol=1e-6)
+
+    owner_snapshot = snapshot.OwnerSnapshot(owner_id=6, liabilities=(
+        snapshot.LiabilityRecord(1, "Mortgage", 300000.0, 3.0, "increase", None, None,
+                                 interest_rate_percent=6.5, term_months=360),
+        snapshot.LiabilityRecord(2, "Card", 2000.0, 18.0, "increase", None, None),
+    ))
+    records = projection_format.load_records(projection_core.compute_projection(owner_snapshot, 35, [])["data_json"])
+    mortgage = reference_schedule(300000.0, 6.5, 360, None)
+    assert math.isclose(records[0]["Mortgage_Value"], mortgage["balance"][0], rel_tol=1e-9)
+    assert math.isclose(records[0]["Mortgage Payment_Value"], -mortgage["payment"][0], rel_tol=1e-9)
+    assert math.isclose(records[0]["Loan_Interest"], mortgage["interest"][0], rel_tol=1e-9)
+    assert math.isclose(records[31]["Mortgage_Value"], 0.0, abs_tol=1e-6)
+    assert records[31]["Mortgage Payment_Value"] == 0.0 and records[31]["Loan_Principal"] == 0.0
+    assert math.isclose(records[0]["Card_Value"], 2000.0 * 1.18) # Liabilities without terms keep compounding
+    print("✓ Amortization schedules")
+
+
+if __name__ == "__main__":
+    test_engine_matches_reference_loop()
+    test_batched_scenarios_match_individual_runs()
+    test_engine_empty_household()
+    test_incremental_update_matches_full_run()
+    test_project_snapshot_without_database()
+    test_goal_seek_reaches_target()
+    test_sensitivity_matches_individual_runs()
+    test_tax_columns()
+    test_amortization_schedules()
+    print("\n=== All Projection Engine Tests Passed! ===\n")
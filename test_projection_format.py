@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar Projection.data_json format and the readers for both layouts.
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+from test_projection_engine import random_household
+
+
+def large_result():
+    import projection_engine
+
+    accounts = random_household(random.Random(3), 60, 10, 10, 40)
+    return projection_engine.run_projection(projection_engine.ProjectionModel(accounts), 60)
+
+
+def test_columnar_round_trip():
+    """Columnar data expands back to exactly the legacy per-year records."""
+    import projection_format
+
+    result = large_result()
+    records = result.to_records()
+    columnar = projection_format.encode_result(result)
+
+    assert projection_format.load_records(columnar) == records
+    assert projection_format.load_records(json.dumps(records)) == records
+    assert projection_format.load_columnar(json.dumps(records)) == json.loads(columnar)
+    assert json.loads(projection_format.convert(columnar, projection_format.LEGACY)) == records
+    assert projection_format.convert(columnar, projection_format.COLUMNAR) == columnar
+    assert len(columnar) < len(json.dumps(records)), "Columnar payload should be smaller"
+    print(f"✓ Columnar round trip ({len(json.dumps(records))} -> {len(columnar)} bytes)")
+
+
+def test_ndjson_stream_is_lazy():
+    """NDJSON streaming yields one line per year without building the record list first."""
+    import projection_format
+
+    result = large_result()
+    records = result.to_records()
+    for data_json in (projection_format.encode_result(result), json.dumps(records)):
+        stream = projection_format.iter_ndjson(json.loads(data_json))
+        first = next(stream)
+        assert first.endswith("\n") and json.loads(first) == records[0]
+        lines = [first] + list(stream)
+        assert [json.loads(line) for line in lines] == records
+    assert list(projection_format.iter_ndjson([])) == []
+    print("✓ NDJSON stream yields one record per year")
+
+
+def test_detail_schema_reads_both_formats():
+    """ProjectionDetailOut returns records by default and columnar data on request."""
+    import projection_format
+    import schemas
+
+    result = large_result()
+    stored = {"id": 1, "name": "Plan", "years": result.years, "data_json": projection_format.encode_result(result)}
+
+    legacy = schemas.ProjectionDetailOut.model_validate(stored)
+    assert legacy.data_format == "legacy"
+    assert json.loads(legacy.data_json) == result.to_records()
+
+    columnar = schemas.ProjectionDetailOut.model_validate(
+        {**stored, "data_json": json.dumps(result.to_records())}, context={"data_format": "columnar"}
+    )
+    assert columnar.data_format == "columnar"
+    assert json.loads(columnar.data_json)["accounts"] == result.columns
+
+    # Re-validating a dumped response keeps the requested layout.
+    again = schemas.ProjectionDetailOut.model_validate(columnar.model_dump())
+    assert again.data_json == columnar.data_json
+    print("✓ ProjectionDetailOut reads legacy and columnar data")
+
+
+def test_list_schema_keeps_stored_layout():
+    """ProjectionResponse (list and create responses) returns data_json as stored, without re-encoding it."""
+    import projection_format
+    import schemas
+
+    result = large_result()
+    summary = {"id": 1, "name": "Plan", "years": result.years, "final_value": result.final_value,
+               "total_contributed": result.total_contributed, "total_growth": 0.0}
+    original_convert = projection_format.convert
+
+    def fail_convert(*args):
+        raise AssertionError("ProjectionResponse must not convert data_json")
+
+    projection_format.convert = fail_convert
+    try:
+        for data_json, data_format in ((projection_format.encode_result(result), "columnar"),
+                                       (json.dumps(result.to_records()), "legacy"),
+                                       ("", "legacy")):
+            response = schemas.ProjectionResponse.model_validate({**summary, "data_json": data_json})
+            assert response.data_json is data_json and response.data_format == data_format
+    finally:
+        projection_format.convert = original_convert
+    print("✓ ProjectionResponse keeps the stored layout")
+
+
+def test_real_basis_view():
+    """Real-dollar views deflate every stored series and are memoized per projection and rate."""
+    import math
+    from types import SimpleNamespace
+    import projection_format
+    import real_basis
+
+    result = large_result()
+    records = result.to_records()
+    projection = SimpleNamespace(id=41, owner_id=9, timestamp="2026-01-01T00:00:00", final_value=result.final_value,
+                                 total_contributed=result.total_contributed, data_json=json.dumps(records))
+    view = real_basis.real_view(projection, 3.0)
+    real = projection_format.load_records(view["data_json"])
+    for nominal, deflated in zip(records, real):
+        factor = 1.03 ** deflated["Year"]
+        assert math.isclose(deflated["Total_Value"] * factor, nominal["Total_Value"], rel_tol=1e-12, abs_tol=1e-9)
+        assert math.isclose(deflated["StartingValue"] * factor / 1.03, nominal["StartingValue"], rel_tol=1e-12, abs_tol=1e-9)
+        for key in nominal:
+            if key.endswith("_Value") and key != "Total_Value":
+                assert math.isclose(deflated[key] * factor, nominal[key], rel_tol=1e-12, abs_tol=1e-9)
+    assert math.isclose(view["final_value"], records[-1]["Total_Value"] / 1.03 ** len(records), rel_tol=1e-12)
+
+    assert real_basis.real_view(projection, 3.0) is not view # Cache hands out copies
+    assert real_basis.cache.stats()["hits"] >= 1
+    projection.timestamp = "2026-02-01T00:00:00" # An updated projection gets a fresh view
+    misses = real_basis.cache.stats()["misses"]
+    real_basis.real_view(projection, 3.0)
+    assert real_basis.cache.stats()["misses"] == misses + 1
+    print("✓ Real-dollar view")
+
+
+if __name__ == "__main__":
+    test_columnar_round_trip()
+    test_ndjson_stream_is_lazy()
+    test_detail_schema_reads_both_formats()
+    test_list_schema_keeps_stored_layout()
+    test_real_basis_view()
+    print("\n=== All Projection Format Tests Passed! ===\n")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-statement snapshot loader (snapshot_loader.load_snapshot).
+
+The snapshot read through the UNION ALL statement must equal the one built from three per-table
+ORM queries (the loader it replaced), including NULL dates, NULL amortization terms and linked
+cash flow items. A SQLite file stands in for Postgres.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+
+def orm_snapshot(db, owner_id: int):
+    """The previous loader: one ORM query per table, converted field by field, ordered by id."""
+    import models
+    from snapshot import AssetRecord, LiabilityRecord, CashFlowRecord, OwnerSnapshot
+
+    def rows(model):
+        return db.query(model).filter(model.owner_id == owner_id).order_by(model.id).all()
+
+    return OwnerSnapshot(
+        owner_id=owner_id,
+        assets=tuple(AssetRecord(a.id, a.name, a.value, a.annual_increase_percent, a.annual_change_type,
+                                 a.start_date, a.end_date) for a in rows(models.Asset)),
+        liabilities=tuple(LiabilityRecord(l.id, l.name, l.value, l.annual_increase_percent, l.annual_change_type,
+                                          l.start_date, l.end_date, l.interest_rate_percent, l.term_months,
+                                          l.monthly_payment) for l in rows(models.Liability)),
+        cashflow_items=tuple(CashFlowRecord(
+            id=i.id, owner_id=i.owner_id, is_income=i.is_income, description=i.description,
+            yearly_value=i.yearly_value, linked_item_id=i.linked_item_id, linked_item_type=i.linked_item_type,
+            percentage=i.percentage, annual_increase_percent=i.annual_increase_percent,
+            inflation_percent=i.inflation_percent, category=i.category, frequency=i.frequency, person=i.person,
+            start_date=i.start_date, end_date=i.end_date, taxable=i.taxable, tax_deductible=i.tax_deductible,
+            created_at=str(i.created_at),
+        ) for i in rows(models.CashFlowItem)),
+    )
+
+
+def seed(db):
+    import models
+
+    created = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    db.add_all([models.User(id=owner_id, email=f"owner{owner_id}@example.com", hashed_password="-")
+                for owner_id in (1, 2)])
+    # Ids out of insertion order, so the kind/id ordering is exercised.
+    db.add_all([
+        models.Asset(id=12, owner_id=1, name="House", category="Real Estate", value=400000.0,
+                     annual_increase_percent=3.0, annual_change_type="increase", start_date=None, end_date=None),
+        models.Asset(id=5, owner_id=1, name="Brokerage", category="Investments", value=50000.0,
+                     annual_increase_percent=6.5, annual_change_type="decrease",
+                     start_date="2026-01-01", end_date="2040-12-31"),
+        models.Asset(id=7, owner_id=2, name="Other owner", category="Investments", value=1.0),
+        models.Liability(id=9, owner_id=1, name="Mortgage", category="Mortgage", value=300000.0,
+                         annual_increase_percent=0.0, annual_change_type="increase",
+                         interest_rate_percent=6.5, term_months=360, monthly_payment=None),
+        models.Liability(id=3, owner_id=1, name="Card", category="Other", value=2000.0,
+                         annual_increase_percent=18.0, annual_change_type="increase", start_date="2026-02-01",
+                         interest_rate_percent=None, term_months=None, monthly_payment=None),
+        models.CashFlowItem(id=20, owner_id=1, is_income=True, category="Salary", description="Salary",
+                            frequency="monthly", yearly_value=60000.0, annual_increase_percent=2.0,
+                            inflation_percent=0.0, person="Alex", taxable=True, tax_deductible=False,
+                            created_at=created),
+        models.CashFlowItem(id=4, owner_id=1, is_income=False, category="Fees", description="Advisory fee",
+                            frequency="yearly", yearly_value=0.0, linked_item_id=5, linked_item_type="asset",
+                            percentage=1.0, inflation_percent=2.5, taxable=False, tax_deductible=True,
+                            start_date="2026-01-01", created_at=created),
+        models.CashFlowItem(id=6, owner_id=1, is_income=False, category="Housing", description="Interest",
+                            frequency="yearly", yearly_value=0.0, linked_item_id=9, linked_item_type="liability",
+                            percentage=6.5, annual_increase_percent=None, inflation_percent=None,
+                            taxable=None, tax_deductible=None, created_at=created),
+        models.CashFlowItem(id=8, owner_id=2, is_income=True, category="Salary", description="Other owner",
+                            frequency="yearly", yearly_value=1.0, created_at=created),
+    ])
+    db.commit()
+
+
+def test_union_loader_matches_orm_queries():
+    """load_snapshot (and load_snapshot_async) equal the per-table ORM snapshot."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import models
+    import snapshot_loader
+
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        models.Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            seed(db)
+        with sessionmaker(bind=engine)() as db:
+            loaded = snapshot_loader.load_snapshot(db, 1)
+            assert len(db.identity_map) == 0 # Plain rows, no ORM objects
+            for owner_id in (1, 2, 3):
+                expected = orm_snapshot(db, owner_id)
+                assert snapshot_loader.load_snapshot(db, owner_id) == expected, owner_id
+            assert loaded == orm_snapshot(db, 1)
+
+            assert [asset.id for asset in loaded.assets] == [5, 12]
+            assert [liability.id for liability in loaded.liabilities] == [3, 9]
+            assert [item.id for item in loaded.cashflow_items] == [4, 6, 20]
+            house, card, interest = loaded.assets[1], loaded.liabilities[0], loaded.cashflow_items[1]
+            assert house.start_date is None and house.end_date is None
+            assert card.interest_rate_percent is None and card.term_months is None and card.monthly_payment is None
+            assert loaded.liabilities[1].term_months == 360 and loaded.liabilities[1].monthly_payment is None
+            assert interest.linked_item_id == 9 and interest.linked_item_type == "liability"
+            assert interest.person is None and interest.end_date is None
+            assert loaded.cashflow_items[0].linked_item_type == "asset" and loaded.cashflow_items[0].percentage == 1.0
+
+        try:
+            import aiosqlite # noqa: F401 -- test-only driver for the async loader
+        except ImportError:
+            print("- skipped load_snapshot_async: aiosqlite is not installed")
+        else:
+            from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+            async def load_async():
+                async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+                try:
+                    async with AsyncSession(async_engine) as session:
+                        return await snapshot_loader.load_snapshot_async(session, 1)
+                finally:
+                    await async_engine.dispose()
+
+            with sessionmaker(bind=engine)() as db:
+                assert asyncio.run(load_async()) == orm_snapshot(db, 1)
+    finally:
+        engine.dispose()
+        os.remove(path)
+    print("✓ UNION ALL snapshot loader matches the per-table ORM queries")
+
+
+if __name__ == "__main__":
+    test_union_loader_matches_orm_queries()
+    print("\n=== All Snapshot Loader Tests Passed! ===\n")
@@ -50,7 +50,10 @@ export default function Chart() {
             const tb = b.timestamp ? new Date(b.timestamp).getTime() : 0;
             return tb - ta;
           });
-          setLatestProj(sorted[0]);
+          // The list returns data_json as stored (possibly columnar); the detail endpoint returns per-year records
+          const detail = await ApiService.get(`/projections/${sorted[0].id}`);
+          if (!mounted) return;
+          setLatestProj(detail.data);
         }
       } catch (e) {
         setLatestProj(null);